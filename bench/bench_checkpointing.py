@@ -0,0 +1,81 @@
+"""Benchmark prefix-state checkpointing of noisy trajectory simulations.
+
+Runs layered circuits of growing depth on the ``FakeIonTraps2Six`` and ``FakeIonTraps3Six`` backends, once
+without checkpoints and once with a checkpoint every ``--interval`` gates, and reports the speedup of the
+tensor network trajectories (through the backend) and of the decision diagram shots (through ``sample_noisy``).
+Every layer applies an ``r`` rotation on each qudit, every ``--entangle-every`` layers a ``csum`` couples
+neighbouring qudits.
+
+Usage:
+    python bench/bench_checkpointing.py [--depths 4 8 16 32] [--interval 4] [--shots 500] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+import numpy as np
+
+from mqt.qudits._qudits.misim import sample_noisy  # noqa: PLC2701
+from mqt.qudits.quantum_circuit import QuantumCircuit
+from mqt.qudits.simulation import MQTQuditProvider
+
+
+def _circuit(dimensions: list[int], depth: int, entangle_every: int, rng: np.random.Generator) -> QuantumCircuit:
+    circuit = QuantumCircuit(len(dimensions), dimensions, 0)
+    for layer in range(depth):
+        for qudit, dim in enumerate(dimensions):
+            circuit.r(qudit, [0, int(rng.integers(1, dim)), *rng.uniform(0, np.pi, 2)])
+        if (layer + 1) % entangle_every == 0:
+            for qudit in range(len(dimensions) - 1):
+                circuit.csum([qudit, qudit + 1])
+    return circuit
+
+
+def _time(func: object, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))  # type: ignore[arg-type]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depths", type=int, nargs="+", default=[4, 8, 16, 32])
+    parser.add_argument("--interval", type=int, default=4, help="number of gates between two checkpoints")
+    parser.add_argument("--entangle-every", type=int, default=4)
+    parser.add_argument("--shots", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    provider = MQTQuditProvider()
+    rng = np.random.default_rng(0)
+    print(
+        f"{'backend':>14} {'depth':>6} {'gates':>6} {'tn [s]':>9} {'tn ckpt [s]':>12} {'speedup':>8} "
+        f"{'dd [s]':>9} {'dd ckpt [s]':>12} {'speedup':>8}"
+    )
+    for name in ("faketraps2six", "faketraps3six"):
+        backend = provider.get_backend(name)
+        noise_model = backend.options["noise_model"]
+        dimensions = [6] * (2 if name == "faketraps2six" else 3)
+        for depth in args.depths:
+            circuit = _circuit(dimensions, depth, args.entangle_every, rng)
+
+            def run_tn(interval: int | None, b=backend, c=circuit) -> None:
+                # trajectories simulated by an earlier repetition must not be served from the cache
+                b.trajectory_cache.clear()
+                b.run(c, shots=args.shots, seed=1, checkpoint_interval=interval)
+
+            def run_dd(interval: int, c=circuit, n=noise_model) -> None:
+                sample_noisy(c, n, args.shots, seed=1, checkpoint_interval=interval)
+
+            t_tn = _time(lambda f=run_tn: f(None), args.repeat)
+            t_tn_ckpt = _time(lambda f=run_tn: f(args.interval), args.repeat)
+            t_dd = _time(lambda f=run_dd: f(0), args.repeat)
+            t_dd_ckpt = _time(lambda f=run_dd: f(args.interval), args.repeat)
+            print(
+                f"{name:>14} {depth:>6} {circuit.number_gates:>6} {t_tn:>9.3f} {t_tn_ckpt:>12.3f} "
+                f"{t_tn / t_tn_ckpt:>7.2f}x {t_dd:>9.3f} {t_dd_ckpt:>12.3f} {t_dd / t_dd_ckpt:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
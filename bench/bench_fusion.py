@@ -0,0 +1,80 @@
+"""Benchmark gate fusion of the decision diagram simulator on compiled circuits.
+
+Compiles layered circuits for the ``FakeIonTraps2Six`` and ``FakeIonTraps3Six`` backends down to their native
+rotations and two-qudit gates, then simulates the compiled circuits with every fusion width of ``--widths`` and
+reports the time of each width and its speedup over simulating gate by gate (width 0). Every layer applies an ``r``
+and an ``rz`` rotation on each qudit followed by a ``csum`` between neighbouring qudits. Noiseless runs go through
+``state_vector_simulation``, noisy ones sample ``--shots`` shots with the noise model of the backend through
+``sample_noisy``.
+
+Usage:
+    python bench/bench_fusion.py [--depths 2 4 8] [--widths 0 1 2 3] [--shots 50] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+import numpy as np
+
+from mqt.qudits._qudits.misim import sample_noisy, state_vector_simulation  # noqa: PLC2701
+from mqt.qudits.compiler import QuditCompiler
+from mqt.qudits.quantum_circuit import QuantumCircuit
+from mqt.qudits.simulation import MQTQuditProvider
+from mqt.qudits.simulation.noise_tools import NoiseModel
+
+
+def _circuit(dimensions: list[int], depth: int, rng: np.random.Generator) -> QuantumCircuit:
+    circuit = QuantumCircuit(len(dimensions), dimensions, 0)
+    for _ in range(depth):
+        for qudit, dim in enumerate(dimensions):
+            circuit.r(qudit, [0, int(rng.integers(1, dim)), *rng.uniform(0, np.pi, 2)])
+            circuit.rz(qudit, [1, int(rng.integers(2, dim)), rng.uniform(0, np.pi)])
+        for qudit in range(len(dimensions) - 1):
+            circuit.csum([qudit, qudit + 1])
+    return circuit
+
+
+def _time(func: object, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))  # type: ignore[arg-type]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depths", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--widths", type=int, nargs="+", default=[0, 1, 2, 3])
+    parser.add_argument("--shots", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    provider = MQTQuditProvider()
+    compiler = QuditCompiler()
+    passes = ["PhyLocQRPass", "PhyEntQRCEXPass", "ZPropagationOptPass"]
+    rng = np.random.default_rng(0)
+    columns = " ".join(f"{f'w={w} [s]':>10} {'speedup':>8}" for w in args.widths)
+    print(f"{'backend':>14} {'depth':>6} {'gates':>6} {'run':>9} {columns}")
+    for name in ("faketraps2six", "faketraps3six"):
+        backend = provider.get_backend(name)
+        dimensions = [6] * (2 if name == "faketraps2six" else 3)
+        for depth in args.depths:
+            compiled = compiler.compile(backend, _circuit(dimensions, depth, rng), passes)
+            reference = state_vector_simulation(compiled, NoiseModel(), fusion_width=0)
+            for width in args.widths:
+                state = state_vector_simulation(compiled, NoiseModel(), fusion_width=width)
+                assert np.allclose(state, reference), f"fusion width {width} changes the state"
+
+            def noiseless(width: int, c: QuantumCircuit = compiled) -> None:
+                state_vector_simulation(c, NoiseModel(), fusion_width=width)
+
+            def noisy(width: int, c: QuantumCircuit = compiled, n: NoiseModel = backend.options["noise_model"]) -> None:
+                sample_noisy(c, n, args.shots, seed=1, fusion_width=width)
+
+            for label, func in (("noiseless", noiseless), ("noisy", noisy)):
+                times = [_time(lambda f=func, w=width: f(w), args.repeat) for width in args.widths]
+                row = " ".join(f"{t:>10.3f} {times[0] / t:>7.2f}x" for t in times)
+                print(f"{name:>14} {depth:>6} {compiled.number_gates:>6} {label:>9} {row}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark the embedding of controlled and long-range gates performed by ``MatrixFactory``.
+
+Compares the vectorized :meth:`MatrixFactory.apply_identities_and_controls` against the entry-by-entry
+reference implementation of its tests for a controlled single-qudit gate whose control and target sit at the two ends
+of the span, for local dimensions 2-7 and spans of 2-6 lines.
+
+Usage:
+    python bench/bench_matrix_factory.py [--max-size 4096] [--max-loop-size 729] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import timeit
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from mqt.qudits.quantum_circuit.components.extensions.matrix_factory import MatrixFactory
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+TESTS = Path(__file__).resolve().parents[1] / "test" / "python" / "qudits_circuits" / "components"
+
+
+def _reference() -> Callable[..., np.ndarray]:
+    """Load the entry-by-entry implementation from the test module, which is not an importable package here."""
+    spec = importlib.util.spec_from_file_location("test_matrix_factory", TESTS / "test_matrix_factory.py")
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.apply_identities_and_controls_loop  # type: ignore[no-any-return]
+
+
+def _time(func: object, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))  # type: ignore[arg-type]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-size", type=int, default=4096, help="largest embedded operator size to build")
+    parser.add_argument("--max-loop-size", type=int, default=729, help="largest size timed with the loop version")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    reference = _reference()
+    rng = np.random.default_rng(0)
+    print(f"{'dim':>4} {'span':>5} {'size':>7} {'numpy [s]':>12} {'loop [s]':>12} {'speedup':>9}")
+    for dim in range(2, 8):
+        for span in range(2, 7):
+            size = dim**span
+            if size > args.max_size:
+                continue
+            dimensions = [dim] * span
+            lines = list(range(span))
+            matrix = rng.normal(size=(dim, dim)) + 1j * rng.normal(size=(dim, dim))
+            call_args = (matrix, [span - 1], dimensions, lines, [0], [dim - 1])
+
+            t_numpy = _time(lambda a=call_args: MatrixFactory.apply_identities_and_controls(*a), args.repeat)
+            if size <= args.max_loop_size:
+                t_loop = _time(lambda a=call_args: reference(*a), args.repeat)
+                print(f"{dim:>4} {span:>5} {size:>7} {t_numpy:>12.6f} {t_loop:>12.6f} {t_loop / t_numpy:>8.1f}x")
+            else:
+                print(f"{dim:>4} {span:>5} {size:>7} {t_numpy:>12.6f} {'-':>12} {'-':>9}")
+
+
+if __name__ == "__main__":
+    main()
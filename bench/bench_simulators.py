@@ -0,0 +1,66 @@
+"""Benchmark the noiseless state vector simulation of ``TNSim``, ``DSVSim`` and ``MISim``.
+
+Random circuits of ``h``, ``rz``, ``csum`` and ``cx`` gates on qudits of the given dimension are simulated by
+each backend for a growing number of qudits, checking that all backends agree on the final state. ``TNSim`` is
+only timed up to ``--max-tn-qudits`` qudits, where its contraction becomes very slow.
+
+Usage:
+    python bench/bench_simulators.py [--dimension 3] [--qudits 2 4 6 8 10] [--gates 200] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+import numpy as np
+
+from mqt.qudits.quantum_circuit import QuantumCircuit
+from mqt.qudits.simulation import MQTQuditProvider
+
+
+def _circuit(num_qudits: int, dimension: int, gates: int, rng: np.random.Generator) -> QuantumCircuit:
+    circuit = QuantumCircuit(num_qudits, [dimension] * num_qudits, 0)
+    while circuit.number_gates < gates:
+        qudit = int(rng.integers(num_qudits))
+        circuit.h(qudit)
+        circuit.rz(qudit, [0, 1, rng.uniform(0, 2 * np.pi)])
+        if num_qudits > 1:
+            first, second = (int(q) for q in rng.choice(num_qudits, 2, replace=False))
+            circuit.csum([first, second])
+            circuit.cx([second, first], [0, 1, dimension - 1, rng.uniform(0, 2 * np.pi)])
+    return circuit
+
+
+def _time(func: object, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))  # type: ignore[arg-type]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dimension", type=int, default=3)
+    parser.add_argument("--qudits", type=int, nargs="+", default=[2, 4, 6, 8, 10])
+    parser.add_argument("--gates", type=int, default=200)
+    parser.add_argument("--max-tn-qudits", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    provider = MQTQuditProvider()
+    backends = {name: provider.get_backend(name) for name in ("tnsim", "dsvsim", "misim")}
+    rng = np.random.default_rng(0)
+    print(f"{'qudits':>6} {'gates':>6} {'tnsim [s]':>10} {'dsvsim [s]':>11} {'misim [s]':>10}")
+    for num_qudits in args.qudits:
+        circuit = _circuit(num_qudits, args.dimension, args.gates, rng)
+        names = [name for name in backends if name != "tnsim" or num_qudits <= args.max_tn_qudits]
+
+        states = {name: backends[name].execute(circuit) for name in names}
+        for name in names[1:]:
+            assert np.allclose(states[name], states[names[0]]), f"{name} disagrees with {names[0]}"
+
+        times = {name: _time(lambda b=backends[name], c=circuit: b.execute(c), args.repeat) for name in names}
+        columns = [f"{times[name]:.4f}" if name in times else "-" for name in backends]
+        print(f"{num_qudits:>6} {circuit.number_gates:>6} {columns[0]:>10} {columns[1]:>11} {columns[2]:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -76,7 +76,7 @@ public:
   void clear() {
     if (count > 0) {
       for (auto& entry : table) {
-        entry.result.p = nullptr;
+        entry.result.nextNode = nullptr;
       }
       count = 0;
     }
@@ -1148,6 +1148,132 @@ inline SeptMatrix embX7(fp phi, size_t leva, size_t levb) {
   return identity;
 }
 
+///////////////////////////////////////////////////////////////////////////////////////////////
+///////////////////////////////////////////////////////////////////////////////////////////////
+///////////////////////////////////////////////////////////////////////////////////////////////
+
+// Gate matrices of any dimension d, d*d entries in row-major order. They
+// agree with the fixed-size matrices above for the dimensions those cover.
+using DynamicGateMatrix = std::vector<ComplexValue>;
+
+inline DynamicGateMatrix Id(size_t dim) {
+  DynamicGateMatrix identity(dim * dim, COMPLEX_ZERO);
+  for (size_t level = 0; level < dim; ++level) {
+    identity.at(level * dim + level) = COMPLEX_ONE;
+  }
+  return identity;
+}
+
+inline void checkLevels(size_t leva, size_t levb, size_t dim) {
+  if (leva > levb or levb >= dim) {
+    throw std::invalid_argument("LEV A cannot be higher than  LEV B");
+  }
+}
+
+inline DynamicGateMatrix RXYd(fp theta, fp phi, size_t leva, size_t levb,
+                              size_t dim) {
+  checkLevels(leva, levb, dim);
+  DynamicGateMatrix identity = Id(dim);
+  identity.at(dim * leva + leva) = dd::ComplexValue{std::cos(theta / 2.), 0.};
+  identity.at(dim * leva + levb) =
+      dd::ComplexValue{-std::sin(theta / 2.) * std::sin(phi),
+                       -std::sin(theta / 2.) * std::cos(phi)};
+  identity.at(dim * levb + leva) =
+      dd::ComplexValue{std::sin(theta / 2.) * std::sin(phi),
+                       -std::sin(theta / 2.) * std::cos(phi)};
+  identity.at(dim * levb + levb) = dd::ComplexValue{std::cos(theta / 2.), 0.};
+  return identity;
+}
+
+inline DynamicGateMatrix RHd(size_t leva, size_t levb, size_t dim) {
+  checkLevels(leva, levb, dim);
+  DynamicGateMatrix identity = Id(dim);
+  identity.at(dim * leva + leva) = COMPLEX_ISQRT2_2;
+  identity.at(dim * leva + levb) = COMPLEX_ISQRT2_2;
+  identity.at(dim * levb + leva) = COMPLEX_ISQRT2_2;
+  identity.at(dim * levb + levb) = COMPLEX_MISQRT2_2;
+  return identity;
+}
+
+inline DynamicGateMatrix RZd(fp phi, size_t leva, size_t levb, size_t dim) {
+  checkLevels(leva, levb, dim);
+  DynamicGateMatrix identity = Id(dim);
+  identity.at(dim * leva + leva) =
+      dd::ComplexValue{std::cos(phi / 2), -std::sin(phi / 2)};
+  identity.at(dim * levb + levb) =
+      dd::ComplexValue{std::cos(phi / 2), +std::sin(phi / 2)};
+  return identity;
+}
+
+inline DynamicGateMatrix VirtRZd(fp phi, size_t i, size_t dim) {
+  DynamicGateMatrix identity = Id(dim);
+  identity.at(i + i * dim) = dd::ComplexValue{std::cos(phi), -std::sin(phi)};
+  return identity;
+}
+
+// shift of every level by `steps`, X to the power of `steps`
+inline DynamicGateMatrix Xd(size_t dim, size_t steps = 1) {
+  DynamicGateMatrix shift(dim * dim, COMPLEX_ZERO);
+  for (size_t level = 0; level < dim; ++level) {
+    shift.at(((level + steps) % dim) * dim + level) = COMPLEX_ONE;
+  }
+  return shift;
+}
+
+inline DynamicGateMatrix Zd(size_t dim) {
+  DynamicGateMatrix id = Id(dim);
+  for (size_t level = 0; level < dim; ++level) {
+    const double angle =
+        fmod(2.0 * static_cast<double>(level) / static_cast<double>(dim), 2.0) *
+        PI;
+    id.at(level + level * dim) = dd::ComplexValue{cos(angle), sin(angle)};
+  }
+  return id;
+}
+
+inline DynamicGateMatrix Sd(size_t dim) {
+  if (dim == 2) {
+    return {Smat.begin(), Smat.end()};
+  }
+  DynamicGateMatrix id = Id(dim);
+  for (size_t level = 0; level < dim; ++level) {
+    const auto lev = static_cast<double>(level);
+    const double omegaArg =
+        fmod(2.0 / static_cast<double>(dim) * lev * (lev + 1) / 2.0, 2.0);
+    id.at(level + level * dim) =
+        dd::ComplexValue{std::cos(omegaArg * PI), std::sin(omegaArg * PI)};
+  }
+  return id;
+}
+
+inline DynamicGateMatrix Hd(size_t dim) {
+  DynamicGateMatrix fourier(dim * dim, COMPLEX_ZERO);
+  const auto norm = 1. / std::sqrt(static_cast<double>(dim));
+  for (size_t row = 0; row < dim; ++row) {
+    for (size_t col = 0; col < dim; ++col) {
+      const double angle = fmod(2.0 / static_cast<double>(dim) *
+                                    static_cast<double>(row * col),
+                                2.0) *
+                           PI;
+      fourier.at(row * dim + col) =
+          dd::ComplexValue{norm * std::cos(angle), norm * std::sin(angle)};
+    }
+  }
+  return fourier;
+}
+
+inline DynamicGateMatrix embXd(fp phi, size_t leva, size_t levb, size_t dim) {
+  checkLevels(leva, levb, dim);
+  DynamicGateMatrix identity = Id(dim);
+  identity.at(dim * leva + leva) = COMPLEX_ZERO;
+  identity.at(dim * leva + levb) =
+      dd::ComplexValue{-std::sin(phi), -std::cos(phi)};
+  identity.at(dim * levb + leva) =
+      dd::ComplexValue{std::sin(phi), -std::cos(phi)};
+  identity.at(dim * levb + levb) = COMPLEX_ZERO;
+  return identity;
+}
+
 // NOLINTEND(readability-identifier-naming)
 } // namespace dd
 #endif // DD_PACKAGE_GATEMATRIXDEFINITIONS_H
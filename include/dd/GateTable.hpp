@@ -0,0 +1,138 @@
+/*
+ * This file is part of the MQT DD Package which is released under the MIT
+ * license. See file README.md or go to
+ * https://www.cda.cit.tum.de/research/quantum_dd/ for more information.
+ */
+
+#ifndef DDpackage_GATETABLE_HPP
+#define DDpackage_GATETABLE_HPP
+
+#include "Definitions.hpp"
+
+#include <cstddef>
+#include <iostream>
+#include <iterator>
+#include <list>
+#include <map>
+#include <optional>
+#include <utility>
+#include <vector>
+
+namespace dd {
+
+/// Bounded cache of gate decision diagrams, the least recently used gate is
+/// evicted first. Reference counting of the cached edges is left to the
+/// package owning the table.
+/// \tparam KeyType type describing a gate, has to be ordered
+/// \tparam EdgeType type of the cached decision diagrams
+template <class KeyType, class EdgeType> class GateTable {
+public:
+  static constexpr std::size_t DEFAULT_CAPACITY = 4096;
+
+  explicit GateTable(std::size_t capacity = DEFAULT_CAPACITY)
+      : capacity(capacity) {}
+
+  [[nodiscard]] std::size_t size() const { return entries.size(); }
+  [[nodiscard]] std::size_t getCapacity() const { return capacity; }
+  [[nodiscard]] std::size_t getHits() const { return hits; }
+  [[nodiscard]] std::size_t getLookups() const { return lookups; }
+  [[nodiscard]] std::size_t getEvictions() const { return evictions; }
+
+  // the cached edge, or an edge without node if the gate is not cached
+  EdgeType lookup(const KeyType& key) {
+    lookups++;
+    const auto it = entries.find(key);
+    if (it == entries.end()) {
+      return EdgeType{};
+    }
+    hits++;
+    recent.splice(recent.begin(), recent, it->second.second);
+    return it->second.first;
+  }
+
+  // returns the edges dropped from the table, a replaced entry of the same
+  // gate or the least recently used gates beyond the capacity
+  std::vector<EdgeType> insert(const KeyType& key, const EdgeType& edge) {
+    std::vector<EdgeType> evicted;
+    if (capacity == 0) {
+      evicted.push_back(edge);
+      return evicted;
+    }
+    const auto it = entries.find(key);
+    if (it != entries.end()) {
+      evicted.push_back(it->second.first);
+      it->second.first = edge;
+      recent.splice(recent.begin(), recent, it->second.second);
+      return evicted;
+    }
+    recent.push_front(Recency{entries.end()});
+    recent.front().entry =
+        entries.emplace(key, std::make_pair(edge, recent.begin())).first;
+    shrink(evicted);
+    return evicted;
+  }
+
+  // returns the edges that no longer fit into the table
+  std::vector<EdgeType> resize(std::size_t newCapacity) {
+    std::vector<EdgeType> evicted;
+    capacity = newCapacity;
+    shrink(evicted);
+    return evicted;
+  }
+
+  // returns all edges of the table
+  std::vector<EdgeType> clear() {
+    std::vector<EdgeType> evicted;
+    evicted.reserve(entries.size());
+    for (const auto& entry : entries) {
+      evicted.push_back(entry.second.first);
+    }
+    entries.clear();
+    recent.clear();
+    hits = 0;
+    lookups = 0;
+    evictions = 0;
+    return evicted;
+  }
+
+  [[nodiscard]] fp hitRatio() const {
+    return lookups == 0 ? 0. : static_cast<fp>(hits) / lookups;
+  }
+  std::ostream& printStatistics(std::ostream& os = std::cout) {
+    os << "hits: " << hits << ", looks: " << lookups
+       << ", ratio: " << hitRatio() << ", evictions: " << evictions
+       << ", size: " << entries.size() << std::endl;
+    return os;
+  }
+
+private:
+  struct Recency;
+  using Entries =
+      std::map<KeyType,
+               std::pair<EdgeType, typename std::list<Recency>::iterator>>;
+  // position of an entry in the recency list, most recently used first
+  struct Recency {
+    typename Entries::iterator entry;
+  };
+
+  void shrink(std::vector<EdgeType>& evicted) {
+    while (entries.size() > capacity) {
+      const auto last = std::prev(recent.end());
+      evicted.push_back(last->entry->second.first);
+      entries.erase(last->entry);
+      recent.erase(last);
+      evictions++;
+    }
+  }
+
+  std::size_t capacity;
+  Entries entries{};
+  std::list<Recency> recent{};
+  // gate table lookup statistics
+  std::size_t hits = 0;
+  std::size_t lookups = 0;
+  std::size_t evictions = 0;
+};
+} // namespace dd
+
+#endif // DDpackage_GATETABLE_HPP
@@ -15,6 +15,7 @@
 #include "Definitions.hpp"
 #include "Edge.hpp"
 #include "GateMatrixDefinitions.hpp"
+#include "GateTable.hpp"
 #include "UnaryComputeTable.hpp"
 #include "UniqueTable.hpp"
 
@@ -38,6 +39,7 @@
 #include <set>
 #include <stdexcept>
 #include <string>
+#include <tuple>
 #include <type_traits>
 #include <unordered_map>
 #include <unordered_set>
@@ -96,9 +98,10 @@ public:
 
   // reset package state
   void reset() {
-    // TODO IMPLEMENT
-    // clearUniqueTables();
-    // clearComputeTables();
+    clearGateTable();
+    clearUniqueTables();
+    clearComputeTables();
+    clearIdentityTable();
     complexNumber.clear();
   }
 
@@ -201,23 +204,20 @@ public:
 
     // calculate normalizing factor
     auto sumNorm2 = ComplexNumbers::mag2(edge.nextNode->edges.at(0).weight);
-    auto mag2Max = ComplexNumbers::mag2(edge.nextNode->edges.at(0).weight);
-    auto argMax = 0UL;
-
-    // TODO FIX BECAUSE AT THIS STAGE IT TRIES ALWAYS TO GET THE FIRST EDGE AND
-    // I WANT THE FIRST BEH BASED ON PREVIOUS CODE
     for (auto i = 1UL; i < edge.nextNode->edges.size(); i++) {
       sumNorm2 =
           sumNorm2 + ComplexNumbers::mag2(edge.nextNode->edges.at(i).weight);
     }
-    for (auto i = 1UL; i <= edge.nextNode->edges.size(); i++) {
-      auto counterBack = edge.nextNode->edges.size() - i;
-      if (ComplexNumbers::mag2(edge.nextNode->edges.at(counterBack).weight) +
-              ComplexTable<>::tolerance() >=
-          mag2Max) {
-        mag2Max =
-            ComplexNumbers::mag2(edge.nextNode->edges.at(counterBack).weight);
-        argMax = counterBack;
+    // the first of the largest edges, only non-zero edges are candidates so
+    // that the maximum is never zero when all magnitudes are below the
+    // tolerance
+    fp mag2Max = 0;
+    auto argMax = nonZeroIndices.back();
+    for (auto it = nonZeroIndices.rbegin(); it != nonZeroIndices.rend(); ++it) {
+      const auto mag2 = ComplexNumbers::mag2(edge.nextNode->edges.at(*it).weight);
+      if (mag2 + ComplexTable<>::tolerance() >= mag2Max) {
+        mag2Max = mag2;
+        argMax = *it;
       }
     }
 
@@ -507,6 +507,12 @@ public:
 
     auto targetRadix = registersSizes.at(static_cast<std::size_t>(target));
     auto edges = targetRadix * targetRadix;
+    if (mat.size() != edges) {
+      throw std::invalid_argument(
+          "Gate matrix with " + std::to_string(mat.size()) +
+          " entries does not match the dimension " +
+          std::to_string(targetRadix) + " of its target.");
+    }
     std::vector<mEdge> edgesMat(edges, mEdge::zero);
 
     auto currentControl = controls.begin();
@@ -596,6 +602,94 @@ public:
     return targetNodeEdge;
   }
 
+  // dynamic-size gate matrix, the d*d entries of a target of dimension d in
+  // row-major order
+  mEdge makeGateDD(const std::vector<std::complex<fp>>& mat,
+                   QuantumRegisterCount n, const Controls& controls,
+                   QuantumRegister target, std::size_t start = 0) {
+    DynamicGateMatrix entries;
+    entries.reserve(mat.size());
+    for (const auto& entry : mat) {
+      entries.push_back(ComplexValue{entry.real(), entry.imag()});
+    }
+    return makeGateDD<DynamicGateMatrix>(entries, n, controls, target, start);
+  }
+
+  // DD of a dense operator on several registers, identity on all others. The
+  // entries of `mat` are in row-major order over the registers in `lines`,
+  // given in ascending order with the first one most significant.
+  mEdge makeDDFromMatrix(const std::vector<std::complex<fp>>& mat,
+                         QuantumRegisterCount n,
+                         const std::vector<QuantumRegister>& lines) {
+    if (lines.empty() || !std::is_sorted(lines.begin(), lines.end()) ||
+        std::adjacent_find(lines.begin(), lines.end()) != lines.end() ||
+        lines.back() >= static_cast<QuantumRegister>(n)) {
+      throw std::invalid_argument(
+          "Lines of a dense operator must be distinct registers in ascending "
+          "order.");
+    }
+    std::vector<std::size_t> strides(lines.size(), 1);
+    for (auto i = lines.size() - 1; i > 0; --i) {
+      strides.at(i - 1) =
+          strides.at(i) * registersSizes.at(static_cast<std::size_t>(lines.at(i)));
+    }
+    const auto size =
+        strides.front() *
+        registersSizes.at(static_cast<std::size_t>(lines.front()));
+    if (mat.size() != size * size) {
+      throw std::invalid_argument(
+          "Dense operator with " + std::to_string(mat.size()) +
+          " entries does not match the dimensions of its lines.");
+    }
+    return makeDenseBlock(mat, size, lines, strides,
+                          static_cast<QuantumRegister>(n - 1), 0, 0);
+  }
+
+private:
+  // Sub-diagram of the registers up to `reg`, for the block of the operator
+  // whose row and column offsets, set by the lines above, are `row` and `col`
+  mEdge makeDenseBlock(const std::vector<std::complex<fp>>& mat,
+                       std::size_t size,
+                       const std::vector<QuantumRegister>& lines,
+                       const std::vector<std::size_t>& strides,
+                       QuantumRegister reg, std::size_t row, std::size_t col) {
+    if (reg < lines.front()) {
+      // all lines are fixed, the registers below carry the identity
+      const auto& value = mat.at(row * size + col);
+      if (value.real() == 0 && value.imag() == 0) {
+        return mEdge::zero;
+      }
+      auto edge = makeIdent(0, reg);
+      edge.weight = complexNumber.lookup(value.real(), value.imag());
+      return edge;
+    }
+
+    const auto radix = registersSizes.at(static_cast<std::size_t>(reg));
+    std::vector<mEdge> edges(radix * radix, mEdge::zero);
+    const auto line = std::find(lines.begin(), lines.end(), reg);
+    if (line == lines.end()) {
+      const auto block = makeDenseBlock(mat, size, lines, strides,
+                                        static_cast<QuantumRegister>(reg - 1),
+                                        row, col);
+      for (auto i = 0U; i < radix; ++i) {
+        edges.at(i * radix + i) = block;
+      }
+    } else {
+      const auto stride = strides.at(
+          static_cast<std::size_t>(std::distance(lines.begin(), line)));
+      for (auto i = 0U; i < radix; ++i) {
+        for (auto j = 0U; j < radix; ++j) {
+          edges.at(i * radix + j) = makeDenseBlock(
+              mat, size, lines, strides, static_cast<QuantumRegister>(reg - 1),
+              row + i * stride, col + j * stride);
+        }
+      }
+    }
+    return makeDDNode(reg, edges);
+  }
+
+public:
+
   ///
   /// Identity matrices
   ///
@@ -1252,164 +1346,33 @@ public:
             size_t leva, size_t levb, QuantumRegister cReg,
             QuantumRegister target, bool isDagger = false) {
     const dd::Control control{cReg, level};
-
-    if (registersSizes.at(static_cast<std::size_t>(target)) == 2) {
-      const auto matrix = dd::embX2(phi);
-      auto gate =
-          makeGateDD<dd::GateMatrix>(matrix, numberRegs, control, target);
-      if (isDagger) {
-        gate = conjugateTranspose(gate);
-      }
-      return gate;
-    }
-    if (registersSizes.at(static_cast<std::size_t>(target)) == 3) {
-      const auto matrix = dd::embX3(phi, leva, levb);
-      auto gate =
-          makeGateDD<dd::TritMatrix>(matrix, numberRegs, control, target);
-      if (isDagger) {
-        gate = conjugateTranspose(gate);
-      }
-      return gate;
-    }
-    if (registersSizes.at(static_cast<std::size_t>(target)) == 4) {
-      const auto matrix = dd::embX4(phi, leva, levb);
-      auto gate =
-          makeGateDD<dd::QuartMatrix>(matrix, numberRegs, control, target);
-      if (isDagger) {
-        gate = conjugateTranspose(gate);
-      }
-      return gate;
-    }
-    if (registersSizes.at(static_cast<std::size_t>(target)) == 5) {
-      const auto matrix = dd::embX5(phi, leva, levb);
-      auto gate =
-          makeGateDD<dd::QuintMatrix>(matrix, numberRegs, control, target);
-      if (isDagger) {
-        gate = conjugateTranspose(gate);
-      }
-      return gate;
-    }
-    if (registersSizes.at(static_cast<std::size_t>(target)) == 6) {
-      const auto matrix = dd::embX6(phi, leva, levb);
-      auto gate =
-          makeGateDD<dd::SextMatrix>(matrix, numberRegs, control, target);
-      if (isDagger) {
-        gate = conjugateTranspose(gate);
-      }
-      return gate;
-    }
-    if (registersSizes.at(static_cast<std::size_t>(target)) == 7) {
-      const auto matrix = dd::embX7(phi, leva, levb);
-      auto gate =
-          makeGateDD<dd::SeptMatrix>(matrix, numberRegs, control, target);
-      if (isDagger) {
-        gate = conjugateTranspose(gate);
-      }
-      return gate;
-    }
-    throw std::invalid_argument("Dimensions of target not implemented");
+    const auto matrix = dd::embXd(
+        phi, leva, levb, registersSizes.at(static_cast<std::size_t>(target)));
+    auto gate =
+        makeGateDD<dd::DynamicGateMatrix>(matrix, numberRegs, control, target);
+    if (isDagger) {
+      gate = conjugateTranspose(gate);
+    }
+    return gate;
   }
 
   mEdge csum(QuantumRegisterCount numberRegs, QuantumRegister cReg,
              QuantumRegister target, bool isDagger = false) {
     auto res = makeIdent(numberRegs);
-    if (registersSizes.at(static_cast<std::size_t>(target)) == 2) {
-      for (auto i = 0U; i < registersSizes.at(static_cast<std::size_t>(cReg));
-           i++) {
-        const dd::Control control{cReg, static_cast<dd::Control::Type>(i)};
-        const auto matrix = dd::Xmat;
-        auto gate =
-            makeGateDD<dd::GateMatrix>(matrix, numberRegs, control, target);
-        for (auto counter = 0U; counter < i; counter++) {
-          res = multiply(res, gate);
-        }
-      }
-      if (isDagger) {
-        res = conjugateTranspose(res);
-      }
-      return res;
-    }
-    if (registersSizes.at(static_cast<std::size_t>(target)) == 3) {
-      for (auto i = 0U; i < registersSizes.at(static_cast<std::size_t>(cReg));
-           i++) {
-        const dd::Control control{cReg, static_cast<dd::Control::Type>(i)};
-        const auto matrix = dd::X3;
-        auto gate =
-            makeGateDD<dd::TritMatrix>(matrix, numberRegs, control, target);
-        for (auto counter = 0U; counter < i; counter++) {
-          res = multiply(res, gate);
-        }
-      }
-      if (isDagger) {
-        res = conjugateTranspose(res);
-      }
-      return res;
-    }
-    if (registersSizes.at(static_cast<std::size_t>(target)) == 4) {
-      for (auto i = 0U; i < registersSizes.at(static_cast<std::size_t>(cReg));
-           i++) {
-        const dd::Control control{cReg, static_cast<dd::Control::Type>(i)};
-        const auto matrix = dd::X4;
-        auto gate =
-            makeGateDD<dd::QuartMatrix>(matrix, numberRegs, control, target);
-        for (auto counter = 0U; counter < i; counter++) {
-          res = multiply(res, gate);
-        }
-      }
-      if (isDagger) {
-        res = conjugateTranspose(res);
-      }
-      return res;
-    }
-    if (registersSizes.at(static_cast<std::size_t>(target)) == 5) {
-      for (auto i = 0U; i < registersSizes.at(static_cast<std::size_t>(cReg));
-           i++) {
-        const dd::Control control{cReg, static_cast<dd::Control::Type>(i)};
-        const auto matrix = dd::X5;
-        auto gate =
-            makeGateDD<dd::QuintMatrix>(matrix, numberRegs, control, target);
-        for (auto counter = 0U; counter < i; counter++) {
-          res = multiply(res, gate);
-        }
-      }
-      if (isDagger) {
-        res = conjugateTranspose(res);
-      }
-      return res;
+    const auto targetRadix =
+        registersSizes.at(static_cast<std::size_t>(target));
+    // level i of the control shifts the target by i
+    for (auto i = 1U; i < registersSizes.at(static_cast<std::size_t>(cReg));
+         i++) {
+      const dd::Control control{cReg, static_cast<dd::Control::Type>(i)};
+      const auto matrix = dd::Xd(targetRadix, i);
+      res = multiply(res, makeGateDD<dd::DynamicGateMatrix>(
+                              matrix, numberRegs, control, target));
     }
-    if (registersSizes.at(static_cast<std::size_t>(target)) == 6) {
-      for (auto i = 0U; i < registersSizes.at(static_cast<std::size_t>(cReg));
-           i++) {
-        const dd::Control control{cReg, static_cast<dd::Control::Type>(i)};
-        const auto matrix = dd::X6;
-        auto gate =
-            makeGateDD<dd::SextMatrix>(matrix, numberRegs, control, target);
-        for (auto counter = 0U; counter < i; counter++) {
-          res = multiply(res, gate);
-        }
-      }
-      if (isDagger) {
-        res = conjugateTranspose(res);
-      }
-      return res;
+    if (isDagger) {
+      res = conjugateTranspose(res);
     }
-    if (registersSizes.at(static_cast<std::size_t>(target)) == 7) {
-      for (auto i = 0U; i < registersSizes.at(static_cast<std::size_t>(cReg));
-           i++) {
-        const dd::Control control{cReg, static_cast<dd::Control::Type>(i)};
-        const auto matrix = dd::X7;
-        auto gate =
-            makeGateDD<dd::SeptMatrix>(matrix, numberRegs, control, target);
-        for (auto counter = 0U; counter < i; counter++) {
-          res = multiply(res, gate);
-        }
-      }
-      if (isDagger) {
-        res = conjugateTranspose(res);
-      }
-      return res;
-    }
-    throw std::invalid_argument("Dimensions of target not implemented");
+    return res;
   }
 
   vEdge spread2(QuantumRegisterCount n,
@@ -1880,7 +1843,8 @@ public:
       return result;
     }
 
-    std::vector<mEdge> newEdge{};
+    std::vector<mEdge> newEdge(edge.nextNode->edges.size(),
+                               dd::Edge<mNode>::zero);
     auto basicDim =
         registersSizes.at(static_cast<std::size_t>(edge.nextNode->varIndx));
 
@@ -1943,6 +1907,41 @@ public:
     return result;
   }
 
+  ///
+  /// Gate table
+  ///
+public:
+  // (kind of gate, dagger, parameters, target lines, controls), the kind is
+  // chosen by the caller and only has to tell gates with equal parameters apart
+  using GateKey = std::tuple<std::uint8_t, bool, std::vector<fp>,
+                             std::vector<QuantumRegister>, Controls>;
+
+  // the cached gate, or an edge without node if the gate is not cached
+  mEdge lookupGate(const GateKey& key) { return gateTable.lookup(key); }
+
+  // cached gates are referenced, so they survive garbage collection until
+  // they are evicted
+  void insertGate(const GateKey& key, const mEdge& gate) {
+    incRef(gate);
+    for (const auto& evicted : gateTable.insert(key, gate)) {
+      decRef(evicted);
+    }
+  }
+
+  void resizeGateTable(std::size_t capacity) {
+    for (const auto& evicted : gateTable.resize(capacity)) {
+      decRef(evicted);
+    }
+  }
+
+  void clearGateTable() {
+    for (const auto& evicted : gateTable.clear()) {
+      decRef(evicted);
+    }
+  }
+
+  GateTable<GateKey, mEdge> gateTable{};
+
   ///
   /// Unique tables, Reference counting and garbage collection
   ///
@@ -1958,15 +1957,54 @@ public:
     getUniqueTable<Node>().decRef(e);
   }
 
+  // collect all nodes and complex numbers that are not referenced (see
+  // incRef) by any edge the caller holds on to. Compute table and identity
+  // table entries may point to collected nodes, so they are dropped as well.
+  bool garbageCollect(bool force = false) {
+    // return immediately if no table needs collection
+    if (!force && !vUniqueTable.possiblyNeedsCollection() &&
+        !mUniqueTable.possiblyNeedsCollection() &&
+        !complexNumber.complexTable.possiblyNeedsCollection()) {
+      return false;
+    }
+
+    auto cCollect = complexNumber.garbageCollect(force);
+    if (cCollect > 0) {
+      // collecting complex numbers invalidates the weights of unreferenced
+      // nodes, so the node tables have to be collected as well
+      force = true;
+    }
+    auto vCollect = vUniqueTable.garbageCollect(force);
+    auto mCollect = mUniqueTable.garbageCollect(force);
+
+    if (vCollect > 0 || mCollect > 0 || cCollect > 0) {
+      clearComputeTables();
+      clearIdentityTable();
+      return true;
+    }
+    return false;
+  }
+
+  void clearUniqueTables() {
+    vUniqueTable.clear();
+    mUniqueTable.clear();
+  }
+
+  void clearComputeTables() {
+    vectorAdd.clear();
+    matrixAdd.clear();
+    matrixVectorMultiplication.clear();
+    matrixMatrixMultiplication.clear();
+    vectorInnerProduct.clear();
+    vectorKronecker.clear();
+    matrixKronecker.clear();
+    matrixTranspose.clear();
+    conjugateMatrixTranspose.clear();
+  }
+
   UniqueTable<vNode> vUniqueTable{numberOfQuantumRegisters};
   UniqueTable<mNode> mUniqueTable{numberOfQuantumRegisters};
 };
-
-inline void clearUniqueTables() {
-  // TODO IMPLEMENT
-  // vUniqueTable.clear();
-  // mUniqueTable.clear();
-}
 // NOLINTNEXTLINE(cppcoreguidelines-avoid-non-const-global-variables)
 inline MDDPackage::vNode MDDPackage::vNode::terminalNode{
     {{{nullptr, Complex::zero}, {nullptr, Complex::zero}}}, nullptr, 0, -1};
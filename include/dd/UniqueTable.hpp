@@ -168,27 +168,28 @@ public:
   // and recursively increment reference counter for
   // each child if this is the first reference
   void incRef(const Edge<Node>& e) {
-    dd::ComplexNumbers::incRef(e.w);
-    if (e.p == nullptr || e.isTerminal()) {
+    dd::ComplexNumbers::incRef(e.weight);
+    if (e.nextNode == nullptr || e.isTerminal()) {
       return;
     }
 
-    if (e.p->ref == std::numeric_limits<decltype(e.p->ref)>::max()) {
+    if (e.nextNode->refCount ==
+        std::numeric_limits<decltype(e.nextNode->refCount)>::max()) {
       std::clog << "[WARN] MAXREFCNT reached for p="
-                << reinterpret_cast<std::uintptr_t>(e.p)
+                << reinterpret_cast<std::uintptr_t>(e.nextNode)
                 << ". Node will never be collected." << std::endl;
       return;
     }
 
-    e.p->ref++;
+    e.nextNode->refCount++;
 
-    if (e.p->ref == 1) {
-      for (const auto& edge : e.p->e) {
-        if (edge.p != nullptr) {
+    if (e.nextNode->refCount == 1) {
+      for (const auto& edge : e.nextNode->edges) {
+        if (edge.nextNode != nullptr) {
           incRef(edge);
         }
       }
-      active[e.p->v]++;
+      active[static_cast<std::size_t>(e.nextNode->varIndx)]++;
       activeNodeCount++;
       maxActive = std::max(maxActive, activeNodeCount);
     }
@@ -198,27 +199,28 @@ public:
   // and recursively decrement reference counter for
   // each child if this is the last reference
   void decRef(const Edge<Node>& e) {
-    dd::ComplexNumbers::decRef(e.w);
-    if (e.p == nullptr || e.isTerminal()) {
+    dd::ComplexNumbers::decRef(e.weight);
+    if (e.nextNode == nullptr || e.isTerminal()) {
       return;
     }
-    if (e.p->ref == std::numeric_limits<decltype(e.p->ref)>::max()) {
+    if (e.nextNode->refCount ==
+        std::numeric_limits<decltype(e.nextNode->refCount)>::max()) {
       return;
     }
 
-    if (e.p->ref == 0) {
+    if (e.nextNode->refCount == 0) {
       throw std::runtime_error("In decref: ref==0 before decref\n");
     }
 
-    e.p->ref--;
+    e.nextNode->refCount--;
 
-    if (e.p->ref == 0) {
-      for (const auto& edge : e.p->e) {
-        if (edge.p != nullptr) {
+    if (e.nextNode->refCount == 0) {
+      for (const auto& edge : e.nextNode->edges) {
+        if (edge.nextNode != nullptr) {
           decRef(edge);
         }
       }
-      active[e.p->v]--;
+      active[static_cast<std::size_t>(e.nextNode->varIndx)]--;
       activeNodeCount--;
     }
   }
@@ -241,7 +243,7 @@ public:
         Node* p = bucket;
         Node* lastp = nullptr;
         while (p != nullptr) {
-          if (p->ref == 0) {
+          if (p->refCount == 0) {
             assert(!Node::isTerminal(p));
             Node* next = p->next;
             if (lastp == nullptr) {
@@ -300,7 +302,7 @@ public:
     allocations = INITIAL_ALLOCATION_SIZE;
 
     for (auto& node : chunks[0]) {
-      node.ref = 0;
+      node.refCount = 0;
     }
 
     nodeCount = 0;
@@ -333,11 +335,12 @@ public:
 
         while (p != nullptr) {
           std::cout << "\t\t" << std::hex << reinterpret_cast<std::uintptr_t>(p)
-                    << std::dec << " " << p->ref << std::hex;
-          for (const auto& e : p->e) {
-            std::cout << " p" << reinterpret_cast<std::uintptr_t>(e.p) << "(r"
-                      << reinterpret_cast<std::uintptr_t>(e.w.r) << " i"
-                      << reinterpret_cast<std::uintptr_t>(e.w.i) << ")";
+                    << std::dec << " " << p->refCount << std::hex;
+          for (const auto& e : p->edges) {
+            std::cout << " p" << reinterpret_cast<std::uintptr_t>(e.nextNode)
+                      << "(r" << reinterpret_cast<std::uintptr_t>(e.weight.real)
+                      << " i" << reinterpret_cast<std::uintptr_t>(e.weight.img)
+                      << ")";
           }
           std::cout << std::dec << "\n";
           p = p->next;
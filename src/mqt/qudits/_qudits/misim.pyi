@@ -1,15 +1,87 @@
+import numpy as np
+from numpy.typing import NDArray
+
 from mqt.qudits.quantum_circuit import QuantumCircuit
 from mqt.qudits.simulation.noise_tools import NoiseModel
 
-def state_vector_simulation(circuit: QuantumCircuit, noise_model: NoiseModel) -> list[complex]:
+def state_vector_simulation(
+    circuit: QuantumCircuit, noise_model: NoiseModel, seed: int | None = None, fusion_width: int = 0
+) -> NDArray[np.complex128]:
     """Simulate the state vector of a quantum circuit with noise model.
 
     Args:
         circuit: The quantum circuit to simulate
         noise_model: The noise model to apply
+        seed: Seed of the noise draw, drawn at random if None
+        fusion_width: Maximum number of qudits of a block of consecutive gates applied to the state at once, 0
+            applies every gate on its own
+
+    Returns:
+        The state vector of the quantum circuit, first qudit most significant
+    """
+
+def sample_noisy(
+    circuit: QuantumCircuit,
+    noise_model: NoiseModel,
+    shots: int,
+    seed: int | None = None,
+    threads: int = 0,
+    checkpoint_interval: int = 0,
+    checkpoint_memory: int = 256 * 2**20,
+    fusion_width: int = 0,
+) -> NDArray[np.int64]:
+    """Sample measurement outcomes of noisy executions of a circuit on native threads.
+
+    Args:
+        circuit: The quantum circuit to simulate
+        noise_model: The noise model to apply
+        shots: Number of noisy executions
+        seed: Seed of the per-shot random streams, drawn at random if None
+        threads: Number of worker threads, 0 uses all hardware threads
+        checkpoint_interval: Number of gates between two stored noiseless states that shots resume from, 0 disables
+            checkpointing
+        checkpoint_memory: Maximum number of bytes taken by the stored states of a thread
+        fusion_width: Maximum number of qudits of a block of consecutive gates applied to the state at once, 0
+            applies every gate on its own. Blocks are split after gates followed by noise
 
     Returns:
-        list: The state vector of the quantum circuit
+        The measured basis state of every shot, first qudit most significant
     """
 
-__all__ = ["state_vector_simulation"]
+class Simulator:
+    """Decision diagram simulator that keeps its package alive across runs on the same dimensions."""
+
+    def __init__(self, dimensions: list[int], gate_cache_size: int = 4096) -> None: ...
+    @property
+    def dimensions(self) -> list[int]: ...
+    def run(
+        self, circuit: QuantumCircuit, noise_model: NoiseModel, seed: int | None = None, fusion_width: int = 0
+    ) -> NDArray[np.complex128]:
+        """Simulate the state vector of a circuit on the dimensions of the simulator.
+
+        Args:
+            circuit: The quantum circuit to simulate
+            noise_model: The noise model to apply
+            seed: Seed of the noise draw, drawn at random if None
+            fusion_width: Maximum number of qudits of a block of consecutive gates applied to the state at once, 0
+                applies every gate on its own
+
+        Returns:
+            The state vector of the quantum circuit, first qudit most significant
+        """
+
+    def garbage_collect(self, force: bool = False) -> bool:
+        """Collect unreferenced nodes, returns whether anything was collected."""
+
+    def reset(self) -> None:
+        """Clear all tables of the package."""
+
+    def gate_cache_stats(self) -> dict[str, int | float]:
+        """Statistics of the gate table, which keeps the diagrams of recently built gates.
+
+        Returns:
+            The ``hits`` and ``lookups`` of the table since the last reset, their ``hit_ratio``, the number of
+            ``evictions`` and the ``size`` and ``capacity`` of the table in gates
+        """
+
+__all__ = ["Simulator", "sample_noisy", "state_vector_simulation"]
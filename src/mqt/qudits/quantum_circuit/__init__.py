@@ -5,5 +5,6 @@ from __future__ import annotations
 from .circuit import QuantumCircuit
 from .components import QuantumRegister
 from .qasm import QASM
+from .symbol import Symbol
 
-__all__ = ["QASM", "QuantumCircuit", "QuantumRegister"]
+__all__ = ["QASM", "QuantumCircuit", "QuantumRegister", "Symbol"]
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import copy
 import locale
+from collections.abc import Mapping
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar, TypeVar, cast
 
@@ -40,6 +41,7 @@ if TYPE_CHECKING:
     from .components.extensions.controls import ControlData
     from .components.quantum_register import SiteMap
     from .gate import Gate, Parameter
+    from .symbol import Symbol
 
     InverseSitemap = dict[int, tuple[str, int]]
     from .components.classic_register import ClSitemap
@@ -151,6 +153,33 @@ class QuantumCircuit:
     def copy(self) -> QuantumCircuit:
         return copy.deepcopy(self)
 
+    @property
+    def parameters(self) -> list[Symbol]:
+        """Symbols of the circuit in the order of their first appearance."""
+        return list(dict.fromkeys(symbol for instruction in self.instructions for symbol in instruction.symbols))
+
+    def bind_parameters(self, values: Mapping[Symbol, float] | Sequence[float]) -> QuantumCircuit:
+        """Return a copy of the circuit with its symbols replaced by numbers.
+
+        Gates without symbols are shared with this circuit, the bound gates are new objects.
+
+        Args:
+            values: Value of every symbol, or a sequence of values in the order of :attr:`parameters`.
+        """
+        if not isinstance(values, Mapping):
+            symbols = self.parameters
+            if len(values) != len(symbols):
+                msg = f"Expected {len(symbols)} parameter values, got {len(values)}"
+                raise ValueError(msg)
+            values = dict(zip(symbols, values))
+
+        bound = copy.copy(self)
+        for name, value in vars(self).items():
+            if isinstance(value, (list, dict)):
+                setattr(bound, name, copy.copy(value))
+        bound.instructions = [instruction.bind(values, bound) for instruction in self.instructions]
+        return bound
+
     def append(self, qreg: QuantumRegister) -> None:
         self.quantum_registers.append(qreg)
         self.num_qudits += qreg.size
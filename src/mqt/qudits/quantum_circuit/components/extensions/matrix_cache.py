@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import threading
+import typing
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from .matrix_factory import MatrixFactory
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Hashable
+
+    from numpy.typing import NDArray
+
+    from ...gate import Gate
+
+
+@dataclass
+class CacheInfo:
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    nbytes: int
+
+
+def _freeze(value: object) -> Hashable:
+    """Turn gate parameters into a hashable key."""
+    if isinstance(value, np.ndarray):
+        return ("ndarray", value.shape, value.dtype.str, value.tobytes())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return typing.cast("Hashable", value)
+
+
+class GateMatrixCache:
+    """Process-wide LRU cache of the matrices returned by :meth:`Gate.to_matrix`.
+
+    Entries are keyed by the gate class, its parameters, dimensions, dagger flag, controls and the identities
+    flag of the request, so structurally identical gates share one matrix regardless of the circuit they belong
+    to. Gates whose matrix is not a function of these attributes (e.g. ``RandU``) opt out through
+    ``Gate.cacheable``. Cached matrices are read-only, :meth:`lookup` hands out copies.
+    """
+
+    def __init__(self, maxsize: int = 1024, max_bytes: int = 256 * 2**20) -> None:
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._nbytes = 0
+        self._entries: OrderedDict[Hashable, NDArray[np.complex128]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(gate: Gate, identities: int) -> Hashable:
+        targets = [gate.target_qudits] if isinstance(gate.target_qudits, int) else list(gate.target_qudits)
+        control_data = gate.control_info["controls"]
+        circuit_dimensions = gate.parent_circuit.dimensions
+        controls: tuple[tuple[int, ...], tuple[int, ...]] | None = None
+
+        if control_data is None and identities == 0:
+            # the bare matrix only depends on the relative order of the targets
+            lines: tuple[int, ...] = tuple(sorted(range(len(targets)), key=targets.__getitem__))
+            dimensions: tuple[int, ...] = ()
+        elif identities < 2:
+            reference_lines = gate.reference_lines
+            offset = min(reference_lines)
+            lines = tuple(t - offset for t in targets)
+            dimensions = tuple(circuit_dimensions[offset : max(reference_lines) + 1])
+            if control_data is not None:
+                controls = (tuple(c - offset for c in control_data.indices), tuple(control_data.ctrl_states))
+        else:
+            lines = tuple(targets)
+            dimensions = tuple(circuit_dimensions)
+            if control_data is not None:
+                controls = (tuple(control_data.indices), tuple(control_data.ctrl_states))
+
+        return (
+            type(gate),
+            _freeze(gate.control_info["params"]),
+            (gate.lev_a, gate.lev_b, gate.theta, gate.phi),
+            _freeze(gate.dimensions),
+            gate.dagger,
+            lines,
+            controls,
+            dimensions,
+            min(identities, 2),
+        )
+
+    def lookup(self, gate: Gate, identities: int) -> NDArray[np.complex128]:
+        """Return the matrix of ``gate``, computing and storing it on a miss."""
+        if not self.enabled or not gate.cacheable:
+            return MatrixFactory(gate, identities).generate_matrix()
+
+        key = self.key(gate, identities)
+        with self._lock:
+            matrix = self._entries.get(key)
+            if matrix is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return matrix.copy()
+            self.misses += 1
+
+        matrix = np.array(MatrixFactory(gate, identities).generate_matrix())
+        self._store(key, matrix)
+        return matrix.copy()
+
+    def _store(self, key: Hashable, matrix: NDArray[np.complex128]) -> None:
+        if matrix.nbytes > self.max_bytes or self.maxsize <= 0:
+            return
+        matrix.setflags(write=False)
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = matrix
+            self._nbytes += matrix.nbytes
+            while len(self._entries) > self.maxsize or self._nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        """Drop all entries and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def configure(self, maxsize: int | None = None, max_bytes: int | None = None, enabled: bool | None = None) -> None:
+        """Change the bounds of the cache or switch it on and off, evicting entries that no longer fit."""
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if enabled is not None:
+                self.enabled = enabled
+            while self._entries and (len(self._entries) > self.maxsize or self._nbytes > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries), self._nbytes)
+
+
+gate_matrix_cache = GateMatrixCache()
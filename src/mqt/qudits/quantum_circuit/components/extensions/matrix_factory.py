@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import itertools
 import operator
 import typing
 from functools import reduce
@@ -59,12 +58,14 @@ class MatrixFactory:
         controls: list[int] | None = None,
         controls_levels: list[int] | None = None,
     ) -> NDArray[np.complex128]:
-        # dimensions = list(reversed(dimensions))
-        # Convert qudits_applied and dimensions to lists if they are not already
+        """Embed a gate matrix into the span of ``ref_lines``, applying identities and controls.
+
+        For every configuration of the spectator lines (controls pinned to their levels) the global indices of
+        the target block are computed at once and the matrix is scattered into an identity with a single
+        fancy-indexing assignment.
+        """
         qudits_applied = [qudits_applied] if isinstance(qudits_applied, int) else qudits_applied
-        qudits_applied = qudits_applied.copy()
-        qudits_applied.sort()
-        slide_indices_qudits_a = [q - min(ref_lines) for q in qudits_applied]
+        qudits_applied = sorted(qudits_applied)
 
         dimensions = [dimensions] if isinstance(dimensions, int) else dimensions
         if len(dimensions) == 0:
@@ -73,71 +74,31 @@ class MatrixFactory:
         if len(qudits_applied) == len(ref_lines) and controls is None:
             return matrix
 
+        offset = min(ref_lines)
+        slide_targets = [q - offset for q in qudits_applied]
+        slide_controls = [q - offset for q in controls] if controls is not None else []
+        slide_rest = [i for i in range(len(dimensions)) if i not in slide_targets and i not in slide_controls]
+
+        target_dims = [dimensions[i] for i in slide_targets]
+        rest_dims = [dimensions[i] for i in slide_rest]
+        block_shape = (reduce(operator.mul, rest_dims, 1), reduce(operator.mul, target_dims, 1))
+        target_digits = np.unravel_index(np.arange(block_shape[1]), target_dims)
+        rest_digits = np.unravel_index(np.arange(block_shape[0]), rest_dims) if rest_dims else ()
+
+        # digits of every line laid out as (spectator configuration, target configuration)
+        multi_index = [np.zeros(block_shape, dtype=np.intp) for _ in dimensions]
+        for axis, digits in zip(slide_targets, target_digits):
+            multi_index[axis][:] = digits[np.newaxis, :]
+        for axis, digits in zip(slide_rest, rest_digits):
+            multi_index[axis][:] = digits[:, np.newaxis]
         if controls is not None:
-            slide_controls = [q - min(ref_lines) for q in controls]
-            rest_of_indices = set(ref_lines) - set(qudits_applied) - set(controls)
-        else:
-            rest_of_indices = set(ref_lines) - set(qudits_applied)
-        slide_indices_rest = [q - min(ref_lines) for q in rest_of_indices]
-
-        single_site_logics = (
-            [list(range(dimensions[qudits_applied[0]]))]
-            if len(qudits_applied) == 1
-            else [list(range(d)) for d in operator.itemgetter(*slide_indices_qudits_a)(dimensions)]
-        )
-
-        og_states_space = [list(element) for element in itertools.product(*single_site_logics)]
-
-        og_state_to_index = {tuple(state): i for i, state in enumerate(og_states_space)}
-
-        global_single_site_logics = [list(range(d)) for d in dimensions]
-        global_states_space = [list(element) for element in itertools.product(*global_single_site_logics)]
-        global_index_to_state = dict(enumerate(global_states_space))
+            assert controls_levels is not None
+            for axis, level in zip(slide_controls, controls_levels):
+                multi_index[axis][:] = level
+        block_indices = np.ravel_multi_index(tuple(multi_index), dimensions)
 
         result = np.identity(reduce(operator.mul, dimensions, 1), dtype="complex")
-
-        for r in range(result.shape[0]):
-            for c in range(result.shape[1]):
-                if controls is not None:
-                    extract_r = operator.itemgetter(*slide_controls)(global_index_to_state[r])
-                    extract_c = operator.itemgetter(*slide_controls)(global_index_to_state[c])
-                    if isinstance(extract_r, int):
-                        extract_r = [extract_r]
-                        extract_c = [extract_c]
-                    if (
-                        list(extract_r) == controls_levels
-                        and extract_r == extract_c
-                        and (
-                            not rest_of_indices
-                            or operator.itemgetter(*slide_indices_rest)(global_index_to_state[r])
-                            == operator.itemgetter(*slide_indices_rest)(global_index_to_state[c])
-                        )
-                    ):
-                        og_row_key = operator.itemgetter(*slide_indices_qudits_a)(global_index_to_state[r])
-                        og_col_key = operator.itemgetter(*slide_indices_qudits_a)(global_index_to_state[c])
-                        if isinstance(og_row_key, int):
-                            og_row_key = (og_row_key,)
-                        if isinstance(og_col_key, int):
-                            og_col_key = (og_col_key,)
-                        matrix_row = og_state_to_index[tuple(og_row_key)]
-                        matrix_col = og_state_to_index[tuple(og_col_key)]
-                        value = matrix[matrix_row, matrix_col]
-                        result[r, c] = value
-
-                elif not rest_of_indices or operator.itemgetter(*slide_indices_rest)(
-                    global_index_to_state[r]
-                ) == operator.itemgetter(*slide_indices_rest)(global_index_to_state[c]):
-                    og_row_key = operator.itemgetter(*slide_indices_qudits_a)(global_index_to_state[r])
-                    og_col_key = operator.itemgetter(*slide_indices_qudits_a)(global_index_to_state[c])
-                    if isinstance(og_row_key, int):
-                        og_row_key = (og_row_key,)
-                    if isinstance(og_col_key, int):
-                        og_col_key = (og_col_key,)
-                    matrix_row = og_state_to_index[tuple(og_row_key)]
-                    matrix_col = og_state_to_index[tuple(og_col_key)]
-                    value = matrix[matrix_row, matrix_col]
-                    result[r, c] = value
-
+        result[block_indices[:, :, np.newaxis], block_indices[:, np.newaxis, :]] = matrix
         return result
 
     @classmethod
@@ -4,17 +4,20 @@ import random
 import string
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, ClassVar, Optional, Union, cast
 
 import numpy as np
 
-from mqt.qudits.quantum_circuit.components.extensions.matrix_factory import MatrixFactory
+from mqt.qudits.quantum_circuit.components.extensions.matrix_cache import gate_matrix_cache
 
 from ..exceptions import CircuitError
 from .components.extensions.controls import ControlData
 from .components.extensions.gate_types import GateTypes
+from .symbol import Symbol
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
     from numpy.typing import NDArray
 
     Parameter = Optional[Union[list[Union[int, float]], list[Union[int, str]], NDArray[np.complex128, np.complex128]]]
@@ -30,6 +33,9 @@ class Instruction(ABC):
 class Gate(Instruction):
     """Unitary gate_matrix."""
 
+    # whether to_matrix results can be shared through the process-wide gate matrix cache
+    cacheable: ClassVar[bool] = True
+
     def __init__(
         self,
         circuit: QuantumCircuit,
@@ -91,6 +97,9 @@ class Gate(Instruction):
     def to_matrix(self, identities: int = 0) -> NDArray:
         """Return a np.ndarray for the gate_matrix unitary parameters.
 
+        Matrices are served from the process-wide ``gate_matrix_cache`` when an identical gate has been
+        converted before.
+
         Returns:
             np.ndarray: if the Gate subclass has a parameters definition.
 
@@ -98,12 +107,43 @@ class Gate(Instruction):
             CircuitError: If a Gate subclass does not implement this method an
                 exception will be raised when this base class method is called.
         """
+        if self.symbols:
+            msg = f"Gate {self._name} has unbound parameters {self.symbols}"
+            raise CircuitError(msg)
         if hasattr(self, "__array__"):
-            matrix_factory = MatrixFactory(self, identities)
-            return matrix_factory.generate_matrix()
+            return gate_matrix_cache.lookup(self, identities)
         msg = "to_matrix not defined for this "
         raise CircuitError(msg)
 
+    @property
+    def symbols(self) -> list[Symbol]:
+        """Symbolic parameters of the gate, in the order they appear in its parameters."""
+        if not isinstance(self._params, list):
+            return []
+        return [parameter for parameter in self._params if isinstance(parameter, Symbol)]
+
+    def bind(self, values: Mapping[Symbol, float], circuit: QuantumCircuit | None = None) -> Gate:
+        """Return a copy of the gate with its symbols replaced by ``values``, gates without symbols are returned.
+
+        Args:
+            values: Value of every symbol of the gate.
+            circuit: Circuit the bound gate belongs to. Defaults to the circuit of this gate.
+        """
+        if not self.symbols:
+            return self
+        parameters = cast("list[int | float | Symbol]", self._params)
+        bound = [float(values[p]) if isinstance(p, Symbol) else p for p in parameters]
+        gate = type(self)(  # type: ignore[call-arg]
+            self.parent_circuit if circuit is None else circuit,
+            self._name,
+            self.target_qudits,
+            bound,
+            self._dimensions,
+            self._controls_data,
+        )
+        gate.dagger = self.dagger
+        return gate
+
     def control(self, indices: list[int], ctrl_states: list[int]) -> Gate:
         if len(indices) == 0 or len(ctrl_states) == 0:
             return self
@@ -123,7 +163,7 @@ class Gate(Instruction):
             raise IndexError(msg)
         # if isinstance(self._dimensions, int):
         #    dimensions = [self._dimensions]
-        if any(ctrl >= self.parent_circuit.dimensions[i] for i, ctrl in enumerate(ctrl_states)):
+        if any(ctrl >= self.parent_circuit.dimensions[idx] for idx, ctrl in zip(indices, ctrl_states)):
             msg = "Controls States beyond qudit size "
             raise IndexError(msg)
         self._controls_data = ControlData(indices, ctrl_states)
@@ -8,6 +8,7 @@ from mqt.qudits.quantum_circuit.components.extensions.matrix_factory import from
 
 from ..components.extensions.gate_types import GateTypes
 from ..gate import Gate
+from ..symbol import Symbol
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
@@ -64,6 +65,8 @@ class LS(Gate):
             return False
 
         if isinstance(param, list):
+            if isinstance(param[0], Symbol):
+                return True
             assert 0 <= cast("float", param[0]) <= 2 * np.pi, f"Angle should be in the range [0, 2*pi]: {param[0]}"
             return True
 
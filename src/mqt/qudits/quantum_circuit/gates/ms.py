@@ -7,6 +7,7 @@ from scipy.linalg import expm  # type: ignore[import-not-found]
 
 from ..components.extensions.gate_types import GateTypes
 from ..gate import Gate
+from ..symbol import Symbol
 from .gellmann import GellMann
 
 if TYPE_CHECKING:
@@ -73,6 +74,8 @@ class MS(Gate):
             return False
 
         if isinstance(parameter, list):
+            if isinstance(parameter[0], Symbol):
+                return True
             assert 0 <= cast("float", parameter[0]) <= 2 * np.pi, (
                 f"Angle should be in the range [0, 2*pi]: {parameter[0]}"
             )
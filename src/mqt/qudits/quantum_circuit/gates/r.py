@@ -7,6 +7,7 @@ import numpy as np
 from ...compiler.compilation_minitools.local_compilation_minitools import regulate_theta, theta_cost
 from ..components.extensions.gate_types import GateTypes
 from ..gate import Gate
+from ..symbol import Symbol
 from .gellmann import GellMann
 
 if TYPE_CHECKING:
@@ -43,7 +44,8 @@ class R(Gate):
             self.theta: float = cast("float", parameters[2])
             self.phi: float = cast("float", parameters[3])
             self.lev_a, self.lev_b = self.levels_setter(self.original_lev_a, self.original_lev_b)
-            self.theta = regulate_theta(self.theta)
+            if not isinstance(self.theta, Symbol):
+                self.theta = regulate_theta(self.theta)
             self._params = parameters
 
     def __array__(self) -> NDArray:  # noqa: PLW3201
@@ -80,8 +82,8 @@ class R(Gate):
         if isinstance(parameter, list):
             assert isinstance(parameter[0], int)
             assert isinstance(parameter[1], int)
-            assert isinstance(parameter[2], float)
-            assert isinstance(parameter[3], float)
+            assert isinstance(parameter[2], (float, Symbol))
+            assert isinstance(parameter[3], (float, Symbol))
             assert parameter[0] >= 0
             assert parameter[0] < self.dimensions
             assert parameter[1] >= 0
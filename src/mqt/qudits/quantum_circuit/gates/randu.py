@@ -19,6 +19,8 @@ from scipy.stats import unitary_group  # type: ignore[import-not-found]
 
 
 class RandU(Gate):
+    cacheable = False
+
     def __init__(
         self,
         circuit: QuantumCircuit,
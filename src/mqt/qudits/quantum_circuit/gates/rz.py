@@ -7,6 +7,7 @@ import numpy as np
 from ...compiler.compilation_minitools.local_compilation_minitools import phi_cost, regulate_theta
 from ..components.extensions.gate_types import GateTypes
 from ..gate import Gate
+from ..symbol import Symbol
 from .r import R
 
 if TYPE_CHECKING:
@@ -40,7 +41,8 @@ class Rz(Gate):
             self.original_lev_a: int = cast("int", parameters[0])
             self.original_lev_b: int = cast("int", parameters[1])
             self.phi: float = cast("float", parameters[2])
-            self.phi = regulate_theta(self.phi)
+            if not isinstance(self.phi, Symbol):
+                self.phi = regulate_theta(self.phi)
             self.lev_a, self.lev_b = self.levels_setter(self.original_lev_a, self.original_lev_b)
             self._params = parameters
 
@@ -74,7 +76,7 @@ class Rz(Gate):
         if isinstance(parameter, list):
             assert isinstance(parameter[0], int)
             assert isinstance(parameter[1], int)
-            assert isinstance(parameter[2], float)
+            assert isinstance(parameter[2], (float, Symbol))
 
             assert parameter[0] >= 0
             assert parameter[0] < self.dimensions
@@ -7,6 +7,7 @@ import numpy as np
 from ...compiler.compilation_minitools.local_compilation_minitools import phi_cost, regulate_theta
 from ..components.extensions.gate_types import GateTypes
 from ..gate import Gate
+from ..symbol import Symbol
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
@@ -38,7 +39,8 @@ class VirtRz(Gate):
         if self.validate_parameter(parameters):
             self.lev_a: int = cast("int", parameters[0])
             self.phi: float = cast("float", parameters[1])
-            self.phi = regulate_theta(self.phi)
+            if not isinstance(self.phi, Symbol):
+                self.phi = regulate_theta(self.phi)
             self._params = parameters
 
     def __array__(self) -> NDArray:  # noqa: PLW3201
@@ -56,7 +58,7 @@ class VirtRz(Gate):
         if isinstance(param, list):
             if len(param) != 2:
                 return False
-            if not (isinstance(param[0], int) and isinstance(param[1], float)):
+            if not (isinstance(param[0], int) and isinstance(param[1], (float, Symbol))):
                 return False
             return 0 <= param[0] < self.dimensions
 
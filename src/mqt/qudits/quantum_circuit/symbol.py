@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+
+class Symbol:
+    """Placeholder for the angle of a rotation gate, given a value when the circuit is bound.
+
+    The angles of ``r``, ``rz``, ``virtrz``, ``ms`` and ``ls`` gates accept symbols. Circuits containing them
+    cannot be simulated until :meth:`QuantumCircuit.bind_parameters` replaces every symbol by a number. Symbols
+    compare by identity, two symbols with the same name are different parameters.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Symbol({self.name!r})"
+
+    def __str__(self) -> str:
+        return self.name
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from .observables import ExpectationEstimator, Observable
 from .qudit_provider import MQTQuditProvider
 
 __all__ = [
+    "ExpectationEstimator",
     "MQTQuditProvider",
+    "Observable",
 ]
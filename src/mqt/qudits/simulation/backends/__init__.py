@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+from .dmsim import DMSim
+from .dsvsim import DSVSim
 from .innsbruck_01 import Innsbruck01
 from .misim import MISim
+from .mpssim import MPSSim
 from .tnsim import TNSim
 
 __all__ = [
+    "DMSim",
+    "DSVSim",
     "Innsbruck01",
     "MISim",
+    "MPSSim",
     "TNSim",
 ]
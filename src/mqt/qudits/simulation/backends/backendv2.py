@@ -3,14 +3,23 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Any, TypedDict, cast
 
+import numpy as np
 from typing_extensions import Unpack
 
+from ..jobs import Job, JobResult
+from ..observables import ExpectationEstimator
+
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from numpy.typing import ArrayLike, NDArray
+
     from ...core import LevelGraph
     from ...quantum_circuit import QuantumCircuit
     from .. import MQTQuditProvider
-    from ..jobs import Job
+    from ..jobs import Counts
     from ..noise_tools import NoiseModel
+    from ..observables import Observable
 
 
 class Backend(ABC):
@@ -20,7 +29,17 @@ class Backend(ABC):
         noise_model: NoiseModel | None
         file_path: str | None
         file_name: str | None
+        file_compression: str | None
         full_state_memory: bool
+        workers: int | None
+        use_threads: bool
+        seed: int | None
+        checkpoint_interval: int | None
+        checkpoint_memory: int
+        max_bond_dimension: int | None
+        truncation_cutoff: float
+        sample_counts: bool
+        fusion_width: int
 
     def __init__(
         self,
@@ -39,6 +58,12 @@ class Backend(ABC):
         self.full_state_memory: bool = False
         self.file_path: str | None = None
         self.file_name: str | None = None
+        self.file_compression: str | None = None
+        self.workers: int | None = None
+        self.use_threads: bool = False
+        self.seed: int | None = None
+        self.checkpoint_interval: int | None = None
+        self.checkpoint_memory: int = 256 * 2**20
 
         self._options = self._default_options()
         if fields:
@@ -71,5 +96,53 @@ class Backend(ABC):
     def run(self, circuit: QuantumCircuit, **options: Unpack[DefaultOptions]) -> Job:
         pass
 
+    def run_batch(
+        self, circuit: QuantumCircuit, parameter_matrix: ArrayLike, **options: Unpack[DefaultOptions]
+    ) -> Job:
+        """Run ``circuit`` once for every row of ``parameter_matrix``.
+
+        Row ``i`` holds the values of the symbols of the circuit in the order of ``circuit.parameters``. The result
+        stacks the per-binding results: state vectors along a leading batch axis, counts as one histogram per
+        binding and density matrices, if the backend computes them, along a leading batch axis.
+
+        This default runs the bound circuits one after the other. Only :class:`TNSim` and :class:`DSVSim` evolve
+        noiseless batches together, noisy batches and the other backends fall back to this loop.
+        """
+        results = [
+            self.run(circuit.bind_parameters(row), **options).result() for row in np.atleast_2d(parameter_matrix)
+        ]
+        density_matrices = [result.get_density_matrix() for result in results]
+        job = Job(self)
+        job.set_result(
+            JobResult(
+                state_vector=np.concatenate([result.get_state_vector() for result in results]),
+                counts=[result.get_histogram() for result in results],
+                density_matrix=None if any(m is None for m in density_matrices) else np.stack(density_matrices),
+            )
+        )
+        return job
+
+    def expectation_values(
+        self, circuit: QuantumCircuit, observables: Sequence[Observable], **options: Unpack[DefaultOptions]
+    ) -> NDArray[np.float64]:
+        """Exact expectation values of ``observables`` in the final state of the noiseless circuit.
+
+        Runs with a noise model are estimated instead from the histogram of their shots with an
+        ``ExpectationEstimator``, so the observables have to be diagonal in the computational basis.
+        """
+        self._options.update(options)
+        if self._options.get("noise_model", None) is not None:
+            return self._estimate_from_counts(circuit, observables)
+        state = self.execute(circuit)
+        return np.array([observable.expectation_value(state, circuit.dimensions) for observable in observables])
+
+    def _estimate_from_counts(self, circuit: QuantumCircuit, observables: Sequence[Observable]) -> NDArray[np.float64]:
+        """Estimate diagonal observables from the histogram of the shots of a run with the current options."""
+        estimators = [ExpectationEstimator(observable, circuit.dimensions) for observable in observables]
+        counts = cast("Counts", self.run(circuit).result().get_histogram())
+        for estimator in estimators:
+            estimator.update_counts(counts)
+        return np.array([estimator.mean for estimator in estimators])
+
     def execute(self, circuit: QuantumCircuit, noise_model: NoiseModel | None = None) -> None:
         raise NotImplementedError
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+import typing
+from collections import OrderedDict
+
+import numpy as np
+import opt_einsum as oe  # type: ignore[import-untyped]
+
+from ...quantum_circuit.components.extensions.matrix_cache import CacheInfo
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from numpy.typing import NDArray
+
+NetworkKey = tuple[tuple[int, ...], bool, tuple[tuple[tuple[int, ...], int], ...]]
+
+
+def network_key(
+    system_sizes: Sequence[int], layout: Sequence[tuple[Sequence[int], int]], product_state: bool
+) -> NetworkKey:
+    """Structural fingerprint of a circuit network.
+
+    The network starts from one node per qudit if ``product_state`` is set, from a single state node otherwise.
+    Every gate in ``layout`` is given by the lines it acts on and a bond dimension: a bond of 0 stands for a single
+    node on all lines, any other bond for a chain of one node per line, in order, linked by edges of that dimension.
+    """
+    return tuple(system_sizes), product_state, tuple((tuple(lines), bond) for lines, bond in layout)
+
+
+def contraction_path(key: NetworkKey) -> NDArray[np.intp]:
+    """Contraction order of the network described by ``key``, as rows of node pairs in the ``opt_einsum`` format."""
+    system_sizes, product_state, layout = key
+    sizes = dict(enumerate(system_sizes))
+
+    def new_edge(size: int) -> int:
+        edge = len(sizes)
+        sizes[edge] = size
+        return edge
+
+    legs = list(range(len(system_sizes)))
+    inputs = [frozenset({leg}) for leg in legs] if product_state else [frozenset(legs)]
+    for lines, bond in layout:
+        outputs = [new_edge(system_sizes[line]) for line in lines]
+        if not bond:
+            inputs.append(frozenset([legs[line] for line in lines] + outputs))
+        else:
+            bonds = [new_edge(bond) for _ in lines[1:]]
+            for position, (line, output) in enumerate(zip(lines, outputs)):
+                inputs.append(frozenset([legs[line], output, *bonds[max(0, position - 1) : position + 1]]))
+        for line, output in zip(lines, outputs):
+            legs[line] = output
+
+    path = oe.paths.auto(inputs, frozenset(legs), sizes) if len(inputs) > 1 else []
+    return np.array(path, dtype=np.intp).reshape(-1, 2)
+
+
+class ContractionPathCache:
+    """Process-wide LRU cache of the contraction paths of circuit networks.
+
+    Circuits with the same lines, dimensions and gate layout share one path regardless of the values of their
+    gates, so parameter sweeps and repeated noisy trajectories only search for a contraction order once.
+    Cached paths are read-only.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._nbytes = 0
+        self._entries: OrderedDict[NetworkKey, NDArray[np.intp]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key: NetworkKey) -> NDArray[np.intp]:
+        """Return the contraction path of the network, searching and storing it on a miss."""
+        with self._lock:
+            path = self._entries.get(key)
+            if path is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return path
+            self.misses += 1
+
+        path = contraction_path(key)
+        self._store(key, path)
+        return path
+
+    def _store(self, key: NetworkKey, path: NDArray[np.intp]) -> None:
+        if self.maxsize <= 0:
+            return
+        path.setflags(write=False)
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = path
+            self._nbytes += path.nbytes
+            while len(self._entries) > self.maxsize:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        """Drop all entries and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries), self._nbytes)
+
+
+contraction_path_cache = ContractionPathCache()
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import operator
+from functools import reduce
+from typing import TYPE_CHECKING
+
+import numpy as np
+from typing_extensions import Unpack
+
+from ...quantum_circuit import QuantumCircuit
+from ..jobs import Counts, Job, JobResult
+from ..noise_tools import NoisyCircuitFactory
+from .backendv2 import Backend
+from .mpssim import local_matrix
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from numpy.typing import NDArray
+
+    from ...quantum_circuit.gate import Gate
+    from .. import MQTQuditProvider
+    from ..noise_tools import NoiseModel
+    from ..noise_tools.noisy_circuit_factory import NoiseChannel, NoiseEvent
+    from ..observables import Observable
+
+    # a noise event without the index of the instruction it follows
+    KrausKey = tuple[str, int, "int | tuple[int, int] | None"]
+
+
+def _apply_on_axes(tensor: NDArray[np.complex128], matrix: NDArray[np.complex128], axes: Sequence[int]) -> NDArray:
+    """Contract the input legs of ``matrix``, reshaped to the sizes of ``axes``, with those axes of ``tensor``."""
+    sizes = [tensor.shape[axis] for axis in axes]
+    applied = np.tensordot(matrix.reshape(sizes * 2), tensor, axes=(list(range(len(axes), 2 * len(axes))), axes))
+    return np.moveaxis(applied, list(range(len(axes))), axes)
+
+
+class DMSim(Backend):
+    """Density matrix simulator applying the channels of a noise model exactly.
+
+    The noise a :class:`NoisyCircuitFactory` samples after each instruction is applied as the Kraus map averaging
+    over all of its outcomes, so one run gives the exact mixed state of the noisy circuit. The channels following
+    an instruction act on single qudits, the ones on the same qudit are composed into one superoperator that is
+    applied to the row and column axes of the qudit at once.
+
+    Runs return the density matrix with the probabilities on its diagonal. If the ``sample_counts`` option is set,
+    the counts of ``shots`` outcomes are also drawn from the diagonal.
+    """
+
+    def __init__(
+        self,
+        provider: MQTQuditProvider,
+        name: str | None = None,
+        description: str | None = None,
+        **fields: Unpack[Backend.DefaultOptions],
+    ) -> None:
+        super().__init__(provider, name=name, description=description, **fields)
+        self.sample_counts = False
+
+    def run(self, circuit: QuantumCircuit, **options: Unpack[Backend.DefaultOptions]) -> Job:
+        job = Job(self)
+
+        self._options.update(options)
+        self.noise_model = self._options.get("noise_model", None)
+        self.shots = self._options.get("shots", 50)
+        self.memory = self._options.get("memory", False)
+        self.full_state_memory = self._options.get("full_state_memory", False)
+        self.file_path = self._options.get("file_path", None)
+        self.file_name = self._options.get("file_name", None)
+        self.seed = self._options.get("seed", None)
+        self.sample_counts = self._options.get("sample_counts", False)
+
+        density_matrix = self.execute(circuit, self.noise_model)
+        counts = Counts(circuit.dimensions)
+        memory = None
+        if self.sample_counts:
+            probabilities = np.clip(density_matrix.diagonal().real, 0, None)
+            probabilities /= probabilities.sum()
+            rng = np.random.default_rng(self.seed)
+            if self.memory:
+                memory = rng.choice(probabilities.size, size=self.shots, p=probabilities).tolist()
+                counts.update(memory)
+            else:
+                # the histogram is drawn at once, without per-shot outcomes
+                frequencies = rng.multinomial(self.shots, probabilities)
+                observed = np.flatnonzero(frequencies)
+                counts.update(observed, frequencies[observed])
+
+        job.set_result(
+            JobResult(state_vector=np.array([]), counts=counts, density_matrix=density_matrix, memory=memory)
+        )
+        return job
+
+    def execute(self, circuit: QuantumCircuit, noise_model: NoiseModel | None = None) -> NDArray[np.complex128]:
+        """Density matrix at the end of ``circuit``, the first qudit most significant."""
+        self.system_sizes = circuit.dimensions
+        self.circ_operations = circuit.instructions
+        sizes = list(circuit.dimensions)
+        num_qudits = len(sizes)
+        factory = None if noise_model is None else NoisyCircuitFactory(noise_model, circuit)
+        # the noise gates are built on a scratch circuit to get their matrices
+        scratch = QuantumCircuit(circuit.num_qudits, sizes, 0)
+        # Kraus matrices only depend on the gate, qudit and argument of an event, not on the instruction it follows
+        kraus_cache: dict[KrausKey, NDArray[np.complex128]] = {}
+
+        state_size = reduce(operator.mul, sizes, 1)
+        rho = np.zeros(sizes * 2, dtype=np.complex128)
+        rho[(0,) * (2 * num_qudits)] = 1
+
+        for index, op in enumerate(circuit.instructions):
+            lines = sorted(op.reference_lines)
+            matrix = local_matrix(op, sizes)
+            rho = _apply_on_axes(rho, matrix, lines)
+            rho = _apply_on_axes(rho, matrix.conj(), [line + num_qudits for line in lines])
+
+            if factory is None:
+                continue
+            for dit, superoperator in self._superoperators(
+                factory.noise_channels(index, op), scratch, kraus_cache
+            ).items():
+                rho = _apply_on_axes(rho, superoperator, [dit, dit + num_qudits])
+
+        return rho.reshape(state_size, state_size)
+
+    def expectation_values(
+        self, circuit: QuantumCircuit, observables: Sequence[Observable], **options: Unpack[Backend.DefaultOptions]
+    ) -> NDArray[np.float64]:
+        """Exact expectation values in the final mixed state, including the noise model of the options."""
+        self._options.update(options)
+        self.noise_model = self._options.get("noise_model", None)
+        density_matrix = self.execute(circuit, self.noise_model)
+        return np.array([
+            observable.expectation_value_of_density_matrix(density_matrix, circuit.dimensions)
+            for observable in observables
+        ])
+
+    @staticmethod
+    def _superoperators(
+        channels: Sequence[NoiseChannel], scratch: QuantumCircuit, kraus_cache: dict[KrausKey, NDArray]
+    ) -> dict[int, NDArray[np.complex128]]:
+        """Compose the channels following an instruction into one superoperator per qudit.
+
+        The superoperator of a qudit of dimension d is a (d*d, d*d) matrix acting on the pair of its row and
+        column indices.
+        """
+        superoperators: dict[int, NDArray[np.complex128]] = {}
+        for channel in channels:
+            dit = next(events[0][2] for _, events in channel if events)
+            dim = scratch.dimensions[dit]
+            superoperator = np.zeros((dim, dim, dim, dim), dtype=np.complex128)
+            for probability, events in channel:
+                kraus = np.identity(dim, dtype=np.complex128)
+                for event in events:
+                    key = event[1:]
+                    if key not in kraus_cache:
+                        kraus_cache[key] = DMSim._event_matrix(scratch, event)
+                    kraus = kraus_cache[key] @ kraus
+                superoperator += probability * np.einsum("ac,bd->abcd", kraus, kraus.conj())
+            superoperator = superoperator.reshape(dim * dim, dim * dim)
+            previous = superoperators.get(dit)
+            superoperators[dit] = superoperator if previous is None else superoperator @ previous
+        return superoperators
+
+    @staticmethod
+    def _event_matrix(scratch: QuantumCircuit, event: NoiseEvent) -> NDArray[np.complex128]:
+        _, gate, dit, argument = event
+        if argument is None:
+            noise: Gate = getattr(scratch, gate)(dit)
+        else:
+            noise = getattr(scratch, gate)(dit, list(argument) if isinstance(argument, tuple) else argument)
+        scratch.instructions.clear()
+        return noise.to_matrix(identities=0)
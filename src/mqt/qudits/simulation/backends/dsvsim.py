@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import operator
+from functools import reduce
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ...quantum_circuit.components.extensions.matrix_factory import MatrixFactory
+from .tnsim import TNSim
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from numpy.typing import ArrayLike, NDArray
+
+    from ...quantum_circuit import QuantumCircuit
+    from ...quantum_circuit.gate import Gate
+
+
+def _target_matrix(op: Gate, cached: bool = True) -> NDArray[np.complex128]:
+    """Matrix of ``op`` on its target lines in ascending order, without controls.
+
+    With ``cached`` unset the matrix is built without going through the process-wide gate matrix cache.
+    """
+    if op.control_info["controls"] is None:
+        return op.to_matrix(identities=0) if cached else MatrixFactory(op, 0).generate_matrix()
+    matrix = op.__array__()
+    return matrix.conj().T if op.dagger else matrix
+
+
+def _control_slice(op: Gate, num_lines: int) -> tuple[tuple[int | slice, ...], list[int]]:
+    """Index of the state slice where the controls of ``op`` hold their levels and the target axes in that slice."""
+    targets = sorted([op.target_qudits] if isinstance(op.target_qudits, int) else op.target_qudits)
+    control_data = op.control_info["controls"]
+    index: list[int | slice] = [slice(None)] * num_lines
+    if control_data is None:
+        return tuple(index), targets
+    for line, level in zip(control_data.indices, control_data.ctrl_states):
+        index[line] = level
+    return tuple(index), [t - sum(1 for c in control_data.indices if c < t) for t in targets]
+
+
+def evolve_batch(circuit: QuantumCircuit, parameter_matrix: ArrayLike) -> NDArray[np.complex128]:
+    """State vectors of ``circuit`` for every row of symbol values in ``parameter_matrix``, stacked.
+
+    The bindings are evolved together, with a leading batch axis on the dense state.
+    """
+    sizes = list(circuit.dimensions)
+    symbols = circuit.parameters
+    values = np.atleast_2d(np.asarray(parameter_matrix, dtype=float))
+    if values.shape[1] != len(symbols):
+        msg = f"Expected {len(symbols)} parameter values per binding, got {values.shape[1]}"
+        raise ValueError(msg)
+    bindings = [dict(zip(symbols, row)) for row in values]
+    batch = len(bindings)
+
+    state_size = reduce(operator.mul, sizes, 1)
+    states = np.zeros((batch, state_size), dtype=np.complex128)
+    states[:, 0] = 1
+    states = states.reshape(batch, *sizes)
+
+    for op in circuit.instructions:
+        # gates with symbols get one matrix per binding, the others are shared by the whole batch
+        if op.symbols:
+            # bound matrices are used once, storing them would only evict the shared ones from the cache
+            matrix = np.stack([_target_matrix(op.bind(binding), cached=False) for binding in bindings])
+        else:
+            matrix = _target_matrix(op)
+        index, axes = _control_slice(op, len(sizes))
+        view = states[(slice(None), *index)]
+        batch_axes = [axis + 1 for axis in axes]
+        trailing = list(range(view.ndim - len(axes), view.ndim))
+
+        moved = np.moveaxis(view, batch_axes, trailing)
+        applied = np.matmul(moved.reshape(batch, -1, matrix.shape[-1]), np.swapaxes(matrix, -1, -2))
+        view[...] = np.moveaxis(applied.reshape(moved.shape), trailing, batch_axes)
+
+    return states.reshape(batch, state_size)
+
+
+class DSVSim(TNSim):
+    """Dense state vector simulator.
+
+    Every gate is applied directly to the state tensor with one matrix product on the lines it acts on, so
+    long-range gates never build an operator on the lines between their targets. Runs, noise and checkpointing
+    behave as for :class:`TNSim`, including batches of parameter bindings.
+    """
+
+    def evolve(
+        self, circuit: QuantumCircuit, operations: Sequence[Gate], state: NDArray[np.complex128] | None = None
+    ) -> NDArray[np.complex128]:
+        """Apply ``operations`` on the lines of ``circuit`` to ``state``, the all-zero state if None."""
+        self.system_sizes = circuit.dimensions
+        self.circ_operations = operations
+        sizes = list(self.system_sizes)
+
+        # gates write into the spare buffer, then the two buffers swap roles
+        state_size = reduce(operator.mul, sizes, 1)
+        current = np.zeros(state_size, dtype=np.complex128)
+        if state is None:
+            current[0] = 1
+        else:
+            current[:] = np.ravel(state)
+        spare = np.empty_like(current)
+
+        for op in operations:
+            targets = sorted([op.target_qudits] if isinstance(op.target_qudits, int) else op.target_qudits)
+            control_data = op.control_info["controls"]
+            matrix = _target_matrix(op)
+
+            if control_data is None and targets == list(range(targets[0], targets[-1] + 1)):
+                # adjacent targets: the state is a (left, targets, right) matrix stack
+                left = reduce(operator.mul, sizes[: targets[0]], 1)
+                right = reduce(operator.mul, sizes[targets[-1] + 1 :], 1)
+                span = matrix.shape[0]
+                if right == 1:
+                    np.matmul(current.reshape(left, span), matrix.T, out=spare.reshape(left, span))
+                else:
+                    np.matmul(matrix, current.reshape(left, span, right), out=spare.reshape(left, span, right))
+                current, spare = spare, current
+                continue
+
+            # only the slice where the controls hold their levels is touched, the gate acts on its target axes
+            index, axes = _control_slice(op, len(sizes))
+            target_sizes = [sizes[t] for t in targets]
+
+            view = current.reshape(sizes)[index]
+            tensor = matrix.reshape(target_sizes * 2)
+            applied = np.tensordot(tensor, view, axes=(list(range(len(targets), 2 * len(targets))), axes))
+            applied = np.moveaxis(applied, list(range(len(targets))), axes)
+            if control_data is None:
+                spare.reshape(sizes)[...] = applied
+                current, spare = spare, current
+            else:
+                view[...] = applied
+
+        return current.reshape(1, state_size)
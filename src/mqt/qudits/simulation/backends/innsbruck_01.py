@@ -7,7 +7,7 @@ from typing_extensions import Unpack
 
 # from pyseq.mqt_qudits_runner.sequence_runner import quantum_circuit_runner
 from ...core import LevelGraph
-from ..jobs import Job, JobResult
+from ..jobs import Counts, Job, JobResult
 from .backendv2 import Backend
 
 if TYPE_CHECKING:
@@ -88,10 +88,21 @@ class Innsbruck01(Backend):
         self.full_state_memory = self._options.get("full_state_memory", False)
         self.file_path = self._options.get("file_path", None)
         self.file_name = self._options.get("file_name", None)
+        self.workers = self._options.get("workers", None)
+        self.use_threads = self._options.get("use_threads", False)
+        self.seed = self._options.get("seed", None)
+        self.checkpoint_interval = self._options.get("checkpoint_interval", None)
+        self.checkpoint_memory = self._options.get("checkpoint_memory", 256 * 2**20)
 
         assert self.shots >= 50, "Number of shots should be above 50"
         self.execute(circuit)
-        job.set_result(JobResult(state_vector=np.array([]), counts=self.outcome))
+        job.set_result(
+            JobResult(
+                state_vector=np.array([]),
+                counts=Counts.from_outcomes(self.outcome, circuit.dimensions),
+                memory=self.outcome if self.memory else None,
+            )
+        )
 
         return job
 
@@ -2,18 +2,18 @@ from __future__ import annotations
 
 import operator
 from functools import reduce
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-import numpy as np
 from typing_extensions import Unpack
 
-from ..._qudits.misim import state_vector_simulation
-from ..jobs import Job, JobResult
+from ..._qudits.misim import Simulator
+from ..jobs import Counts, Job, JobResult
 from ..noise_tools import NoiseModel
 from .backendv2 import Backend
 from .stochastic_sim import stochastic_simulation
 
 if TYPE_CHECKING:
+    import numpy as np
     from numpy.typing import NDArray
 
     from ...quantum_circuit import QuantumCircuit
@@ -29,6 +29,16 @@ class MISim(Backend):
         **fields: Unpack[Backend.DefaultOptions],
     ) -> None:
         super().__init__(provider, name=name, description=description, **fields)
+        # kept across jobs so consecutive circuits on the same dimensions reuse the decision diagram tables
+        self._simulator: Simulator | None = None
+        # consecutive gates on at most this many qudits are applied to the state as one block, 0 disables fusion
+        self.fusion_width: int = 0
+
+    def __getstate__(self) -> dict[str, Any]:
+        # the native simulator cannot be pickled, worker processes create their own
+        state = self.__dict__.copy()
+        state["_simulator"] = None
+        return state
 
     def __noise_model(self) -> NoiseModel | None:
         return self.noise_model
@@ -43,30 +53,33 @@ class MISim(Backend):
         self.full_state_memory = self._options.get("full_state_memory", False)
         self.file_path = self._options.get("file_path", None)
         self.file_name = self._options.get("file_name", None)
+        self.file_compression = self._options.get("file_compression", None)
+        self.workers = self._options.get("workers", None)
+        self.use_threads = self._options.get("use_threads", False)
+        self.seed = self._options.get("seed", None)
+        self.checkpoint_interval = self._options.get("checkpoint_interval", None)
+        self.checkpoint_memory = self._options.get("checkpoint_memory", 256 * 2**20)
+        self.fusion_width = self._options.get("fusion_width", 0)
 
         if self.noise_model is not None:
             assert self.shots >= 50, "Number of shots should be above 50"
-            job.set_result(JobResult(state_vector=self.execute(circuit), counts=stochastic_simulation(self, circuit)))
+            counts, memory = stochastic_simulation(self, circuit, job.metadata)
+            job.set_result(JobResult(state_vector=self.execute(circuit), counts=counts, memory=memory))
         else:
-            job.set_result(JobResult(state_vector=self.execute(circuit), counts=[]))
+            job.set_result(JobResult(state_vector=self.execute(circuit), counts=Counts(circuit.dimensions)))
 
         return job
 
-    def execute(self, circuit: QuantumCircuit, noise_model: NoiseModel | None = None) -> NDArray[np.complex128]:
+    def execute(
+        self, circuit: QuantumCircuit, noise_model: NoiseModel | None = None, seed: int | None = None
+    ) -> NDArray[np.complex128]:
         self.system_sizes = circuit.dimensions
         self.circ_operations = circuit.instructions
         if noise_model is None:
             noise_model = NoiseModel()
-        result = state_vector_simulation(circuit, noise_model)
-        state = np.array(result)
+        simulator = self._simulator
+        if simulator is None or simulator.dimensions != list(circuit.dimensions):
+            simulator = self._simulator = Simulator(circuit.dimensions)
+        state = simulator.run(circuit, noise_model, seed, self.fusion_width)
         state_size = reduce(operator.mul, self.system_sizes, 1)
-        # Reverse the dimensions of the circuit and reshape the state array
-        reversed_dimensions = list(reversed(circuit.dimensions))
-        state = state.reshape(reversed_dimensions)
-
-        # Reverse the order of the axes for the transpose operation
-        axes_order = list(reversed(list(range(len(circuit.dimensions)))))
-
-        # Transpose the state array
-        state = np.transpose(state, axes_order)
         return state.reshape((1, state_size))
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import operator
+from functools import reduce
+from typing import TYPE_CHECKING
+
+import numpy as np
+from typing_extensions import Unpack
+
+from ...quantum_circuit.components.extensions.matrix_factory import MatrixFactory
+from ..jobs import Counts, Job, JobResult
+from ..noise_tools import NoisyCircuitFactory
+from .backendv2 import Backend
+from .stochastic_sim import shot_rng
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from numpy.random import Generator
+    from numpy.typing import NDArray
+
+    from ...quantum_circuit import QuantumCircuit
+    from ...quantum_circuit.gate import Gate
+    from .. import MQTQuditProvider
+    from ..noise_tools import NoiseModel
+    from ..observables import Observable
+
+
+def local_matrix(op: Gate, dimensions: Sequence[int]) -> NDArray[np.complex128]:
+    """Matrix of ``op`` on its targets and controls in ascending order, the lines between them are left out."""
+    control_data = op.control_info["controls"]
+    if control_data is None:
+        return op.to_matrix(identities=0)
+
+    lines = sorted(op.reference_lines)
+    targets = [op.target_qudits] if isinstance(op.target_qudits, int) else op.target_qudits
+    matrix = op.__array__()
+    if op.dagger:
+        matrix = matrix.conj().T
+    return MatrixFactory.apply_identities_and_controls(
+        matrix,
+        [lines.index(t) for t in targets],
+        [dimensions[line] for line in lines],
+        list(range(len(lines))),
+        [lines.index(c) for c in control_data.indices],
+        control_data.ctrl_states,
+    )
+
+
+class MatrixProductState:
+    """Mixed-dimensional matrix product state kept in mixed canonical form.
+
+    Site ``i`` holds a tensor of shape (left bond, ``dimensions[i]``, right bond). Gates on several qudits are
+    applied on the contiguous block of sites they span after moving their qudits next to each other with swaps,
+    the block is split again by SVDs that keep at most ``max_bond_dimension`` singular values and drop the smallest
+    ones as long as their relative weight stays below ``cutoff``. :attr:`discarded_weight` is one minus the product
+    of the weights retained by all truncations, an estimate of the infidelity they caused.
+    """
+
+    def __init__(
+        self, dimensions: Sequence[int], max_bond_dimension: int | None = None, cutoff: float = 1e-12
+    ) -> None:
+        self.dimensions = list(dimensions)
+        self.max_bond_dimension = max_bond_dimension
+        self.cutoff = cutoff
+        self.discarded_weight = 0.0
+        self.tensors: list[NDArray[np.complex128]] = []
+        for dim in self.dimensions:
+            tensor = np.zeros((1, dim, 1), dtype=complex)
+            tensor[0, 0, 0] = 1
+            self.tensors.append(tensor)
+        # every site left of the center is a left isometry, every site right of it a right isometry
+        self.center = 0
+
+    @property
+    def bond_dimensions(self) -> list[int]:
+        return [tensor.shape[2] for tensor in self.tensors[:-1]]
+
+    def apply(self, op: Gate) -> None:
+        """Apply a gate of the circuit the state belongs to."""
+        lines = sorted(op.reference_lines)
+        matrix = local_matrix(op, self.dimensions)
+        if len(lines) == 1:
+            site = lines[0]
+            self.tensors[site] = np.einsum("ij,ajb->aib", matrix, self.tensors[site])
+            return
+
+        # swap network: the qudits of the gate are moved left until they sit next to the first one
+        swaps = []
+        for offset, line in enumerate(lines[1:], start=1):
+            for site in range(line, lines[0] + offset, -1):
+                self._swap(site - 1)
+                swaps.append(site - 1)
+
+        first, last = lines[0], lines[0] + len(lines) - 1
+        theta = self._merge(first, last)
+        shape = theta.shape
+        theta = np.einsum("ij,ajb->aib", matrix, theta.reshape(shape[0], -1, shape[-1]))
+        self._split(theta.reshape(shape), first)
+
+        for site in reversed(swaps):
+            self._swap(site)
+
+    def _swap(self, site: int) -> None:
+        theta = self._merge(site, site + 1)
+        self._split(theta.transpose(0, 2, 1, 3), site)
+
+    def _move_center(self, first: int, last: int) -> None:
+        while self.center < first:
+            tensor = self.tensors[self.center]
+            q, r = np.linalg.qr(tensor.reshape(-1, tensor.shape[2]))
+            self.tensors[self.center] = q.reshape(tensor.shape[0], tensor.shape[1], -1)
+            self.tensors[self.center + 1] = np.tensordot(r, self.tensors[self.center + 1], axes=1)
+            self.center += 1
+        while self.center > last:
+            tensor = self.tensors[self.center]
+            q, r = np.linalg.qr(tensor.reshape(tensor.shape[0], -1).T)
+            self.tensors[self.center] = q.T.reshape(-1, tensor.shape[1], tensor.shape[2])
+            self.tensors[self.center - 1] = np.tensordot(self.tensors[self.center - 1], r.T, axes=1)
+            self.center -= 1
+
+    def _merge(self, first: int, last: int) -> NDArray[np.complex128]:
+        """Contract the sites ``first`` to ``last`` after moving the center among them."""
+        self._move_center(first, last)
+        theta = self.tensors[first]
+        for site in range(first + 1, last + 1):
+            theta = np.tensordot(theta, self.tensors[site], axes=1)
+        return theta
+
+    def _split(self, theta: NDArray[np.complex128], first: int) -> None:
+        """Split a block of sites starting at ``first`` back into site tensors, leaving the center on its last site."""
+        site = first
+        while theta.ndim > 3:
+            left, dim = theta.shape[0], theta.shape[1]
+            u, s, vh = np.linalg.svd(theta.reshape(left * dim, -1), full_matrices=False)
+            keep, s = self._truncate(s)
+            self.tensors[site] = u[:, :keep].reshape(left, dim, keep)
+            theta = (s[:, np.newaxis] * vh[:keep]).reshape(keep, *theta.shape[2:])
+            site += 1
+        self.tensors[site] = theta
+        self.center = site
+
+    def _truncate(self, singular_values: NDArray[np.float64]) -> tuple[int, NDArray[np.float64]]:
+        weights = singular_values**2
+        total = weights.sum()
+        # relative weight of the singular values from each index to the end
+        tails = np.cumsum(weights[::-1])[::-1] / total
+        keep = max(1, int(np.count_nonzero(tails > self.cutoff)))
+        if self.max_bond_dimension is not None:
+            keep = min(keep, self.max_bond_dimension)
+        kept = weights[:keep].sum()
+        # the truncations compound, the state keeps the product of the retained weights
+        self.discarded_weight = 1 - (1 - self.discarded_weight) * float(kept / total)
+        return keep, singular_values[:keep] * np.sqrt(total / kept)
+
+    def expectation_value(self, observable: Observable) -> float:
+        """Expectation value contracted over the sites between the first and last qudit of ``observable`` only."""
+        if not observable.operators:
+            return observable.coefficient
+        first, last = observable.qudits[0], observable.qudits[-1]
+        # the isometries left and right of the center contract to identities
+        self._move_center(first, last)
+        environment = np.identity(self.tensors[first].shape[0], dtype=complex)
+        for site in range(first, last + 1):
+            tensor = self.tensors[site]
+            matrix = observable.operators.get(site)
+            applied = tensor if matrix is None else np.einsum("ij,ajb->aib", matrix, tensor)
+            environment = np.einsum("ac,aib,cid->bd", environment, tensor.conj(), applied)
+        return observable.coefficient * float(np.trace(environment).real)
+
+    def to_vector(self) -> NDArray[np.complex128]:
+        """Dense state vector, the first qudit most significant."""
+        theta = self.tensors[0]
+        for tensor in self.tensors[1:]:
+            theta = np.tensordot(theta, tensor, axes=1)
+        return theta.reshape(1, -1)
+
+    def sample(self, shots: int, rng: Generator | None = None) -> list[int]:
+        """Draw measurement outcomes qudit by qudit, without building the state vector."""
+        if rng is None:
+            rng = np.random.default_rng()
+        self._move_center(0, 0)
+        strides = [reduce(operator.mul, self.dimensions[i + 1 :], 1) for i in range(len(self.dimensions))]
+
+        outcomes = []
+        for _ in range(shots):
+            outcome = 0
+            environment = np.ones(1, dtype=complex)
+            for tensor, stride in zip(self.tensors, strides):
+                # every site right of this one is a right isometry, so the branch norms are the probabilities
+                branches = np.tensordot(environment, tensor, axes=1)
+                probabilities = np.sum(np.abs(branches) ** 2, axis=1)
+                level = int(rng.choice(len(probabilities), p=probabilities / probabilities.sum()))
+                environment = branches[level] / np.sqrt(probabilities[level])
+                outcome += level * stride
+            outcomes.append(outcome)
+        return outcomes
+
+
+class MPSSim(Backend):
+    """Matrix product state simulator for long chains of moderately entangled qudits.
+
+    Besides the state vector, which is only built for registers of at most ``max_state_size`` amplitudes, every
+    run samples ``shots`` outcomes from the final state. With a noise model each shot is a separate noisy
+    trajectory. The weight discarded by truncations is reported as ``job.metadata["discarded_weight"]``, averaged
+    over the trajectories of noisy runs.
+    """
+
+    max_state_size = 2**20
+
+    def __init__(
+        self,
+        provider: MQTQuditProvider,
+        name: str | None = None,
+        description: str | None = None,
+        **fields: Unpack[Backend.DefaultOptions],
+    ) -> None:
+        super().__init__(provider, name=name, description=description, **fields)
+        self.max_bond_dimension: int | None = None
+        self.truncation_cutoff: float = 1e-12
+        self.discarded_weight = 0.0
+
+    def run(self, circuit: QuantumCircuit, **options: Unpack[Backend.DefaultOptions]) -> Job:
+        job = Job(self)
+
+        self._options.update(options)
+        self.noise_model = self._options.get("noise_model", None)
+        self.shots = self._options.get("shots", 50)
+        self.memory = self._options.get("memory", False)
+        self.full_state_memory = self._options.get("full_state_memory", False)
+        self.file_path = self._options.get("file_path", None)
+        self.file_name = self._options.get("file_name", None)
+        self.workers = self._options.get("workers", None)
+        self.use_threads = self._options.get("use_threads", False)
+        self.seed = self._options.get("seed", None)
+        self.max_bond_dimension = self._options.get("max_bond_dimension", None)
+        self.truncation_cutoff = self._options.get("truncation_cutoff", 1e-12)
+
+        state = self.execute(circuit)
+        state_vector = state.to_vector() if reduce(operator.mul, circuit.dimensions, 1) <= self.max_state_size else None
+        if self.noise_model is None:
+            outcomes = state.sample(self.shots, np.random.default_rng(self.seed))
+        else:
+            outcomes = self.stochastic_simulation(circuit, self.noise_model)
+
+        job.metadata["discarded_weight"] = self.discarded_weight
+        job.set_result(
+            JobResult(
+                state_vector=np.array([]) if state_vector is None else state_vector,
+                counts=Counts.from_outcomes(outcomes, circuit.dimensions),
+                memory=outcomes if self.memory else None,
+            )
+        )
+        return job
+
+    def execute(self, circuit: QuantumCircuit, noise_model: NoiseModel | None = None) -> MatrixProductState:  # noqa: ARG002
+        self.system_sizes = circuit.dimensions
+        self.circ_operations = circuit.instructions
+
+        state = MatrixProductState(circuit.dimensions, self.max_bond_dimension, self.truncation_cutoff)
+        for op in circuit.instructions:
+            state.apply(op)
+        self.discarded_weight = state.discarded_weight
+        return state
+
+    def expectation_values(
+        self, circuit: QuantumCircuit, observables: Sequence[Observable], **options: Unpack[Backend.DefaultOptions]
+    ) -> NDArray[np.float64]:
+        self._options.update(options)
+        if self._options.get("noise_model", None) is not None:
+            return self._estimate_from_counts(circuit, observables)
+        self.max_bond_dimension = self._options.get("max_bond_dimension", None)
+        self.truncation_cutoff = self._options.get("truncation_cutoff", 1e-12)
+        state = self.execute(circuit)
+        return np.array([state.expectation_value(observable) for observable in observables])
+
+    def stochastic_simulation(self, circuit: QuantumCircuit, noise_model: NoiseModel) -> list[int]:
+        """Sample one outcome per noisy trajectory, with the per-shot random streams of the other backends."""
+        entropy = np.random.SeedSequence(self.seed).entropy
+        factory = NoisyCircuitFactory(noise_model, circuit)
+        outcomes = []
+        discarded = 0.0
+        for shot in range(self.shots):
+            rng = shot_rng(entropy, shot)
+            state = self.execute(factory.generate_circuit(rng))
+            discarded += state.discarded_weight
+            outcomes.extend(state.sample(1, rng))
+        self.discarded_weight = discarded / self.shots if self.shots else 0.0
+        return outcomes
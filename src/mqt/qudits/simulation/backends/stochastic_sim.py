@@ -1,77 +1,370 @@
 from __future__ import annotations
 
+import atexit
 import multiprocessing as mp
-import os
-import time
-from typing import TYPE_CHECKING
+import pickle  # noqa: S403
+import threading
+import uuid
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import count, islice
+from math import prod
+from typing import TYPE_CHECKING, Any, cast
 
 import numpy as np
 
+from ..._qudits.misim import sample_noisy
+from ..jobs import Counts
 from ..noise_tools import NoiseModel, NoisyCircuitFactory
-from ..save_info import save_full_states, save_shots
+from ..save_info import ResultWriter, circuit_attributes, shot_writer, state_writer
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from concurrent.futures import Executor, Future
+
+    from numpy.random import Generator
     from numpy.typing import NDArray
 
     from ...quantum_circuit import QuantumCircuit
+    from ..noise_tools.noisy_circuit_factory import NoiseRealization
     from . import MISim, TNSim
     from .backendv2 import Backend
 
+# Executors shared by all runs, keyed by (use_threads, workers)
+_executors: dict[tuple[bool, int], Executor] = {}
+_executors_lock = threading.Lock()
+# Deserialized payload of the job a worker (process or thread) is currently running
+_worker_state = threading.local()
+
+
+class JobNotLoadedError(Exception):
+    """Raised by a worker asked to run a chunk of a job whose payload it has not received yet."""
+
+
+def shot_rng(entropy: int, shot: int) -> Generator:
+    """Generator of one shot.
+
+    The stream is the one of ``np.random.SeedSequence(entropy).spawn(shots)[shot]``, built without spawning
+    the sequences of all other shots, so that every worker can derive the streams of the shots it runs.
+    """
+    return np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(shot,)))
 
-def generate_seed() -> int:
-    """Generate a random seed for numpy random generator."""
-    current_time = int(time.time() * 1000)
-    return hash((os.getpid(), current_time)) % 2**32
 
+def sample_outcomes(vector_data: NDArray[np.complex128], uniforms: NDArray[np.float64]) -> NDArray[np.int64]:
+    """Measure the quantum state once per uniform sample in ``[0, 1)``, all in one vectorized draw.
 
-def measure_state(vector_data: NDArray[np.complex128]) -> int:
+    Outcomes are found by inverting the cumulative distribution like ``Generator.choice`` does, so a sample from
+    ``rng.random()`` gives the same outcome as ``rng.choice(len(probabilities), p=probabilities)``.
+    """
+    cdf = np.cumsum(np.abs(vector_data.ravel()) ** 2)
+    cdf /= cdf[-1]
+    return cdf.searchsorted(uniforms, side="right")
+
+
+def measure_state(vector_data: NDArray[np.complex128], rng: Generator | None = None) -> int:
     """Measure the quantum state and return the result."""
-    probabilities = np.abs(vector_data.ravel()) ** 2
-    rng = np.random.default_rng(generate_seed())
-    return rng.choice(len(probabilities), p=probabilities)
+    if rng is None:
+        rng = np.random.default_rng()
+    return int(sample_outcomes(vector_data, rng.random(1))[0])
+
+
+def result_writer(backend: Backend, circuit: QuantumCircuit) -> ResultWriter | None:
+    """Open the file the per-shot results of a run are streamed to, None if the options do not ask for one."""
+    if not (backend.file_path and backend.file_name):
+        return None
+    attributes = {**circuit_attributes(circuit), "shots": backend.shots}
+    if backend.full_state_memory:
+        return state_writer(
+            backend.file_path, backend.file_name, prod(circuit.dimensions), attributes, backend.file_compression
+        )
+    if backend.memory:
+        return shot_writer(backend.file_path, backend.file_name, attributes, backend.file_compression)
+    return None
+
 
+def get_executor(workers: int | None = None, use_threads: bool = False) -> Executor:
+    """Return the executor shared by all runs with this configuration, creating it on first use."""
+    if workers is None:
+        workers = mp.cpu_count()
+    key = (use_threads, workers)
+    with _executors_lock:
+        executor = _executors.get(key)
+        if executor is None:
+            executor = ThreadPoolExecutor(workers) if use_threads else ProcessPoolExecutor(workers)
+            _executors[key] = executor
+        return executor
 
-def save_results(backend: Backend, results: list[int | NDArray[np.complex128]]) -> None:
-    """Save the simulation results based on backend configuration."""
-    if backend.full_state_memory and backend.file_path and backend.file_name:
-        save_full_states(results, backend.file_path, backend.file_name)
-    elif backend.memory and backend.file_path and backend.file_name:
-        save_shots(results, backend.file_path, backend.file_name)
 
+def shutdown_executors() -> None:
+    """Shut down all executors created by :func:`get_executor`."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=True, cancel_futures=True)
 
-def stochastic_simulation(backend: Backend, circuit: QuantumCircuit) -> NDArray | list[int]:
+
+atexit.register(shutdown_executors)
+
+
+def stochastic_simulation(
+    backend: Backend, circuit: QuantumCircuit, metadata: dict[str, Any] | None = None
+) -> tuple[Counts, list[Any] | None]:
+    """Sample the noisy executions of a circuit, statistics of the run are added to ``metadata`` if given.
+
+    Returns the histogram of the outcomes and the per-shot results, which are only kept if the ``memory`` or
+    ``full_state_memory`` option is set. With ``full_state_memory`` the per-shot results are the noisy states and
+    no outcomes are sampled. If a file is given by the options, the per-shot results are appended to it as the
+    workers return them, the noisy states are then only written to the file and not returned.
+    """
+    writer = result_writer(backend, circuit)
+    try:
+        result = _simulate(backend, circuit, metadata, writer)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is not None:
+        print(f"Simulation results saved to {writer.full_path}")  # noqa: T201
+    return result
+
+
+def _simulate(
+    backend: Backend, circuit: QuantumCircuit, metadata: dict[str, Any] | None, writer: ResultWriter | None
+) -> tuple[Counts, list[Any] | None]:
     noise_model: NoiseModel = NoiseModel()
     if backend.noise_model is not None:
         noise_model = backend.noise_model
 
     shots: int = backend.shots
-    num_processes: int = mp.cpu_count()
+    workers: int = backend.workers or mp.cpu_count()
     from . import MISim, TNSim
 
-    with mp.Pool(processes=num_processes) as pool:
-        if isinstance(backend, TNSim):
-            factory = NoisyCircuitFactory(noise_model, circuit)
-            args_tn = [(backend, factory) for _ in range(shots)]
-            results = pool.map(stochastic_execution_tn, args_tn)
-        elif isinstance(backend, MISim):
-            args_misim = [(backend, circuit, noise_model) for _ in range(shots)]
-            results = pool.map(stochastic_execution_mi, args_misim)
-        else:
-            msg = "Unsupported backend type"
-            raise TypeError(msg)
+    # every shot draws from its own stream derived from the seed, so results do not depend on the workers
+    root = np.random.SeedSequence(backend.seed)
+    entropy = cast("int", root.entropy)
+
+    if isinstance(backend, MISim) and not backend.full_state_memory:
+        # shots run on native threads of the extension, no executor needed
+        seed = int(root.generate_state(1, np.uint64)[0])
+        outcomes = sample_noisy(
+            circuit,
+            noise_model,
+            shots,
+            seed=seed,
+            threads=workers,
+            checkpoint_interval=backend.checkpoint_interval or 0,
+            checkpoint_memory=backend.checkpoint_memory,
+            fusion_width=backend.fusion_width,
+        )
+        if writer is not None:
+            writer.append(range(shots), outcomes)
+        return _finish(backend, circuit, outcomes)
+
+    if isinstance(backend, TNSim):
+        payload: tuple[Any, ...] = (backend, NoisyCircuitFactory(noise_model, circuit))
+    elif isinstance(backend, MISim):
+        payload = (backend, circuit, noise_model)
+    else:
+        msg = "Unsupported backend type"
+        raise TypeError(msg)
+
+    # the job is serialized once, every worker deserializes it once and keeps it for all of its chunks. Processes
+    # get the payload with the first chunk per worker, later chunks only carry the token of the job, and a chunk
+    # that reached a process without the job is sent again with it. Threads share the payload without a copy.
+    token = uuid.uuid4().hex
+    data = pickle.dumps(payload)
+    executor = get_executor(workers, backend.use_threads)
+    sent = count()
+
+    def send(
+        function: Callable[..., list[Any]], args: tuple[Any, ...], chunk: Sequence[Any], with_payload: bool = False
+    ) -> Future[list[Any]]:
+        if backend.use_threads or with_payload or next(sent) < workers:
+            return executor.submit(function, token, data, *args, chunk)
+        return executor.submit(function, token, None, *args, chunk)
+
+    def submit(
+        function: Callable[..., list[Any]],
+        items: Sequence[Any],
+        *args: Any,  # noqa: ANN401
+        on_chunk: Callable[[Sequence[Any], list[Any]], None] | None = None,
+        keep: bool = True,
+    ) -> list[Any]:
+        chunk_size = max(1, -(-len(items) // (4 * workers)))
+        chunks = iter([items[start : start + chunk_size] for start in range(0, len(items), chunk_size)])
+        # only a window of chunks is in flight, a future holds its results until it is dropped
+        pending: deque[tuple[Sequence[Any], Future[list[Any]]]] = deque(
+            (chunk, send(function, args, chunk)) for chunk in islice(chunks, 2 * workers)
+        )
+        results = []
+        while pending:
+            chunk, future = pending.popleft()
+            try:
+                chunk_results = future.result()
+            except JobNotLoadedError:
+                pending.appendleft((chunk, send(function, args, chunk, with_payload=True)))
+                continue
+            finally:
+                del future
+            for next_chunk in islice(chunks, 1):
+                pending.append((next_chunk, send(function, args, next_chunk)))
+            if on_chunk is not None:
+                on_chunk(chunk, chunk_results)
+            if keep:
+                results.extend(chunk_results)
+            del chunk_results
+        return results
+
+    if isinstance(backend, MISim):
+        # the results of a chunk are written as soon as its worker returns them, streamed states are dropped after
+        if backend.full_state_memory and writer is not None:
+            submit(run_chunk, range(shots), entropy, on_chunk=writer.append, keep=False)
+            return _finish(backend, circuit, None)
+        results = submit(run_chunk, range(shots), entropy, on_chunk=None if writer is None else writer.append)
+        return _finish(backend, circuit, None if backend.full_state_memory else np.array(results), results)
+
+    # draw the noise of every shot first and simulate each distinct noisy circuit only once
+    draws = submit(draw_chunk, range(shots), entropy)
+    groups: dict[NoiseRealization, list[int]] = {}
+    for shot, (realization, _) in enumerate(draws):
+        groups.setdefault(realization, []).append(shot)
+
+    # trajectories already simulated by earlier runs of the circuit come from the cache of the backend
+    cache = cast("TNSim", backend).trajectory_cache
+    circuit_key = cache.circuit_key(circuit)
+    states: dict[NoiseRealization, NDArray[np.complex128]] = {}
+    if circuit_key is not None:
+        for realization in groups:
+            state = cache.get(circuit_key, realization)
+            if state is not None:
+                states[realization] = state
+    missing = [realization for realization in groups if realization not in states]
+    for realization, state in zip(missing, submit(simulate_chunk, missing)):
+        states[realization] = state
+        if circuit_key is not None:
+            cache.put(circuit_key, realization, state)
+
+    if metadata is not None:
+        hits = len(groups) - len(missing)
+        metadata["trajectory_cache"] = {
+            "hits": hits,
+            "misses": len(missing),
+            "hit_rate": hits / len(groups) if groups else 0.0,
+        }
+
+    if backend.full_state_memory:
+        # the shots share the states of their realizations, rows are only copied one chunk at a time
+        results: list[Any] = [states[realization] for realization, _ in draws]
+        if writer is None:
+            return _finish(backend, circuit, None, results)
+        for start in range(0, shots, writer.chunk_rows):
+            block = results[start : start + writer.chunk_rows]
+            writer.append(range(start, start + len(block)), np.stack([state.ravel() for state in block]))
+        return _finish(backend, circuit, None)
+
+    outcomes = np.empty(shots, dtype=np.int64)
+    for realization, group_shots in groups.items():
+        uniforms = np.array([draws[shot][1] for shot in group_shots])
+        outcomes[group_shots] = sample_outcomes(states[realization], uniforms)
+    if writer is not None:
+        writer.append(range(shots), outcomes)
+    return _finish(backend, circuit, outcomes)
+
+
+def _finish(
+    backend: Backend, circuit: QuantumCircuit, outcomes: NDArray[np.int64] | None, results: list[Any] | None = None
+) -> tuple[Counts, list[Any] | None]:
+    """Histogram the outcomes of a run, keep its per-shot results if the options ask for them."""
+    counts = Counts(circuit.dimensions)
+    if outcomes is not None:
+        counts.update(outcomes)
+    if not (backend.memory or backend.full_state_memory) or (results is None and outcomes is None):
+        return counts, None
+    if results is None:
+        results = cast("NDArray[np.int64]", outcomes).tolist()
+    return counts, results
+
+
+def _load_job(token: str, data: bytes | None) -> tuple[Any, ...]:
+    job = getattr(_worker_state, "job", None)
+    if job is None or job[0] != token:
+        if data is None:
+            raise JobNotLoadedError(token)
+        job = (token, pickle.loads(data))  # noqa: S301
+        _worker_state.job = job
+    return cast("tuple[Any, ...]", job[1])
+
+
+def run_chunk(token: str, data: bytes | None, entropy: int, shots: range) -> list[int | NDArray]:
+    """Execute the ``shots`` of the job serialized in ``data`` in a worker."""
+    payload = _load_job(token, data)
+    return [stochastic_execution_mi(payload, shot_rng(entropy, shot)) for shot in shots]
+
+
+def draw_chunk(token: str, data: bytes | None, entropy: int, shots: range) -> list[tuple[NoiseRealization, float]]:
+    """Draw the noise realization and the measurement sample of the ``shots`` in a worker."""
+    _, factory = _load_job(token, data)
+    draws = []
+    for shot in shots:
+        rng = shot_rng(entropy, shot)
+        realization = factory.draw_noise(rng)
+        draws.append((realization, rng.random()))
+    return draws
+
+
+def prefix_checkpoints(
+    backend: TNSim, circuit: QuantumCircuit, interval: int | None, max_bytes: int
+) -> list[tuple[int, NDArray[np.complex128] | None]]:
+    """Noiseless states of ``circuit`` after every ``interval`` gates, as pairs of (gates applied, state).
+
+    The first pair is the zero state, whose state is None. States are stored as long as they fit in ``max_bytes``.
+    """
+    checkpoints: list[tuple[int, NDArray[np.complex128] | None]] = [(0, None)]
+    if not interval:
+        return checkpoints
+
+    operations = circuit.instructions
+    state_bytes = np.dtype(np.complex128).itemsize * prod(circuit.dimensions)
+    state = None
+    for position in range(interval, len(operations) + 1, interval)[: max_bytes // state_bytes]:
+        state = backend.evolve(circuit, operations[position - interval : position], state)
+        checkpoints.append((position, state))
+    return checkpoints
+
+
+def _load_checkpoints(
+    token: str, backend: TNSim, circuit: QuantumCircuit
+) -> list[tuple[int, NDArray[np.complex128] | None]]:
+    checkpoints = getattr(_worker_state, "checkpoints", None)
+    if checkpoints is None or checkpoints[0] != token:
+        interval, max_bytes = backend.checkpoint_interval, backend.checkpoint_memory
+        checkpoints = (token, prefix_checkpoints(backend, circuit, interval, max_bytes))
+        _worker_state.checkpoints = checkpoints
+    return cast("list[tuple[int, NDArray[np.complex128] | None]]", checkpoints[1])
 
-    save_results(backend, results)
-    return results
 
+def simulate_chunk(
+    token: str, data: bytes | None, realizations: list[NoiseRealization]
+) -> list[NDArray[np.complex128]]:
+    """Simulate noise realizations in a worker, each from the last checkpoint before its first noise gate."""
+    backend, factory = _load_job(token, data)
+    checkpoints = _load_checkpoints(token, backend, factory.circuit)
+    positions = [position for position, _ in checkpoints]
 
-def stochastic_execution_tn(args: tuple[TNSim, NoisyCircuitFactory]) -> NDArray | int:
-    backend, factory = args
-    circuit = factory.generate_circuit()
-    vector_data = backend.execute(circuit)
-    return vector_data if backend.full_state_memory else measure_state(vector_data)
+    states = []
+    for realization in realizations:
+        noiseless = realization[0][0] + 1 if realization else len(factory.circuit.instructions)
+        position, state = checkpoints[bisect_right(positions, noiseless) - 1]
+        noisy_circuit = factory.build_circuit(realization)
+        states.append(backend.evolve(noisy_circuit, noisy_circuit.instructions[position:], state))
+    return states
 
 
-def stochastic_execution_mi(args: tuple[MISim, QuantumCircuit, NoiseModel]) -> NDArray | int:
+def stochastic_execution_mi(
+    args: tuple[MISim, QuantumCircuit, NoiseModel], rng: Generator | None = None
+) -> NDArray | int:
     backend, circuit, noise_model = args
-    vector_data = backend.execute(circuit, noise_model)
-    return vector_data if backend.full_state_memory else measure_state(vector_data)
+    seed = None if rng is None else int(rng.integers(2**63))
+    vector_data = backend.execute(circuit, noise_model, seed)
+    return vector_data if backend.full_state_memory else measure_state(vector_data, rng)
@@ -8,15 +8,16 @@ import numpy as np
 import tensornetwork as tn  # type: ignore[import-not-found]
 from typing_extensions import Unpack
 
-from ...quantum_circuit.components.extensions.gate_types import GateTypes
-from ..jobs import Job, JobResult
+from ..jobs import Counts, Job, JobResult
 from .backendv2 import Backend
-from .stochastic_sim import stochastic_simulation
+from .contraction_paths import contraction_path_cache, network_key
+from .stochastic_sim import sample_outcomes, stochastic_simulation
+from .trajectory_cache import TrajectoryCache
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Iterable, Sequence
 
-    from numpy.typing import NDArray
+    from numpy.typing import ArrayLike, NDArray
 
     from ...quantum_circuit import QuantumCircuit
     from ...quantum_circuit.gate import Gate
@@ -33,6 +34,7 @@ class TNSim(Backend):
         **fields: Unpack[Backend.DefaultOptions],
     ) -> None:
         super().__init__(provider, name=name, description=description, **fields)
+        self.trajectory_cache = TrajectoryCache()
 
     def __noise_model(self) -> NoiseModel | None:
         return self.noise_model
@@ -46,26 +48,127 @@ class TNSim(Backend):
         self.full_state_memory = self._options.get("full_state_memory", False)
         self.file_path = self._options.get("file_path", None)
         self.file_name = self._options.get("file_name", None)
+        self.file_compression = self._options.get("file_compression", None)
+        self.workers = self._options.get("workers", None)
+        self.use_threads = self._options.get("use_threads", False)
+        self.seed = self._options.get("seed", None)
+        self.checkpoint_interval = self._options.get("checkpoint_interval", None)
+        self.checkpoint_memory = self._options.get("checkpoint_memory", 256 * 2**20)
 
         if self.noise_model is not None:
             assert self.shots >= 50, "Number of shots should be above 50"
-            job.set_result(JobResult(state_vector=self.execute(circuit), counts=stochastic_simulation(self, circuit)))
+            counts, memory = stochastic_simulation(self, circuit, job.metadata)
+            job.set_result(JobResult(state_vector=self.execute(circuit), counts=counts, memory=memory))
         else:
-            job.set_result(JobResult(state_vector=self.execute(circuit), counts=[]))
+            job.set_result(JobResult(state_vector=self.execute(circuit), counts=Counts(circuit.dimensions)))
 
         return job
 
-    def execute(self, circuit: QuantumCircuit, noise_model: NoiseModel | None = None) -> NDArray[np.complex128]:  # noqa: ARG002
+    def run_batch(
+        self, circuit: QuantumCircuit, parameter_matrix: ArrayLike, **options: Unpack[Backend.DefaultOptions]
+    ) -> Job:
+        """Run ``circuit`` for every row of ``parameter_matrix``, see :meth:`Backend.run_batch`.
+
+        Noiseless batches are evolved together by :meth:`execute_batch` instead of one run per binding. They return
+        empty histograms like noiseless runs, unless ``shots`` is passed to the call, then every binding samples
+        ``shots`` outcomes from its state.
+        """
+        self._options.update(options)
+        if self._options.get("noise_model", None) is not None:
+            return super().run_batch(circuit, parameter_matrix)
+
+        states = self.execute_batch(circuit, parameter_matrix)
+        counts = [Counts(circuit.dimensions) for _ in states]
+        shots = options.get("shots")
+        if shots:
+            # every binding samples from its own stream derived from the seed
+            streams = np.random.SeedSequence(self._options.get("seed", None)).spawn(len(states))
+            uniforms = [np.random.default_rng(stream).random(shots) for stream in streams]
+            counts = [
+                Counts.from_outcomes(sample_outcomes(state, samples), circuit.dimensions)
+                for state, samples in zip(states, uniforms)
+            ]
+        job = Job(self)
+        job.set_result(JobResult(state_vector=states, counts=counts))
+        return job
+
+    def execute_batch(self, circuit: QuantumCircuit, parameter_matrix: ArrayLike) -> NDArray[np.complex128]:
+        """State vectors of ``circuit`` for every row of symbol values in ``parameter_matrix``, stacked.
+
+        The bindings share one dense state with a leading batch axis, see :func:`.dsvsim.evolve_batch`.
+        """
+        from .dsvsim import evolve_batch
+
         self.system_sizes = circuit.dimensions
         self.circ_operations = circuit.instructions
+        return evolve_batch(circuit, parameter_matrix)
+
+    def execute(self, circuit: QuantumCircuit, noise_model: NoiseModel | None = None) -> NDArray[np.complex128]:  # noqa: ARG002
+        return self.evolve(circuit, circuit.instructions)
 
-        result = self.__contract_circuit(self.system_sizes, self.circ_operations)
+    def evolve(
+        self, circuit: QuantumCircuit, operations: Sequence[Gate], state: NDArray[np.complex128] | None = None
+    ) -> NDArray[np.complex128]:
+        """Apply ``operations`` on the lines of ``circuit`` to ``state``, the all-zero state if None."""
+        self.system_sizes = circuit.dimensions
+        self.circ_operations = operations
+
+        if state is not None and not operations:
+            return np.array(state, dtype=complex).reshape(1, -1)
+        result = self.__contract_circuit(self.system_sizes, self.circ_operations, state)
 
         result = np.transpose(result.tensor, list(range(len(self.system_sizes))))
 
         state_size = reduce(operator.mul, self.system_sizes, 1)
         return result.reshape(1, state_size)
 
+    def precompute_paths(self, circuits: Iterable[QuantumCircuit]) -> None:
+        """Search the contraction paths of ``circuits`` ahead of their execution, e.g. before a batch."""
+        for circuit in circuits:
+            layout = [self._network_layout(op) for op in circuit.instructions]
+            contraction_path_cache.lookup(network_key(circuit.dimensions, layout, product_state=True))
+
+    @staticmethod
+    def _network_layout(op: Gate) -> tuple[list[int], int]:
+        """Lines the nodes of ``op`` are connected to, its targets and controls in ascending order.
+
+        The second entry is the bond dimension of the node chain of a controlled gate, 0 for a single node.
+        """
+        return sorted(op.reference_lines), 0 if op.control_info["controls"] is None else 2
+
+    @staticmethod
+    def _controlled_gate_tensors(op: Gate, system_sizes: list[int]) -> list[NDArray[np.complex128]]:
+        """Chain of tensors of a controlled gate, one per line in ascending order.
+
+        The gate is ``I + P ⊗ (U - I)`` with ``P`` the projector on the control levels, so the chain carries a bond
+        of dimension 2 selecting either the identity or the projector on every control and ``U - I`` on the target.
+        Every tensor has the legs (in, out, left bond, right bond), without the bonds past the ends of the chain.
+        """
+        control_data = op.control_info["controls"]
+        assert control_data is not None
+        lines = sorted(op.reference_lines)
+        levels = dict(zip(control_data.indices, control_data.ctrl_states))
+
+        target_matrix = op.__array__()
+        if op.dagger:
+            target_matrix = target_matrix.conj().T
+
+        tensors = []
+        for position, line in enumerate(lines):
+            identity = np.identity(system_sizes[line], dtype=complex)
+            if line in levels:
+                selected = np.zeros_like(identity)
+                selected[levels[line], levels[line]] = 1
+            else:
+                selected = target_matrix - identity
+            # (bond, in, out) with the matrices transposed to (in, out)
+            stack = np.stack([identity, selected.T])
+            tensor = np.moveaxis(stack, 0, -1)
+            if 0 < position < len(lines) - 1:
+                tensor = np.einsum("iob,bc->iobc", tensor, np.identity(2))
+            tensors.append(tensor)
+        return tensors
+
     @staticmethod
     def __apply_gate(qudit_edges: tn.Edge, gate: NDArray, operating_qudits: list[int]) -> None:
         op = tn.Node(gate)
@@ -73,48 +176,51 @@ class TNSim(Backend):
             tn.connect(qudit_edges[bit], op[i])
             qudit_edges[bit] = op[i + len(operating_qudits)]
 
+    @staticmethod
+    def __apply_gate_chain(qudit_edges: tn.Edge, tensors: list[NDArray], operating_qudits: list[int]) -> None:
+        bond = None
+        for tensor, bit in zip(tensors, operating_qudits):
+            op = tn.Node(tensor)
+            tn.connect(qudit_edges[bit], op[0])
+            qudit_edges[bit] = op[1]
+            if bond is not None:
+                tn.connect(bond, op[2])
+            bond = op[-1]
+
     def __contract_circuit(
-        self, system_sizes: list[int], operations: Sequence[Gate]
+        self, system_sizes: list[int], operations: Sequence[Gate], state: NDArray[np.complex128] | None = None
     ) -> tn.network_components.AbstractNode:
-        all_nodes: Sequence[tn.network_components.AbstractNode] = []
+        all_nodes: list[tn.network_components.AbstractNode] = []
+        layout = []
 
         with tn.NodeCollection(all_nodes):
-            state_nodes = []
-            for s in system_sizes:
-                z = [0] * s
-                z[0] = 1
-                state_nodes.append(tn.Node(np.array(z, dtype="complex")))
+            if state is None:
+                state_nodes = []
+                for s in system_sizes:
+                    z = [0] * s
+                    z[0] = 1
+                    state_nodes.append(tn.Node(np.array(z, dtype="complex")))
 
-            qudits_legs = [node[0] for node in state_nodes]
+                qudits_legs = [node[0] for node in state_nodes]
+            else:
+                qudits_legs = list(tn.Node(np.reshape(state, system_sizes)).edges)
 
             for op in operations:
-                op_matrix = op.to_matrix(identities=1)
-                lines = op.reference_lines
-
-                if op.gate_type == GateTypes.SINGLE:
-                    op_matrix = op_matrix.T
-                    # op_matrix = op_matrix.reshape((system_sizes[lines[0]], system_sizes[lines[0]]))
-
-                elif op.gate_type == GateTypes.TWO and not op.is_long_range:
-                    op_matrix = op_matrix.T
-                    lines = lines.copy()
-                    lines.sort()
-
-                    op_matrix = op_matrix.reshape((
-                        system_sizes[lines[0]],
-                        system_sizes[lines[1]],
-                        system_sizes[lines[0]],
-                        system_sizes[lines[1]],
-                    ))
-
-                elif op.is_long_range or op.gate_type == GateTypes.MULTI:
-                    op_matrix = op_matrix.T
-                    minimum_line, maximum_line = min(lines), max(lines)
-                    interested_lines = list(range(minimum_line, maximum_line + 1))
-                    inputs_outputs_legs = [system_sizes[i] for i in interested_lines] * 2
-                    op_matrix = op_matrix.reshape(tuple(inputs_outputs_legs))
-                    lines = interested_lines
-
-                self.__apply_gate(qudits_legs, op_matrix, lines)
-
-        return tn.contractors.auto(all_nodes, output_edge_order=qudits_legs)
+                lines, bond = self._network_layout(op)
+                if bond:
+                    self.__apply_gate_chain(qudits_legs, self._controlled_gate_tensors(op, system_sizes), lines)
+                else:
+                    op_matrix = op.to_matrix(identities=0).T
+                    op_matrix = op_matrix.reshape(tuple([system_sizes[i] for i in lines] * 2))
+                    self.__apply_gate(qudits_legs, op_matrix, lines)
+                layout.append((lines, bond))
+
+        # the nodes are created in a fixed order, so the path found for a network applies to every network of the
+        # same structure
+        path = contraction_path_cache.lookup(network_key(system_sizes, layout, product_state=state is None))
+        nodes = all_nodes
+        for a, b in path:
+            contracted = tn.contract_between(nodes[a], nodes[b], allow_outer_product=True)
+            nodes = [node for i, node in enumerate(nodes) if i not in {a, b}]
+            nodes.append(contracted)
+        return nodes[0].reorder_edges(qudits_legs)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+import typing
+from collections import OrderedDict
+
+from ...quantum_circuit.components.extensions.matrix_cache import CacheInfo, gate_matrix_cache
+
+if typing.TYPE_CHECKING:
+    from collections.abc import Hashable
+
+    import numpy as np
+    from numpy.typing import NDArray
+
+    from ...quantum_circuit import QuantumCircuit
+    from ..noise_tools.noisy_circuit_factory import NoiseRealization
+
+
+class TrajectoryCache:
+    """LRU cache of the final states of noisy trajectories.
+
+    Entries are keyed by a fingerprint of the circuit and the noise realization drawn by
+    :meth:`NoisyCircuitFactory.draw_noise`, so repeated runs of a circuit only simulate the trajectories they have
+    not seen before. Cached states are read-only.
+    """
+
+    def __init__(self, maxsize: int = 256, max_bytes: int = 256 * 2**20) -> None:
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._nbytes = 0
+        self._entries: OrderedDict[Hashable, NDArray[np.complex128]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __reduce__(self) -> tuple[type[TrajectoryCache], tuple[int, int]]:
+        # copies sent to worker processes start empty, the entries stay with the backend that owns the cache
+        return type(self), (self.maxsize, self.max_bytes)
+
+    @staticmethod
+    def circuit_key(circuit: QuantumCircuit) -> Hashable | None:
+        """Fingerprint of a circuit, None if its gates are not deterministic (e.g. ``RandU``)."""
+        if not all(gate.cacheable for gate in circuit.instructions):
+            return None
+        return (tuple(circuit.dimensions), tuple(gate_matrix_cache.key(gate, 2) for gate in circuit.instructions))
+
+    def get(self, circuit_key: Hashable, realization: NoiseRealization) -> NDArray[np.complex128] | None:
+        key = (circuit_key, realization)
+        with self._lock:
+            state = self._entries.get(key)
+            if state is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return state
+
+    def put(self, circuit_key: Hashable, realization: NoiseRealization, state: NDArray[np.complex128]) -> None:
+        if state.nbytes > self.max_bytes or self.maxsize <= 0:
+            return
+        state.setflags(write=False)
+        key = (circuit_key, realization)
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = state
+            self._nbytes += state.nbytes
+            while len(self._entries) > self.maxsize or self._nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        """Drop all entries and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries), self._nbytes)
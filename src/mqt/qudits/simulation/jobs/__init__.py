@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from .counts import Counts
 from .job import Job
 from .job_result import JobResult
 from .jobstatus import JobStatus
 
 __all__ = [
+    "Counts",
     "Job",
     "JobResult",
     "JobStatus",
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import operator
+from collections.abc import Mapping
+from functools import reduce
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from numpy.typing import ArrayLike, NDArray
+
+
+def _index_dtype(dimensions: Sequence[int]) -> type:
+    return np.int64 if reduce(operator.mul, dimensions, 1) <= np.iinfo(np.int64).max else object
+
+
+class Counts(Mapping[int, int]):
+    """Histogram of measurement outcomes, as a mapping from basis state index to number of shots.
+
+    Outcomes are indices into the state vector, the first qudit most significant. The histogram is stored as two
+    sorted arrays of the observed outcomes and their counts, so its size depends on the number of distinct outcomes
+    and not on the number of shots. Chunks of outcomes are merged in with :meth:`update` as they arrive. Outcomes
+    of registers with more basis states than a 64-bit integer can index are kept as Python integers.
+    """
+
+    def __init__(
+        self, dimensions: Sequence[int], outcomes: ArrayLike | None = None, counts: ArrayLike | None = None
+    ) -> None:
+        self.dimensions = list(dimensions)
+        self._dtype = _index_dtype(self.dimensions)
+        self.outcomes: NDArray[np.int64] = np.asarray([] if outcomes is None else outcomes, dtype=self._dtype)
+        self.counts: NDArray[np.int64] = np.asarray([] if counts is None else counts, dtype=np.int64)
+
+    @classmethod
+    def from_outcomes(cls, outcomes: ArrayLike, dimensions: Sequence[int]) -> Counts:
+        """Histogram of a list of per-shot outcomes."""
+        histogram = cls(dimensions)
+        histogram.update(outcomes)
+        return histogram
+
+    def update(self, outcomes: ArrayLike, counts: ArrayLike | None = None) -> None:
+        """Merge in a chunk of outcomes, each seen once or the number of times given by ``counts``."""
+        outcomes = np.asarray(outcomes, dtype=self._dtype).ravel()
+        if counts is None:
+            outcomes, counts = np.unique(outcomes, return_counts=True)
+        merged, inverse = np.unique(np.concatenate([self.outcomes, outcomes]), return_inverse=True)
+        totals = np.zeros(merged.size, dtype=np.int64)
+        np.add.at(totals, inverse, np.concatenate([self.counts, np.asarray(counts, dtype=np.int64).ravel()]))
+        self.outcomes, self.counts = merged, totals
+
+    def merge(self, other: Counts) -> None:
+        """Merge in the histogram of another run on the same register."""
+        self.update(other.outcomes, other.counts)
+
+    def __getitem__(self, outcome: int) -> int:
+        position = int(np.searchsorted(self.outcomes, outcome))
+        if position < self.outcomes.size and self.outcomes[position] == outcome:
+            return int(self.counts[position])
+        raise KeyError(outcome)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.outcomes.tolist())
+
+    def __len__(self) -> int:
+        return int(self.outcomes.size)
+
+    def __repr__(self) -> str:
+        return f"Counts({dict(zip(self.labels(), self.counts.tolist()))})"
+
+    @property
+    def shots(self) -> int:
+        return int(self.counts.sum())
+
+    def digits(self) -> NDArray[np.int64]:
+        """Level of every qudit for each observed outcome, one row per outcome."""
+        strides = [reduce(operator.mul, self.dimensions[i + 1 :], 1) for i in range(len(self.dimensions))]
+        return (self.outcomes[:, np.newaxis] // np.array(strides, dtype=self._dtype)) % np.array(
+            self.dimensions, dtype=self._dtype
+        )
+
+    def marginal(self, qudits: Sequence[int]) -> Counts:
+        """Counts of the levels of ``qudits`` only, with the first of them most significant."""
+        dimensions = [self.dimensions[qudit] for qudit in qudits]
+        outcomes = np.zeros(self.outcomes.size, dtype=_index_dtype(dimensions))
+        digits = self.digits()
+        for qudit, dim in zip(qudits, dimensions):
+            outcomes = outcomes * dim + digits[:, qudit]
+        unique, inverse = np.unique(outcomes, return_inverse=True)
+        return Counts(dimensions, unique, np.bincount(inverse, weights=self.counts, minlength=unique.size))
+
+    def labels(self) -> list[str]:
+        """Mixed-radix labels of the observed outcomes, the level of every qudit in circuit order.
+
+        Levels are separated by commas if a qudit has more than ten levels.
+        """
+        separator = "," if any(dim > 10 for dim in self.dimensions) else ""
+        return [separator.join(str(level) for level in row) for row in self.digits().tolist()]
+
+    def to_dict(self, labels: bool = False) -> dict[int | str, int]:
+        """Plain dictionary of the histogram, keyed by outcome index or by mixed-radix label."""
+        keys: list[int] | list[str] = self.labels() if labels else self.outcomes.tolist()
+        return dict(zip(keys, self.counts.tolist()))
+
+    def to_outcomes(self) -> NDArray[np.int64]:
+        """Per-shot outcomes of the histogram, grouped by outcome in ascending order."""
+        return np.repeat(self.outcomes, self.counts)
+
+    def to_array(self) -> NDArray[np.int64]:
+        """Dense histogram over all basis states."""
+        dense = np.zeros(reduce(operator.mul, self.dimensions, 1), dtype=np.int64)
+        dense[self.outcomes] = self.counts
+        return dense
@@ -2,20 +2,63 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import numpy as np
+
+from .counts import Counts
+
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
-    import numpy as np
     from numpy.typing import NDArray
 
 
 class JobResult:
-    def __init__(self, state_vector: NDArray[np.complex128], counts: Sequence[int]) -> None:
+    def __init__(
+        self,
+        state_vector: NDArray[np.complex128],
+        counts: Counts | Sequence[Counts],
+        density_matrix: NDArray[np.complex128] | None = None,
+        memory: Sequence[int | NDArray[np.complex128]] | None = None,
+    ) -> None:
         self.state_vector = state_vector
         self.counts = counts
+        self.density_matrix = density_matrix
+        self.memory = memory
+
+    def get_counts(self) -> list[int] | list[list[int]]:
+        """Per-shot outcomes, as basis state indices, one list per binding for batched runs.
+
+        The outcomes are in shot order if the run kept them with the ``memory`` option, otherwise they are expanded
+        from the histogram and grouped by outcome. :meth:`get_histogram` returns the histogram without expanding it.
+        """
+        if isinstance(self.counts, Counts):
+            if self.memory is not None and not any(isinstance(shot, np.ndarray) for shot in self.memory[:1]):
+                return [int(shot) for shot in self.memory]
+            return self.counts.to_outcomes().tolist()
+        return [histogram.to_outcomes().tolist() for histogram in self.counts]
 
-    def get_counts(self) -> Sequence[int]:
+    def get_histogram(self) -> Counts | Sequence[Counts]:
+        """Histogram of the outcomes, one per binding for batched runs."""
         return self.counts
 
+    def get_memory(self) -> Sequence[int | NDArray[np.complex128]]:
+        """Per-shot outcomes, or states with ``full_state_memory``, of runs with the ``memory`` option set."""
+        if self.memory is None:
+            msg = (
+                "Per-shot results are only kept by runs with the memory or full_state_memory option set, "
+                "states streamed to a file are only kept in the file"
+            )
+            raise ValueError(msg)
+        return self.memory
+
     def get_state_vector(self) -> NDArray[np.complex128]:
         return self.state_vector
+
+    def get_density_matrix(self) -> NDArray[np.complex128] | None:
+        return self.density_matrix
+
+    def get_probabilities(self) -> NDArray[np.float64]:
+        """Probabilities of the basis states, from the density matrix if the backend computed one."""
+        if self.density_matrix is not None:
+            return np.asarray(self.density_matrix.diagonal().real)
+        return np.abs(np.ravel(self.state_vector)) ** 2
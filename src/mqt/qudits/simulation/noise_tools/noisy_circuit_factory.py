@@ -1,8 +1,5 @@
 from __future__ import annotations
 
-import copy
-import os
-import time
 from functools import partial
 from itertools import product
 from typing import TYPE_CHECKING, cast
@@ -22,29 +19,64 @@ if TYPE_CHECKING:
     from ...quantum_circuit.gate import Gate
     from .noise import NoiseModel
 
+# (index of the instruction the noise follows, name of the circuit method adding the noise gate, qudit, levels)
+NoiseEvent = tuple[int, str, int, "int | tuple[int, int] | None"]
+NoiseRealization = tuple[NoiseEvent, ...]
+# mutually exclusive outcomes of a noise channel: (probability, noise events of the outcome)
+NoiseChannel = list[tuple[float, list[NoiseEvent]]]
+
 
 class NoisyCircuitFactory:
-    def __init__(self, noise_model: NoiseModel, circuit: QuantumCircuit) -> None:
+    def __init__(self, noise_model: NoiseModel, circuit: QuantumCircuit, rng: Generator | None = None) -> None:
         self.noise_model: NoiseModel = noise_model
         self.circuit: QuantumCircuit = circuit
-        self.rng: Generator = self._initialize_rng()
+        self.rng: Generator = np.random.default_rng() if rng is None else rng
+        self._channels: dict[int, list[NoiseChannel]] = {}
 
-    @staticmethod
-    def _initialize_rng() -> Generator:
-        current_time = int(time.time() * 1000)
-        seed = hash((os.getpid(), current_time)) % 2**32
-        return np.random.default_rng(seed)
+    def generate_circuit(self, rng: Generator | None = None) -> QuantumCircuit:
+        """Draw a noisy realization of the circuit.
+
+        Args:
+            rng: Generator to draw the noise from, it replaces the generator of the factory. Defaults to the
+                generator of the factory.
+        """
+        return self.build_circuit(self.draw_noise(rng))
+
+    def draw_noise(self, rng: Generator | None = None) -> NoiseRealization:
+        """Draw the noise of one realization of the circuit without building it.
 
-    def generate_circuit(self) -> QuantumCircuit:
+        Realizations are hashable and compare equal exactly when :meth:`build_circuit` builds the same circuit
+        from them, so shots can be grouped by realization.
+
+        Args:
+            rng: Generator to draw the noise from, it replaces the generator of the factory. Defaults to the
+                generator of the factory.
+        """
+        if rng is not None:
+            self.rng = rng
+        events: list[NoiseEvent] = []
+        for index, instruction in enumerate(self.circuit.instructions):
+            self._apply_noise(events, index, instruction)
+        return tuple(events)
+
+    def build_circuit(self, realization: NoiseRealization) -> QuantumCircuit:
+        """Build the noisy circuit of a realization drawn by :meth:`draw_noise`."""
         noisy_circuit = QuantumCircuit(self.circuit.num_qudits, self.circuit.dimensions, self.circuit.num_cl)
         noisy_circuit.number_gates = 0
 
-        for instruction in self.circuit.instructions:
-            copied_instruction = copy.deepcopy(instruction)
-            noisy_circuit.instructions.append(copied_instruction)
+        events = iter(realization)
+        event = next(events, None)
+        for index, instruction in enumerate(self.circuit.instructions):
+            noisy_circuit.instructions.append(instruction)
             noisy_circuit.number_gates += 1
 
-            self._apply_noise(noisy_circuit, instruction)
+            while event is not None and event[0] == index:
+                _, gate, dit, argument = event
+                if argument is None:
+                    getattr(noisy_circuit, gate)(dit)
+                else:
+                    getattr(noisy_circuit, gate)(dit, list(argument) if isinstance(argument, tuple) else argument)
+                event = next(events, None)
 
         return noisy_circuit
 
@@ -95,20 +127,35 @@ class NoisyCircuitFactory:
         subspace = next(iter(noise_info.subspace_w_probs.keys()))
         return subspace[0] < 0 or subspace[1] < 0
 
-    def _apply_noise(self, noisy_circuit: QuantumCircuit, instruction: Gate) -> None:
-        if instruction.qasm_tag not in self.noise_model.quantum_errors:
-            return
+    def _apply_noise(self, events: list[NoiseEvent], index: int, instruction: Gate) -> None:
+        for channel in self.noise_channels(index, instruction):
+            outcome = self.rng.choice(len(channel), p=[probability for probability, _ in channel])
+            events.extend(channel[outcome][1])
+
+    def noise_channels(self, index: int, instruction: Gate) -> list[NoiseChannel]:
+        """Elementary noise channels following an instruction of the circuit, in the order they act.
+
+        Each channel lists mutually exclusive outcomes with their probabilities and the noise events they add. A
+        realization draws one outcome of every channel, the density matrix backend applies them as Kraus maps.
+        """
+        channels = self._channels.get(index)
+        if channels is not None:
+            return channels
 
-        for mode, noise_info in self.noise_model.quantum_errors[instruction.qasm_tag].items():
-            qudits = self._get_affected_qudits(instruction, mode)
-            if qudits is None:
-                continue  # type: ignore[unreachable]
+        channels = []
+        if instruction.qasm_tag in self.noise_model.quantum_errors:
+            for mode, noise_info in self.noise_model.quantum_errors[instruction.qasm_tag].items():
+                qudits = self._get_affected_qudits(instruction, mode)
+                if qudits is None:
+                    continue  # type: ignore[unreachable]
 
-            if isinstance(noise_info, SubspaceNoise):
-                noise_info = self._dynamic_subspace_noise_info_rectification(noise_info, instruction)  # noqa: PLW2901
+                if isinstance(noise_info, SubspaceNoise):
+                    noise_info = self._dynamic_subspace_noise_info_rectification(noise_info, instruction)  # noqa: PLW2901
 
-            self._apply_depolarizing_noise(noisy_circuit, qudits, noise_info)
-            self._apply_dephasing_noise(noisy_circuit, qudits, noise_info)
+                channels.extend(self._depolarizing_channels(index, qudits, noise_info))
+                channels.extend(self._dephasing_channels(index, qudits, noise_info))
+        self._channels[index] = channels
+        return channels
 
     def _get_affected_qudits(self, instruction: Gate, mode: str) -> list[int]:
         if isinstance(mode, str):
@@ -169,94 +216,75 @@ class NoisyCircuitFactory:
             msg = f"Gate type {instruction.gate_type} is incompatible for the desired operation."
             raise ValueError(msg)
 
-    def _apply_depolarizing_noise(
-        self, noisy_circuit: QuantumCircuit, qudits: list[int], noise_info: Noise | SubspaceNoise
-    ) -> None:
+    def _depolarizing_channels(
+        self, index: int, qudits: list[int], noise_info: Noise | SubspaceNoise
+    ) -> list[NoiseChannel]:
+        channels: list[NoiseChannel] = []
         if isinstance(noise_info, Noise):  # Mathematical Description of Depolarizing noise channel
             for dit in qudits:
-                dim = noisy_circuit.dimensions[dit]
+                dim = self.circuit.dimensions[dit]
                 prob_each = noise_info.probability_depolarizing / dim / dim  # TODO: ARE WE SURE THIS IS CORRECT?
-                noise_combinations = list(product(range(dim), repeat=2))
                 probabilities = [1 - prob_each * (dim * dim - 1)] + [prob_each] * (dim * dim - 1)
-                power_noise_x, power_noise_z = self.rng.choice(noise_combinations, p=probabilities)
-                # TODO: THE FOLLOWING LINES COULD CREATE A LOT OF OVERHEAD IN SIMULATION
-                for _ in range(power_noise_x):
-                    noisy_circuit.x(dit)
-                for _ in range(power_noise_z):
-                    noisy_circuit.z(dit)
+                # TODO: THE POWERS OF X AND Z COULD CREATE A LOT OF OVERHEAD IN SIMULATION
+                channels.append([
+                    (probability, [(index, "x", dit, None)] * power_noise_x + [(index, "z", dit, None)] * power_noise_z)
+                    for probability, (power_noise_x, power_noise_z) in zip(
+                        probabilities, product(range(dim), repeat=2)
+                    )
+                ])
         elif isinstance(noise_info, SubspaceNoise):  # Physical Noise
             for dit in qudits:
-                dim = noisy_circuit.dimensions[dit]
-                possible_levels = list(range(dim))
-
-                # Validate all subspace levels
+                self._validate_subspaces(dit, noise_info)
                 for lev_a, lev_b in noise_info.subspace_w_probs:
-                    if lev_a not in possible_levels or lev_b not in possible_levels:
-                        msg = (
-                            "Subspace levels exceed qudit dimensions. "
-                            f"Got levels ({lev_a}, {lev_b}) but dimension is {dim}. "
-                            "Check noise model compatibility with circuit."
-                        )
-                        raise IndexError(msg)
-
                     # Calculate probabilities for noise operations
                     prob_each = noise_info.subspace_w_probs[lev_a, lev_b].probability_depolarizing / 4
 
-                    # Generate possible noise combinations (X,Z gates)
-                    noise_combinations = list(product(range(2), repeat=2))
-                    probabilities = [1 - 3 * prob_each] + [prob_each] * 3
+                    # No noise, Z, X or Y on the subspace
+                    channels.append([
+                        (1 - 3 * prob_each, []),
+                        (prob_each, [(index, "noisez", dit, lev_b)]),
+                        (prob_each, [(index, "noisex", dit, (lev_a, lev_b))]),
+                        (prob_each, [(index, "noisey", dit, (lev_a, lev_b))]),
+                    ])
+        return channels
 
-                    # Choose noise operation based on probability distribution
-                    noise_x, noise_z = self.rng.choice(noise_combinations, p=probabilities)
-
-                    # Apply appropriate noise operation
-                    if (noise_x, noise_z) == (1, 0):
-                        noisy_circuit.noisex(dit, [lev_a, lev_b])
-                    elif (noise_x, noise_z) == (0, 1):
-                        noisy_circuit.noisez(dit, lev_b)
-                    elif (noise_x, noise_z) == (1, 1):
-                        noisy_circuit.noisey(dit, [lev_a, lev_b])
-
-    def _apply_dephasing_noise(
-        self, noisy_circuit: QuantumCircuit, qudits: list[int], noise_info: Noise | SubspaceNoise
-    ) -> None:
-        """Applies dephasing noise to specified qudit levels outside the main depolarizing subspace levels.
+    def _dephasing_channels(
+        self, index: int, qudits: list[int], noise_info: Noise | SubspaceNoise
+    ) -> list[NoiseChannel]:
+        """Dephasing channels of the qudit levels outside the main depolarizing subspace levels.
 
         Args:
-            noisy_circuit: Circuit to apply noise to
+            index: Index of the instruction the noise follows
             qudits: List of qudits to apply noise to
             noise_info: Noise model information containing subspace probabilities
 
         Raises:
             IndexError: If subspace levels are outside qudit dimensions
         """
+        channels: list[NoiseChannel] = []
         if isinstance(noise_info, SubspaceNoise):  # Physical Noise
             for dit in qudits:
-                dim = noisy_circuit.dimensions[dit]
-                possible_levels = set(range(dim))  # Changed to set for efficient operations
-
-                # Validate all subspace levels
+                self._validate_subspaces(dit, noise_info)
+                possible_levels = set(range(self.circuit.dimensions[dit]))
                 for lev_a, lev_b in noise_info.subspace_w_probs:
-                    if lev_a not in possible_levels or lev_b not in possible_levels:
-                        msg = (
-                            "Subspace levels exceed qudit dimensions. "
-                            f"Got levels ({lev_a}, {lev_b}) but dimension is {dim}. "
-                            "Check noise model compatibility with circuit."
-                        )
-                        raise IndexError(msg)
-
                     # Calculate remaining levels for dephasing
-                    subspace_levels = {lev_a, lev_b}
-                    dephasing_levels = list(possible_levels - subspace_levels)
-
-                    if not dephasing_levels:  # Check if we have levels for dephasing
-                        continue
-
-                    # Calculate probability for each level
-                    prob_each = noise_info.subspace_w_probs[lev_a, lev_b].probability_dephasing
-                    probs = [prob_each, 1 - prob_each]  # [apply noise, no noise]
+                    dephasing_levels = list(possible_levels - {lev_a, lev_b})
 
                     # Apply dephasing to each level outside subspace
-                    for physical_level in dephasing_levels:
-                        if self.rng.choice([True, False], p=probs):
-                            noisy_circuit.noisez(dit, physical_level)
+                    prob_each = noise_info.subspace_w_probs[lev_a, lev_b].probability_dephasing
+                    channels.extend(
+                        [(prob_each, [(index, "noisez", dit, physical_level)]), (1 - prob_each, [])]
+                        for physical_level in dephasing_levels
+                    )
+        return channels
+
+    def _validate_subspaces(self, dit: int, noise_info: SubspaceNoise) -> None:
+        dim = self.circuit.dimensions[dit]
+        for lev_a, lev_b in noise_info.subspace_w_probs:
+            if not (0 <= lev_a < dim and 0 <= lev_b < dim):
+                msg = (
+                    "Subspace levels exceed qudit dimensions. "
+                    f"Got levels ({lev_a}, {lev_b}) but dimension is {dim}. "
+                    "Check noise model compatibility with circuit."
+                )
+                raise IndexError(msg)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import operator
+from functools import reduce
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ..quantum_circuit import QuantumCircuit
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from numpy.typing import ArrayLike, NDArray
+
+    from .jobs import Counts
+
+
+def _apply_local(tensor: NDArray[np.complex128], matrix: NDArray[np.complex128], axis: int) -> NDArray:
+    return np.moveaxis(np.tensordot(matrix, tensor, axes=(1, axis)), 0, axis)
+
+
+class Observable:
+    """Tensor product of local operators on some qudits of a register, times a real coefficient.
+
+    The qudits not listed carry the identity. Local operators are Hermitian matrices, :meth:`projector` and
+    :meth:`gell_mann` build the common ones, ``@`` multiplies observables on disjoint qudits and ``*`` scales them.
+    Expectation values are computed by applying each local operator to its axis of the state, the operator on the
+    whole register is never built.
+    """
+
+    def __init__(self, operators: Mapping[int, ArrayLike], coefficient: float = 1.0) -> None:
+        self.operators: dict[int, NDArray[np.complex128]] = {
+            qudit: np.asarray(matrix, dtype=np.complex128) for qudit, matrix in sorted(operators.items())
+        }
+        self.coefficient = coefficient
+
+    @classmethod
+    def projector(cls, qudit: int, level: int, dimension: int) -> Observable:
+        """Projector on ``level`` of a qudit."""
+        matrix = np.zeros((dimension, dimension), dtype=np.complex128)
+        matrix[level, level] = 1
+        return cls({qudit: matrix})
+
+    @classmethod
+    def gell_mann(cls, qudit: int, lev_a: int, lev_b: int, kind: str, dimension: int) -> Observable:
+        """Generalized Gell-Mann matrix of a qudit, of kind "s", "a" or "d" as for the ``GellMann`` gate."""
+        circuit = QuantumCircuit(1, [dimension], 0)
+        return cls({qudit: circuit.gellmann(0, [lev_a, lev_b, kind]).to_matrix()})
+
+    def __matmul__(self, other: Observable) -> Observable:
+        if self.operators.keys() & other.operators.keys():
+            msg = "Tensor products need observables on disjoint qudits"
+            raise ValueError(msg)
+        return Observable({**self.operators, **other.operators}, self.coefficient * other.coefficient)
+
+    def __mul__(self, scalar: float) -> Observable:
+        return Observable(self.operators, self.coefficient * scalar)
+
+    __rmul__ = __mul__
+
+    @property
+    def qudits(self) -> list[int]:
+        return list(self.operators)
+
+    @property
+    def is_diagonal(self) -> bool:
+        """Whether the observable is diagonal in the computational basis, so it can be estimated from counts."""
+        return all(np.count_nonzero(matrix - np.diag(matrix.diagonal())) == 0 for matrix in self.operators.values())
+
+    def expectation_value(self, state_vector: ArrayLike, dimensions: Sequence[int]) -> float:
+        """Expectation value in a pure state, the first qudit most significant."""
+        state = np.asarray(state_vector, dtype=np.complex128).reshape(dimensions)
+        applied = state
+        for qudit, matrix in self.operators.items():
+            applied = _apply_local(applied, matrix, qudit)
+        return self.coefficient * float(np.vdot(state, applied).real)
+
+    def expectation_value_of_density_matrix(self, density_matrix: ArrayLike, dimensions: Sequence[int]) -> float:
+        """Expectation value in a mixed state, the first qudit most significant."""
+        size = reduce(operator.mul, dimensions, 1)
+        rho = np.asarray(density_matrix, dtype=np.complex128).reshape(list(dimensions) * 2)
+        for qudit, matrix in self.operators.items():
+            rho = _apply_local(rho, matrix, qudit)
+        return self.coefficient * float(np.trace(rho.reshape(size, size)).real)
+
+    def outcome_values(self, outcomes: ArrayLike, dimensions: Sequence[int]) -> NDArray[np.float64]:
+        """Eigenvalues of a diagonal observable for measurement outcomes given as basis state indices."""
+        if not self.is_diagonal:
+            msg = "Only observables diagonal in the computational basis can be estimated from measurement outcomes"
+            raise ValueError(msg)
+        outcomes = np.asarray(outcomes, dtype=np.int64)
+        values = np.full(outcomes.shape, self.coefficient, dtype=np.float64)
+        for qudit, matrix in self.operators.items():
+            stride = reduce(operator.mul, dimensions[qudit + 1 :], 1)
+            values *= matrix.diagonal().real[(outcomes // stride) % dimensions[qudit]]
+        return values
+
+
+class ExpectationEstimator:
+    """Streaming estimate of the expectation value of a diagonal observable from measurement outcomes.
+
+    Outcomes can be added in chunks of any size, as they come from the workers of a run, or as the histogram of a
+    run with :meth:`update_counts`, and are never stored.
+    Mean and variance are merged chunk by chunk with the parallel form of Welford's algorithm.
+    """
+
+    def __init__(self, observable: Observable, dimensions: Sequence[int]) -> None:
+        if not observable.is_diagonal:
+            msg = "Only observables diagonal in the computational basis can be estimated from measurement outcomes"
+            raise ValueError(msg)
+        self.observable = observable
+        self.dimensions = list(dimensions)
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, outcomes: ArrayLike, counts: ArrayLike | None = None) -> None:
+        """Add a chunk of outcomes, given as basis state indices, each seen once or ``counts`` times."""
+        values = self.observable.outcome_values(outcomes, self.dimensions).ravel()
+        weights = np.ones(values.size) if counts is None else np.asarray(counts, dtype=np.float64).ravel()
+        size = int(weights.sum())
+        if size == 0:
+            return
+        # every distinct outcome is a group of equal values, so only its mean moves the spread of the chunk
+        chunk_mean = float(np.dot(weights, values)) / size
+        chunk_m2 = float(np.dot(weights, (values - chunk_mean) ** 2))
+        total = self.count + size
+        delta = chunk_mean - self.mean
+        self.mean += delta * size / total
+        self._m2 += chunk_m2 + delta**2 * self.count * size / total
+        self.count = total
+
+    def update_counts(self, counts: Counts) -> None:
+        """Add the outcomes of a histogram, one group per distinct outcome weighted by its number of shots."""
+        self.update(counts.outcomes, counts.counts)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance of the observable over the outcomes."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def standard_error(self) -> float:
+        """Standard error of :attr:`mean`."""
+        return float(np.sqrt(self.variance / self.count)) if self.count else 0.0
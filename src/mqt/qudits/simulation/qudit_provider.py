@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 from typing import TYPE_CHECKING, Any, ClassVar
 
-from .backends import Innsbruck01, MISim, TNSim
+from .backends import DMSim, DSVSim, Innsbruck01, MISim, MPSSim, TNSim
 from .backends.fake_backends import FakeIonTraps2Six, FakeIonTraps2Trits, FakeIonTraps3Six
 
 if TYPE_CHECKING:
@@ -18,6 +18,9 @@ class MQTQuditProvider:
     __backends: ClassVar[dict[str, type[Backend]]] = {
         "tnsim": TNSim,
         "misim": MISim,
+        "dsvsim": DSVSim,
+        "mpssim": MPSSim,
+        "dmsim": DMSim,
         "innsbruck01": Innsbruck01,
         "faketraps2trits": FakeIonTraps2Trits,
         "faketraps2six": FakeIonTraps2Six,
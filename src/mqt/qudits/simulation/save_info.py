@@ -2,67 +2,166 @@ from __future__ import annotations
 
 import getpass
 import typing
-import uuid
 from pathlib import Path
 
 import h5py  # type: ignore[import-not-found]
 import numpy as np
 
 if typing.TYPE_CHECKING:
-    from numpy.typing import NDArray
-
-
-def save_full_states(
-    list_of_vectors_og: list[NDArray[np.complex128]], file_path: str | Path | None = None, file_name: str | None = None
-) -> None:
+    from collections.abc import Mapping, Sequence
+    from types import TracebackType
+
+    from numpy.typing import ArrayLike, NDArray
+
+    from ..quantum_circuit import QuantumCircuit
+
+
+def circuit_attributes(circuit: QuantumCircuit) -> dict[str, typing.Any]:
+    """Metadata of a circuit stored as attributes of result files."""
+    return {
+        "num_qudits": circuit.num_qudits,
+        "dimensions": np.asarray(circuit.dimensions, dtype=np.int64),
+        "gates": [gate.qasm_tag for gate in circuit.instructions],
+    }
+
+
+class ResultWriter:
+    """Append per-shot results to a chunked, resizable HDF5 dataset as they arrive.
+
+    Every row of the dataset ``name`` is the result of one shot, the shot index of each row is stored in the
+    dataset ``nr`` next to it, so rows can be appended in any order. Rows have the shape ``row_shape``, an empty
+    shape stores one scalar per shot. Only the rows of one :meth:`append` are held in memory at a time.
+    """
+
+    def __init__(
+        self,
+        full_path: str | Path,
+        name: str,
+        dtype: type | np.dtype[typing.Any],
+        row_shape: tuple[int, ...] = (),
+        attributes: Mapping[str, typing.Any] | None = None,
+        compression: str | None = None,
+        chunk_rows: int | None = None,
+    ) -> None:
+        self.full_path = Path(full_path)
+        self.name = name
+        self.rows = 0
+        if chunk_rows is None:
+            # chunks of about one MiB
+            row_bytes = np.dtype(dtype).itemsize * int(np.prod(row_shape, dtype=np.int64))
+            chunk_rows = max(1, min(1024, 2**20 // row_bytes))
+        self.chunk_rows = chunk_rows
+        self._layout = (dtype, row_shape, dict(attributes or {}), compression)
+        self._file: h5py.File | None = None
+
+    def _open(self) -> h5py.File:
+        # the file is only created with the first rows, so that worker processes forked while the
+        # simulation starts up do not inherit its lock
+        if self._file is not None:
+            return self._file
+        dtype, row_shape, attributes, compression = self._layout
+        self._file = h5py.File(self.full_path, "w")
+        self._file.create_dataset(
+            self.name,
+            shape=(0, *row_shape),
+            maxshape=(None, *row_shape),
+            dtype=dtype,
+            chunks=(self.chunk_rows, *row_shape),
+            compression=compression,
+        )
+        self._file.create_dataset(
+            "nr",
+            shape=(0,),
+            maxshape=(None,),
+            dtype=np.int64,
+            chunks=(max(self.chunk_rows, 1024),),
+            compression=compression,
+        )
+        for key, value in attributes.items():
+            self._file.attrs[key] = value
+        return self._file
+
+    def append(self, shots: ArrayLike, rows: ArrayLike) -> None:
+        """Write the results ``rows`` of the shots with indices ``shots``."""
+        file = self._open()
+        data, numbers = file[self.name], file["nr"]
+        shots = np.asarray(shots, dtype=np.int64).ravel()
+        if shots.size == 0:
+            return
+        end = self.rows + shots.size
+        data.resize(end, axis=0)
+        numbers.resize(end, axis=0)
+        data[self.rows : end] = np.asarray(rows).reshape(shots.size, *data.shape[1:])
+        numbers[self.rows : end] = shots
+        self.rows = end
+
+    def close(self) -> None:
+        """Close the file, no file is created if no rows were appended."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> ResultWriter:
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+
+def state_writer(
+    file_path: str | Path | None,
+    file_name: str | None,
+    state_size: int,
+    attributes: Mapping[str, typing.Any] | None = None,
+    compression: str | None = None,
+) -> ResultWriter:
+    """Writer of the noisy states of a run, one row of ``state_size`` amplitudes per shot."""
     if file_name is None:
         file_name = "experiment_states.h5"
 
     if file_path is None:
         username = getpass.getuser()
         file_path = Path(f"/home/{username}/Documents")
-    else:
-        file_path = Path(file_path)
-
-    full_path = file_path / file_name
-    size: tuple[int, int] = list_of_vectors_og[0].shape
-
-    # Generate random unique names for each vector
-    vector_names: list[str] = [str(uuid.uuid4()) for _ in range(len(list_of_vectors_og))]
-
-    # Combine names and vectors into a list of dictionaries
-    list_of_vectors: list[dict[str, str | NDArray[np.complex128]]] = [
-        {"name": name, "data": vector} for name, vector in zip(vector_names, list_of_vectors_og)
-    ]
-
-    # Open the HDF5 file in write mode
-    with h5py.File(full_path, "w") as hdf_file:
-        # Create a table dataset within the file to store the vectors
-        dtype = [("name", "S36"), ("vector_data", np.complex128, size)]
-        table_data = np.array(
-            [(vector_info["name"].encode("utf-8"), vector_info["data"]) for vector_info in list_of_vectors], dtype=dtype
-        )
 
-        hdf_file.create_dataset("vectors", data=table_data)
+    return ResultWriter(Path(file_path) / file_name, "vectors", np.complex128, (state_size,), attributes, compression)
+
 
-    print(f"States saved to {full_path}")  # noqa: T201
+def shot_writer(
+    file_path: str | Path,
+    file_name: str,
+    attributes: Mapping[str, typing.Any] | None = None,
+    compression: str | None = None,
+) -> ResultWriter:
+    """Writer of the measured outcomes of a run, one basis state index per shot."""
+    return ResultWriter(Path(file_path) / file_name, "shots", np.int64, (), attributes, compression)
 
 
-def save_shots(shots: list[int], file_path: str | Path, file_name: str) -> None:
-    file_path = Path(file_path)
+def save_full_states(
+    list_of_vectors_og: Sequence[NDArray[np.complex128]],
+    file_path: str | Path | None = None,
+    file_name: str | None = None,
+    attributes: Mapping[str, typing.Any] | None = None,
+    compression: str | None = None,
+) -> None:
+    size = list_of_vectors_og[0].size
+    with state_writer(file_path, file_name, size, attributes, compression) as writer:
+        for start in range(0, len(list_of_vectors_og), writer.chunk_rows):
+            block = list_of_vectors_og[start : start + writer.chunk_rows]
+            writer.append(range(start, start + len(block)), np.stack([vector.ravel() for vector in block]))
 
-    full_path = file_path / file_name
-    indexes = list(range(len(shots)))
+    print(f"States saved to {writer.full_path}")  # noqa: T201
 
-    # Combine names and vectors into a list of dictionaries
-    list_of_outcomes = [{"shot_nr": nr, "outcome": outcome} for nr, outcome in zip(indexes, shots)]
 
-    with h5py.File(full_path, "w") as hdf_file:
-        # Create a table dataset within the file to store the vectors
-        dtype = [("nr", int), ("shot", int)]
-        table_data = np.array(
-            [(shot_info["shot_nr"], shot_info["outcome"]) for shot_info in list_of_outcomes], dtype=dtype
-        )
-        hdf_file.create_dataset("shots", data=table_data)
+def save_shots(
+    shots: Sequence[int],
+    file_path: str | Path,
+    file_name: str,
+    attributes: Mapping[str, typing.Any] | None = None,
+    compression: str | None = None,
+) -> None:
+    with shot_writer(file_path, file_name, attributes, compression) as writer:
+        writer.append(range(len(shots)), shots)
 
-    print(f"Simulation results saved to {full_path}")  # noqa: T201
+    print(f"Simulation results saved to {writer.full_path}")  # noqa: T201
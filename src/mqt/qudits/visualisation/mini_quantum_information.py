@@ -1,15 +1,10 @@
 from __future__ import annotations
 
-import operator
-from collections import Counter
-from functools import reduce
 from typing import TYPE_CHECKING
 
 import numpy as np
 
-from mqt.qudits.quantum_circuit.components.extensions.matrix_factory import from_dirac_to_basis
-
-from .plot_information import state_labels
+from ..simulation.jobs import Counts
 
 if TYPE_CHECKING:
     from numpy.typing import NDArray
@@ -18,19 +13,12 @@ if TYPE_CHECKING:
 
 
 def get_density_matrix_from_counts(
-    results: list[int] | NDArray[int], circuit: QuantumCircuit
+    results: Counts | list[int] | NDArray[int], circuit: QuantumCircuit
 ) -> NDArray[np.complex128, np.complex128]:
-    num_kets = reduce(operator.mul, circuit.dimensions)
-    number_counts = Counter(results)
-    probabilities = [(number_counts[num] / len(results)) for num in range(num_kets)]
-    kets: list[NDArray[complex]] = [
-        from_dirac_to_basis([int(char) for char in state], circuit.dimensions) for state in state_labels(circuit)
-    ]
-    density_matrix: NDArray[np.complex128] = np.zeros((num_kets, num_kets))
-    for k, p in zip(kets, probabilities):
-        density_matrix += p * np.outer(k, k.conj())
-
-    return density_matrix
+    if not isinstance(results, Counts):
+        results = Counts.from_outcomes(results, circuit.dimensions)
+    # the measured states are basis states, so the density matrix is diagonal
+    return np.diag(results.to_array() / results.shots)
 
 
 def partial_trace(
@@ -6,6 +6,8 @@ from typing import TYPE_CHECKING
 import matplotlib.pyplot as plt  # type: ignore[import-not-found]
 import numpy as np
 
+from ..simulation.jobs import Counts
+
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
@@ -111,10 +113,13 @@ def plot_state(
     return counts
 
 
-def plot_counts(measurements: list[int] | NDArray[int], circuit: QuantumCircuit) -> list[int] | NDArray[int]:
+def plot_counts(
+    measurements: Counts | list[int] | NDArray[int], circuit: QuantumCircuit
+) -> list[int] | NDArray[int]:
     labels = state_labels(circuit)
-    counts = [measurements.count(i) for i in range(len(labels))]
-    counts = remap_result(counts, circuit)
+    if not isinstance(measurements, Counts):
+        measurements = Counts.from_outcomes(measurements, circuit.dimensions)
+    counts = remap_result(measurements.to_array(), circuit)
 
     errors = len(labels) * [0]
 
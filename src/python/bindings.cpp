@@ -1,21 +1,53 @@
 #include "dd/MDDPackage.hpp"
 
+#include <algorithm>
 #include <any>
-#include <chrono>
+#include <atomic>
 #include <cmath>
+#include <complex>
+#include <cstdint>
 #include <ctime>
+#include <exception>
 #include <iostream>
+#include <iterator>
+#include <map>
+#include <numeric>
+#include <optional>
 #include <pybind11/complex.h>
+#include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 #include <random>
+#include <thread>
+#include <unordered_map>
+#include <unordered_set>
 #include <vector>
 
 namespace py = pybind11;
 using namespace py::literals;
 
-using Instruction = std::tuple<std::string, bool, std::vector<int>, std::string,
-                               std::vector<int>, py::object,
+// Gates the simulator can build, parsed once from the qasm tag of each gate
+enum class Opcode : std::uint8_t {
+  Rxy,
+  Rz,
+  Rh,
+  VirtRz,
+  X,
+  S,
+  Z,
+  H,
+  Cx,
+  Csum,
+  CustomOne,
+  Dense,
+  Unsupported
+};
+
+// The numeric parameters of custom and dense gates are the entries of their
+// matrix, as interleaved real and imaginary parts in row-major order
+using Instruction = std::tuple<std::string, Opcode, bool, std::vector<int>,
+                               std::string, std::vector<int>,
+                               std::vector<double>,
                                std::tuple<std::vector<dd::QuantumRegister>,
                                           std::vector<dd::Control::Type>>>;
 using Circuit = std::vector<Instruction>;
@@ -71,8 +103,8 @@ void printCvec(CVec vector) {
 
 void printCircuit(const Circuit& circuit) {
   for (const auto& instruction : circuit) {
-    auto [tag, dag, dims, gate_type, target_qudits, params, control_set] =
-        instruction;
+    auto [tag, opcode, dag, dims, gate_type, target_qudits, params,
+          control_set] = instruction;
     std::cout << "Tag: " << tag << std::endl;
     std::cout << "Dag: " << dag << std::endl;
     std::cout << "Dimensions: ";
@@ -123,44 +155,63 @@ bool is_none_or_empty(const py::object& obj) {
   return false;
 }
 
-bool checkDim(const std::vector<int>& dims,
-              const std::variant<int, std::vector<int>>& target) {
-  if (std::holds_alternative<int>(target)) {
-    // If target is a single integer
-    if (dims.size() != 1) {
-      return false; // Different sizes, not exactly equal
-    }
-    return dims[0] == std::get<int>(target);
-  } else {
-    // If target is a vector
-    const auto& targetVec = std::get<std::vector<int>>(target);
-    if (dims.size() != targetVec.size()) {
-      return false; // Different sizes, not exactly equal
-    }
-    for (size_t i = 0; i < dims.size(); ++i) {
-      if (dims[i] != targetVec[i]) {
-        return false; // Different elements, not exactly equal
-      }
-    }
-    return true; // All elements are the same, exactly equal
+Opcode parseOpcode(const std::string& tag) {
+  static const std::unordered_map<std::string, Opcode> opcodes{
+      {"rxy", Opcode::Rxy}, {"rz", Opcode::Rz},     {"rh", Opcode::Rh},
+      {"virtrz", Opcode::VirtRz}, {"x", Opcode::X}, {"s", Opcode::S},
+      {"z", Opcode::Z},     {"h", Opcode::H},       {"cx", Opcode::Cx},
+      {"csum", Opcode::Csum}, {"cuone", Opcode::CustomOne},
+      {"ms", Opcode::Dense},  {"ls", Opcode::Dense},  {"cutwo", Opcode::Dense},
+      {"cumulti", Opcode::Dense}, {"pm", Opcode::Dense},
+      {"rdu", Opcode::Dense}};
+  const auto it = opcodes.find(tag);
+  return it == opcodes.end() ? Opcode::Unsupported : it->second;
+}
+
+// Hand a vector to NumPy without copying; the array owns the buffer through a
+// capsule.
+template <class T> py::array_t<T> vector_to_array(std::vector<T>&& vec) {
+  auto* owned = new std::vector<T>(std::move(vec));
+  py::capsule owner(owned, [](void* p) {
+    delete reinterpret_cast<std::vector<T>*>(p);
+  });
+  return py::array_t<T>({static_cast<py::ssize_t>(owned->size())},
+                        owned->data(), owner);
+}
+
+// Stride of each qudit in the circuit layout (first qudit most significant)
+std::vector<size_t> circuit_strides(const std::vector<size_t>& dims) {
+  std::vector<size_t> strides(dims.size(), 1);
+  for (size_t q = dims.size(); q-- > 1;) {
+    strides[q - 1] = strides[q] * dims[q];
   }
+  return strides;
 }
 
-// Function to convert C++ vector of complex numbers to a Python list
-py::list complex_vector_to_list(const CVec& vec) {
-  py::list pyList;
-  for (const auto& elem : vec) {
-    try {
-      // Convert std::complex<double> to Python complex object
-      py::object pyComplex = py::cast(elem);
-      // Append Python complex object to the list
-      pyList.append(pyComplex);
-    } catch (const std::exception& e) {
-      // Handle any exceptions
-      std::cerr << "Error appending Python object: " << e.what() << std::endl;
+// Reorder a state vector from the DD layout (last qudit most significant) to
+// the circuit layout (first qudit most significant) and hand it to NumPy.
+py::array_t<std::complex<double>> state_vector_to_array(const CVec& vec,
+                                                        const std::vector<size_t>& dims) {
+  const size_t numQudits = dims.size();
+  const auto strides = circuit_strides(dims);
+
+  CVec reordered(vec.size());
+  std::vector<size_t> digits(numQudits, 0);
+  size_t target = 0;
+  for (const auto& amplitude : vec) {
+    reordered[target] = amplitude;
+    // odometer over the DD layout, qudit 0 runs fastest
+    for (size_t q = 0; q < numQudits; ++q) {
+      if (++digits[q] < dims[q]) {
+        target += strides[q];
+        break;
+      }
+      digits[q] = 0;
+      target -= (dims[q] - 1) * strides[q];
     }
   }
-  return pyList;
+
+  return vector_to_array(std::move(reordered));
 }
 
 // =======================================================================================================
@@ -178,8 +229,6 @@ Circuit_info readCircuit(py::object& circ) {
   std::vector<size_t> dimensions =
       circ.attr("_dimensions").cast<std::vector<size_t>>();
 
-  bool result_empty = py::isinstance<py::none>(circ.attr("instructions"));
-
   // Get Python iterable
   py::iterator it = py::iter(circ.attr("instructions"));
 
@@ -189,8 +238,9 @@ Circuit_info readCircuit(py::object& circ) {
     py::object obj = py::reinterpret_borrow<py::object>(obj_handle);
 
     std::string tag = obj.attr("qasm_tag").cast<std::string>();
+    const Opcode opcode = parseOpcode(tag);
 
-    bool dagger = obj.attr("dagger").cast<bool>();
+    auto dagger = obj.attr("dagger").cast<bool>();
 
     std::string gate_type =
         py::cast<std::string>(obj.attr("gate_type").attr("name"));
@@ -213,10 +263,33 @@ Circuit_info readCircuit(py::object& circ) {
       target_qudits = py::cast<std::vector<int>>(target_qudits_obj);
     }
 
-    py::object params;
-    if (is_none_or_empty(obj.attr("_params"))) {
-    } else {
-      params = obj.attr("_params");
+    std::vector<double> params;
+    py::object params_obj = obj.attr("_params");
+    if (opcode == Opcode::CustomOne || opcode == Opcode::Dense) {
+      // the matrix is read straight from the buffer of the array. Dense gates
+      // take the matrix on their lines with the dagger already applied
+      if (opcode == Opcode::Dense) {
+        params_obj = obj.attr("to_matrix")("identities"_a = 0);
+        dagger = false;
+      }
+      const auto matrix =
+          py::array_t<std::complex<double>,
+                      py::array::c_style | py::array::forcecast>::
+              ensure(params_obj);
+      if (!matrix) {
+        throw std::invalid_argument("Gate " + tag + " without a matrix");
+      }
+      const auto* entries =
+          reinterpret_cast<const double*>(matrix.data()); // NOLINT
+      params.assign(entries, entries + 2 * matrix.size());
+    } else if (!is_none_or_empty(params_obj) &&
+        (py::isinstance<py::list>(params_obj) ||
+         py::isinstance<py::tuple>(params_obj))) {
+      try {
+        params = params_obj.cast<std::vector<double>>();
+      } catch (const py::cast_error&) {
+        params.clear();
+      }
     }
 
     std::tuple<std::vector<dd::QuantumRegister>, std::vector<dd::Control::Type>>
@@ -233,7 +306,7 @@ Circuit_info readCircuit(py::object& circ) {
       control_set = std::make_tuple(indices, ctrlStates);
     }
 
-    result.push_back(std::make_tuple(tag, dagger, dims, gate_type,
+    result.push_back(std::make_tuple(tag, opcode, dagger, dims, gate_type,
                                      target_qudits, params, control_set));
 
     // Increment the iterator
@@ -285,195 +358,213 @@ NoiseModel parse_noise_model(const py::dict& noise_model) {
   return newNoiseModel;
 }
 
-Circuit generateCircuit(const Circuit_info& circuitInfo,
-                        const NoiseModel& noiseModel) {
-  // Get current time in milliseconds
-  auto currentTimeMs = std::chrono::duration_cast<std::chrono::milliseconds>(
-                           std::chrono::system_clock::now().time_since_epoch())
-                           .count();
-  const auto& [num_qudits, dimensions, circuit] = circuitInfo;
-
-  std::random_device rd;
-  std::mt19937_64 gen(rd() + currentTimeMs);
-
-  Circuit noisyCircuit;
-
-  for (const Instruction& instruction : circuit) {
-    noisyCircuit.push_back(instruction);
+// Draw the noise acting after `instruction` and append the resulting gates to
+// `noiseGates`. The random numbers are consumed in a fixed order, so a
+// generator seeded identically always yields the same noise.
+void sampleNoise(const Instruction& instruction, unsigned int num_qudits,
+                 const std::vector<size_t>& dimensions,
+                 const NoiseModel& noiseModel, std::mt19937_64& gen,
+                 Circuit& noiseGates) {
+  const auto& [tag, opcode, dag, dims_gate, gate_type, target_qudits, params,
+               control_set] = instruction;
+  std::vector<int> referenceLines(target_qudits.begin(), target_qudits.end());
+
+  if (!(std::get<0>(control_set).empty()) &&
+      !(std::get<1>(control_set).empty())) {
+    auto [ctrl_dits, levels] = control_set; // Decompose the tuple
+
+    referenceLines.insert(referenceLines.end(), ctrl_dits.begin(),
+                          ctrl_dits.end());
+  }
 
-    const auto& [tag, dag, dims_gate, gate_type, target_qudits, params,
-                 control_set] = instruction;
-    std::vector<int> referenceLines(target_qudits.begin(), target_qudits.end());
-
-    if (!(std::get<0>(control_set).empty()) &&
-        (std::get<1>(control_set).empty())) {
-      auto [ctrl_dits, levels] = control_set; // Decompose the tuple
-
-      referenceLines.insert(referenceLines.end(), ctrl_dits.begin(),
-                            ctrl_dits.end());
-    }
-
-    if (noiseModel.find(tag) != noiseModel.end()) {
-      for (const auto& mode_noise : noiseModel.at(tag)) {
-        auto mode = mode_noise.first;
-        auto noise_info = mode_noise.second;
-        double depo = std::get<0>(noise_info);
-        double deph = std::get<1>(noise_info);
-
-        std::discrete_distribution<int> x_dist({1.0 - depo, depo});
-        std::discrete_distribution<int> z_dist({1.0 - deph, deph});
-
-        int x_choice = x_dist(gen);
-        int z_choice = z_dist(gen);
-
-        if (x_choice == 1 || z_choice == 1) {
-          std::vector<int> qudits;
-          if (std::holds_alternative<std::vector<int>>(mode)) {
-            qudits = std::get<std::vector<int>>(mode);
-
-          } else if (std::holds_alternative<std::string>(mode)) {
-            std::string modeStr = std::get<std::string>(mode);
-
-            if (modeStr == "local") {
-              qudits = referenceLines;
-            } else if (modeStr == "all") {
-              for (int i = 0; i < num_qudits; ++i)
-                qudits.push_back(i);
-            } else if (modeStr == "nonlocal") {
-              assert(gate_type == "TWO" || gate_type == "MULTI");
-              qudits = referenceLines;
-            } else if (modeStr == "control") {
-              assert(gate_type == "TWO");
-              qudits.push_back(target_qudits.at(0));
-            } else if (modeStr == "target") {
-              assert(gate_type == "TWO");
-              qudits.push_back(target_qudits.at(1));
-            }
+  if (noiseModel.find(tag) != noiseModel.end()) {
+    for (const auto& mode_noise : noiseModel.at(tag)) {
+      auto mode = mode_noise.first;
+      auto noise_info = mode_noise.second;
+      double depo = std::get<0>(noise_info);
+      double deph = std::get<1>(noise_info);
+
+      std::discrete_distribution<int> x_dist({1.0 - depo, depo});
+      std::discrete_distribution<int> z_dist({1.0 - deph, deph});
+
+      int x_choice = x_dist(gen);
+      int z_choice = z_dist(gen);
+
+      if (x_choice == 1 || z_choice == 1) {
+        std::vector<int> qudits;
+        if (std::holds_alternative<std::vector<int>>(mode)) {
+          qudits = std::get<std::vector<int>>(mode);
+
+        } else if (std::holds_alternative<std::string>(mode)) {
+          std::string modeStr = std::get<std::string>(mode);
+
+          if (modeStr == "local") {
+            qudits = referenceLines;
+          } else if (modeStr == "all") {
+            for (int i = 0; i < num_qudits; ++i)
+              qudits.push_back(i);
+          } else if (modeStr == "nonlocal") {
+            assert(gate_type == "TWO" || gate_type == "MULTI");
+            qudits = referenceLines;
+          } else if (modeStr == "control") {
+            assert(gate_type == "TWO");
+            qudits.push_back(target_qudits.at(0));
+          } else if (modeStr == "target") {
+            assert(gate_type == "TWO");
+            qudits.push_back(target_qudits.at(1));
           }
-          if (x_choice == 1) {
-            for (auto dit : qudits) {
-              if (tag == "rxy" || tag == "rz" || tag == "virtrz") {
-                std::vector<int> dims;
-                dims.push_back(static_cast<int>(
-                    dimensions[static_cast<unsigned long>(dit)]));
-                py::list params_new;
-
-                size_t value_0, value_1;
-                // Retrieve field 0 and 1 from params
-                auto pl = params.cast<py::list>();
-                value_0 = pl[0].cast<size_t>();
-                if (tag == "virtrz") {
-                  if (dims.size() != 1) {
-                    throw std::runtime_error(
-                        "Dimension should be just an int"); // Different sizes,
-                                                            // not exactly equal
-                  }
-                  if (value_0 != dims[0] - 1) {
-                    value_1 = value_0 + 1;
-                  } else {
-                    value_0 = dims[0] - 2;
-                    value_1 = dims[0] - 1;
-                  }
+        }
+        if (x_choice == 1) {
+          for (auto dit : qudits) {
+            if (opcode == Opcode::Rxy || opcode == Opcode::Rz ||
+                opcode == Opcode::VirtRz) {
+              std::vector<int> dims;
+              dims.push_back(static_cast<int>(
+                  dimensions[static_cast<unsigned long>(dit)]));
+              std::vector<double> params_new;
+
+              size_t value_0, value_1;
+              // Retrieve field 0 and 1 from params
+              value_0 = static_cast<size_t>(params.at(0));
+              if (opcode == Opcode::VirtRz) {
+                if (dims.size() != 1) {
+                  throw std::runtime_error(
+                      "Dimension should be just an int"); // Different sizes,
+                                                          // not exactly equal
+                }
+                if (value_0 != dims[0] - 1) {
+                  value_1 = value_0 + 1;
                 } else {
-                  value_1 = pl[1].cast<size_t>();
+                  value_0 = dims[0] - 2;
+                  value_1 = dims[0] - 1;
                 }
-
-                // Create a new list and append value_0 and value_1
-                params_new.append(value_0);
-                params_new.append(value_1);
-
-                // Append pi and pi/2
-                double pi = 3.14159265358979323846;
-                double pi_over_2 = pi / 2.0;
-                params_new.append(py::float_(pi));
-                params_new.append(py::float_(pi_over_2));
-                Instruction new_inst = std::make_tuple(
-                    "rxy", false, dims, "SINGLE", std::vector<int>{dit},
-                    py::cast<py::object>(params_new),
-                    std::tuple<std::vector<dd::QuantumRegister>,
-                               std::vector<dd::Control::Type>>());
-                noisyCircuit.push_back(new_inst);
               } else {
-                py::object params_new;
-                std::vector<int> dims;
-                dims.push_back(static_cast<int>(
-                    dimensions[static_cast<unsigned long>(dit)]));
-
-                Instruction new_inst = std::make_tuple(
-                    "x", false, dims, "SINGLE", std::vector<int>{dit},
-                    params_new,
-                    std::tuple<std::vector<dd::QuantumRegister>,
-                               std::vector<dd::Control::Type>>());
-                noisyCircuit.push_back(new_inst);
+                value_1 = static_cast<size_t>(params.at(1));
               }
+
+              // Create a new list and append value_0 and value_1
+              params_new.push_back(static_cast<double>(value_0));
+              params_new.push_back(static_cast<double>(value_1));
+
+              // Append pi and pi/2
+              double pi = 3.14159265358979323846;
+              double pi_over_2 = pi / 2.0;
+              params_new.push_back(pi);
+              params_new.push_back(pi_over_2);
+              Instruction new_inst = std::make_tuple(
+                  "rxy", Opcode::Rxy, false, dims, "SINGLE",
+                  std::vector<int>{dit},
+                  params_new,
+                  std::tuple<std::vector<dd::QuantumRegister>,
+                             std::vector<dd::Control::Type>>());
+              noiseGates.push_back(new_inst);
+            } else {
+              std::vector<double> params_new;
+              std::vector<int> dims;
+              dims.push_back(static_cast<int>(
+                  dimensions[static_cast<unsigned long>(dit)]));
+
+              Instruction new_inst = std::make_tuple(
+                  "x", Opcode::X, false, dims, "SINGLE",
+                  std::vector<int>{dit},
+                  params_new,
+                  std::tuple<std::vector<dd::QuantumRegister>,
+                             std::vector<dd::Control::Type>>());
+              noiseGates.push_back(new_inst);
             }
           }
+        }
 
-          if (z_choice == 1) {
-            for (auto dit : qudits) {
-              if (tag == "rxy" || tag == "rz" || tag == "virtrz") {
-                py::list params_new;
-
-                std::vector<int> dims;
-                dims.push_back(static_cast<int>(
-                    dimensions[static_cast<unsigned long>(dit)]));
-
-                size_t value_0, value_1;
-                // Retrieve field 0 and 1 from params
-                auto pl = params.cast<py::list>();
-                value_0 = pl[0].cast<size_t>();
-                if (tag == "virtrz") {
-                  if (dims.size() != 1) {
-                    throw std::runtime_error(
-                        "Dimension should be just an int"); // Different sizes,
-                                                            // not exactly equal
-                  }
-                  if (value_0 != dims[0] - 1) {
-                    value_1 = value_0 + 1;
-                  } else {
-                    value_0 = dims[0] - 2;
-                    value_1 = dims[0] - 1;
-                  }
+        if (z_choice == 1) {
+          for (auto dit : qudits) {
+            if (opcode == Opcode::Rxy || opcode == Opcode::Rz ||
+                opcode == Opcode::VirtRz) {
+              std::vector<double> params_new;
+
+              std::vector<int> dims;
+              dims.push_back(static_cast<int>(
+                  dimensions[static_cast<unsigned long>(dit)]));
+
+              size_t value_0, value_1;
+              // Retrieve field 0 and 1 from params
+              value_0 = static_cast<size_t>(params.at(0));
+              if (opcode == Opcode::VirtRz) {
+                if (dims.size() != 1) {
+                  throw std::runtime_error(
+                      "Dimension should be just an int"); // Different sizes,
+                                                          // not exactly equal
+                }
+                if (value_0 != dims[0] - 1) {
+                  value_1 = value_0 + 1;
                 } else {
-                  value_1 = pl[1].cast<size_t>();
+                  value_0 = dims[0] - 2;
+                  value_1 = dims[0] - 1;
                 }
-
-                // Create a new list and append value_0 and value_1
-                params_new.append(value_0);
-                params_new.append(value_1);
-
-                // Append pi and pi/2
-                double pi = 3.14159265358979323846;
-                params_new.append(py::float_(pi));
-                Instruction newInst = std::make_tuple(
-                    "rz", false, dims, "SINGLE", std::vector<int>{dit},
-                    py::cast<py::object>(params_new),
-                    std::tuple<std::vector<dd::QuantumRegister>,
-                               std::vector<dd::Control::Type>>());
-                noisyCircuit.push_back(newInst);
               } else {
-                py::object paramsNew;
-                std::vector<int> dims;
-                dims.push_back(static_cast<int>(
-                    dimensions[static_cast<unsigned long>(dit)]));
-
-                Instruction newInst = std::make_tuple(
-                    "z", false, dims, "SINGLE", std::vector<int>{dit},
-                    paramsNew,
-                    std::tuple<std::vector<dd::QuantumRegister>,
-                               std::vector<dd::Control::Type>>());
-                noisyCircuit.push_back(newInst);
+                value_1 = static_cast<size_t>(params.at(1));
               }
+
+              // Create a new list and append value_0 and value_1
+              params_new.push_back(static_cast<double>(value_0));
+              params_new.push_back(static_cast<double>(value_1));
+
+              // Append pi and pi/2
+              double pi = 3.14159265358979323846;
+              params_new.push_back(pi);
+              Instruction newInst = std::make_tuple(
+                  "rz", Opcode::Rz, false, dims, "SINGLE",
+                  std::vector<int>{dit},
+                  params_new,
+                  std::tuple<std::vector<dd::QuantumRegister>,
+                             std::vector<dd::Control::Type>>());
+              noiseGates.push_back(newInst);
+            } else {
+              std::vector<double> paramsNew;
+              std::vector<int> dims;
+              dims.push_back(static_cast<int>(
+                  dimensions[static_cast<unsigned long>(dit)]));
+
+              Instruction newInst = std::make_tuple(
+                  "z", Opcode::Z, false, dims, "SINGLE",
+                  std::vector<int>{dit},
+                  paramsNew,
+                  std::tuple<std::vector<dd::QuantumRegister>,
+                             std::vector<dd::Control::Type>>());
+              noiseGates.push_back(newInst);
             }
           }
         }
       }
     }
   }
+}
+
+Circuit generateCircuit(const Circuit_info& circuitInfo,
+                        const NoiseModel& noiseModel, std::mt19937_64& gen) {
+  const auto& [num_qudits, dimensions, circuit] = circuitInfo;
+
+  Circuit noisyCircuit;
+
+  for (const Instruction& instruction : circuit) {
+    noisyCircuit.push_back(instruction);
+    sampleNoise(instruction, num_qudits, dimensions, noiseModel, gen,
+                noisyCircuit);
+  }
 
   return noisyCircuit;
 }
 
+// Generator of a noise draw, seeded from the hardware source if no seed is given
+std::mt19937_64 noiseGenerator(std::optional<std::uint64_t> seed) {
+  if (!seed.has_value()) {
+    std::random_device rd;
+    seed = (static_cast<std::uint64_t>(rd()) << 32U) | rd();
+  }
+  std::seed_seq seq{static_cast<std::uint32_t>(*seed),
+                    static_cast<std::uint32_t>(*seed >> 32U)};
+  return std::mt19937_64(seq);
+}
+
 // =======================================================================================================
 // =======================================================================================================
 // =======================================================================================================
@@ -484,7 +575,7 @@ Circuit generateCircuit(const Circuit_info& circuitInfo,
 // =======================================================================================================
 // =======================================================================================================
 /*
- * SUPPORTED GATES AT THE MOMENT UNTIL DIMENSION 7
+ * SUPPORTED GATES, ON QUDITS OF ANY DIMENSION
 "csum": "csum",
 "cx": "cx",
 "h": "h",
@@ -494,323 +585,827 @@ Circuit generateCircuit(const Circuit_info& circuitInfo,
 "virtrz": "virtrz",
 "s": "s",
 "x": "x",
-"z": "z"
+"z": "z",
+"cuone": "cu_one",
+AS DENSE MATRICES ON THEIR LINES
+"ms": "ms",
+"ls": "ls",
+"cutwo": "cu_two",
+"cumulti": "cu_multi",
+"pm": "pm",
+"rdu": "randu"
  */
 using ddpkg = std::unique_ptr<dd::MDDPackage>;
 
-dd::MDDPackage::mEdge getGate(const ddpkg& dd, const Instruction& instruction) {
-  const auto& [tag, dag, dims, gate_type, target_qudits, params, control_set] =
-      instruction;
+// The controls of an instruction, checked against the registers of the package
+dd::Controls getControls(const ddpkg& dd, const Instruction& instruction) {
+  const auto& tag = std::get<0>(instruction);
+  const auto& target_qudits = std::get<5>(instruction);
+  const auto& [ctrlQudits, ctrlLevels] = std::get<7>(instruction);
+  if (ctrlQudits.size() != ctrlLevels.size()) {
+    throw std::invalid_argument("Gate " + tag + " has " +
+                                std::to_string(ctrlQudits.size()) +
+                                " controls but " +
+                                std::to_string(ctrlLevels.size()) + " levels");
+  }
+  dd::Controls controlSet{};
+  for (size_t i = 0; i < ctrlQudits.size(); ++i) {
+    const auto radix =
+        dd->registersSizes.at(static_cast<size_t>(ctrlQudits[i]));
+    if (std::find(target_qudits.begin(), target_qudits.end(), ctrlQudits[i]) !=
+            target_qudits.end() ||
+        ctrlLevels[i] >= radix ||
+        controlSet.find(ctrlQudits[i]) != controlSet.end()) {
+      throw std::invalid_argument("Gate " + tag + " has an invalid control " +
+                                  "on qudit " + std::to_string(ctrlQudits[i]));
+    }
+    controlSet.insert(dd::Control{ctrlQudits[i], ctrlLevels[i]});
+  }
+  return controlSet;
+}
+
+// The two levels of a rotation in ascending order, the gates of the circuit
+// accept them in any order
+std::pair<size_t, size_t> sortedLevels(const std::vector<double>& params) {
+  const auto levA = static_cast<size_t>(params.at(0));
+  const auto levB = static_cast<size_t>(params.at(1));
+  return std::minmax(levA, levB);
+}
+
+// Matrix of a gate on its first target, for the opcodes acting on a single
+// qudit. The conjugate transpose of daggered gates is left to the caller.
+dd::DynamicGateMatrix targetMatrix(const Instruction& instruction) {
+  const auto& [tag, opcode, dag, dims, gate_type, target_qudits, params,
+               control_set] = instruction;
+  const auto dim = static_cast<size_t>(dims.at(0));
+  switch (opcode) {
+  case Opcode::Rxy: {
+    const auto [levA, levB] = sortedLevels(params);
+    return dd::RXYd(params.at(2), params.at(3), levA, levB, dim);
+  }
+  case Opcode::Rz: {
+    const auto [levA, levB] = sortedLevels(params);
+    return dd::RZd(params.at(2), levA, levB, dim);
+  }
+  case Opcode::Rh: {
+    const auto [levA, levB] = sortedLevels(params);
+    return dd::RHd(levA, levB, dim);
+  }
+  case Opcode::VirtRz:
+    return dd::VirtRZd(params.at(1), static_cast<size_t>(params.at(0)), dim);
+  case Opcode::X:
+    return dd::Xd(dim);
+  case Opcode::S:
+    return dd::Sd(dim);
+  case Opcode::Z:
+    return dd::Zd(dim);
+  case Opcode::H:
+    return dd::Hd(dim);
+  case Opcode::CustomOne: {
+    dd::DynamicGateMatrix entries(params.size() / 2);
+    for (size_t i = 0; i < entries.size(); ++i) {
+      entries[i] = {params[2 * i], params[2 * i + 1]};
+    }
+    return entries;
+  }
+  default:
+    throw std::invalid_argument("Gate " + tag +
+                                " is not supported by the simulator");
+  }
+}
+
+dd::MDDPackage::mEdge buildGate(const ddpkg& dd, const Instruction& instruction,
+                                const dd::Controls& controlSet) {
+  const auto& [tag, opcode, dag, dims, gate_type, target_qudits, params,
+               control_set] = instruction;
 
-  dd::MDDPackage::mEdge gate;
   auto numberRegs =
       static_cast<dd::QuantumRegisterCount>(dd->numberOfQuantumRegisters);
 
-  dd::QuantumRegister tq = 0;
-  tq = static_cast<dd::QuantumRegister>(target_qudits.at(0));
-
-  dd::Controls controlSet{};
-  if ((std::get<0>(control_set).size() > 0) &&
-      (std::get<1>(control_set).size() > 0)) {
-    std::vector<dd::QuantumRegister> ctrlQudits = std::get<0>(control_set);
-    std::vector<dd::Control::Type> ctrlLevels = std::get<1>(control_set);
-  }
-
-  if (tag == "rxy") {
-    // Handle rxy tag with dimension 2
-    auto pl = params.cast<py::list>();
-    auto leva = pl[0].cast<size_t>();
-    auto levb = pl[1].cast<size_t>();
-    auto theta = pl[2].cast<double>();
-    auto phi = pl[3].cast<double>();
-
-    if (checkDim(dims, 2)) {
-      dd::GateMatrix matrix = dd::RXY(theta, phi);
-      gate = dd->makeGateDD<dd::GateMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 3)) {
-      // Handle rxy tag with dimension 3
-      dd::TritMatrix matrix = dd::RXY3(theta, phi, leva, levb);
-      gate = dd->makeGateDD<dd::TritMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 4)) {
-      // Handle rxy tag with dimension 4
-      dd::QuartMatrix matrix = dd::RXY4(theta, phi, leva, levb);
-      gate =
-          dd->makeGateDD<dd::QuartMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 5)) {
-      dd::QuintMatrix matrix = dd::RXY5(theta, phi, leva, levb);
-      gate =
-          dd->makeGateDD<dd::QuintMatrix>(matrix, numberRegs, controlSet, tq);
-    } else if (checkDim(dims, 6)) {
-      dd::SextMatrix matrix = dd::RXY6(theta, phi, leva, levb);
-      gate = dd->makeGateDD<dd::SextMatrix>(matrix, numberRegs, controlSet, tq);
-    } else if (checkDim(dims, 7)) {
-      dd::SeptMatrix matrix = dd::RXY7(theta, phi, leva, levb);
-      gate = dd->makeGateDD<dd::SeptMatrix>(matrix, numberRegs, controlSet, tq);
-    }
-  } else if (tag == "rz") {
-    auto pl = params.cast<py::list>();
-
-    auto leva = pl[0].cast<size_t>();
-    auto levb = pl[1].cast<size_t>();
-    auto phi = pl[2].cast<double>();
-
-    if (checkDim(dims, 2)) {
-      dd::GateMatrix matrix = dd::RZ(phi);
-      gate = dd->makeGateDD<dd::GateMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 3)) {
-      dd::TritMatrix matrix = dd::RZ3(phi, leva, levb);
-      gate = dd->makeGateDD<dd::TritMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 4)) {
-      dd::QuartMatrix matrix = dd::RZ4(phi, leva, levb);
-      gate =
-          dd->makeGateDD<dd::QuartMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 5)) {
-      dd::QuintMatrix matrix = dd::RZ5(phi, leva, levb);
-      gate =
-          dd->makeGateDD<dd::QuintMatrix>(matrix, numberRegs, controlSet, tq);
-    } else if (checkDim(dims, 6)) {
-      dd::SextMatrix matrix = dd::RZ6(phi, leva, levb);
-      gate = dd->makeGateDD<dd::SextMatrix>(matrix, numberRegs, controlSet, tq);
-    } else if (checkDim(dims, 7)) {
-      dd::SeptMatrix matrix = dd::RZ7(phi, leva, levb);
-      gate = dd->makeGateDD<dd::SeptMatrix>(matrix, numberRegs, controlSet, tq);
-    }
-  } else if (tag == "rh") {
-    auto pl = params.cast<py::list>();
-    auto leva = pl[0].cast<size_t>();
-    auto levb = pl[1].cast<size_t>();
-
-    if (checkDim(dims, 2)) {
-      dd::GateMatrix matrix = dd::RH();
-      gate = dd->makeGateDD<dd::GateMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 3)) {
-      dd::TritMatrix matrix = dd::RH3(leva, levb);
-      gate = dd->makeGateDD<dd::TritMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 4)) {
-      dd::QuartMatrix matrix = dd::RH4(leva, levb);
-      gate =
-          dd->makeGateDD<dd::QuartMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 5)) {
-      dd::QuintMatrix matrix = dd::RH5(leva, levb);
-      gate =
-          dd->makeGateDD<dd::QuintMatrix>(matrix, numberRegs, controlSet, tq);
-    } else if (checkDim(dims, 6)) {
-      dd::SextMatrix matrix = dd::RH6(leva, levb);
-      gate = dd->makeGateDD<dd::SextMatrix>(matrix, numberRegs, controlSet, tq);
-    } else if (checkDim(dims, 7)) {
-      dd::SeptMatrix matrix = dd::RH7(leva, levb);
-      gate = dd->makeGateDD<dd::SeptMatrix>(matrix, numberRegs, controlSet, tq);
-    }
-  } else if (tag == "virtrz") {
-    auto pl = params.cast<py::list>();
-    auto leva = pl[0].cast<size_t>();
-    auto phi = pl[1].cast<double>();
-
-    if (checkDim(dims, 2)) {
-      dd::GateMatrix matrix = dd::VirtRZ(phi, leva);
-      gate = dd->makeGateDD<dd::GateMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 3)) {
-      dd::TritMatrix matrix = dd::VirtRZ3(phi, leva);
-      gate = dd->makeGateDD<dd::TritMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 4)) {
-      dd::QuartMatrix matrix = dd::VirtRZ4(phi, leva);
-      gate =
-          dd->makeGateDD<dd::QuartMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 5)) {
-      dd::QuintMatrix matrix = dd::VirtRZ5(phi, leva);
-      gate =
-          dd->makeGateDD<dd::QuintMatrix>(matrix, numberRegs, controlSet, tq);
-    } else if (checkDim(dims, 6)) {
-      dd::SextMatrix matrix = dd::VirtRZ6(phi, leva);
-      gate = dd->makeGateDD<dd::SextMatrix>(matrix, numberRegs, controlSet, tq);
-    } else if (checkDim(dims, 7)) {
-      dd::SeptMatrix matrix = dd::VirtRZ7(phi, leva);
-      gate = dd->makeGateDD<dd::SeptMatrix>(matrix, numberRegs, controlSet, tq);
-    }
-  } else if (tag == "x") {
-    if (checkDim(dims, 2)) {
-      dd::GateMatrix matrix = dd::Xmat;
-      gate = dd->makeGateDD<dd::GateMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 3)) {
-      dd::TritMatrix matrix = dd::X3;
-      gate = dd->makeGateDD<dd::TritMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 4)) {
-      dd::QuartMatrix matrix = dd::X4;
-      gate =
-          dd->makeGateDD<dd::QuartMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 5)) {
-      dd::QuintMatrix matrix = dd::X5;
-      gate =
-          dd->makeGateDD<dd::QuintMatrix>(matrix, numberRegs, controlSet, tq);
-    } else if (checkDim(dims, 6)) {
-      dd::SextMatrix matrix = dd::X6;
-      gate = dd->makeGateDD<dd::SextMatrix>(matrix, numberRegs, controlSet, tq);
-    } else if (checkDim(dims, 7)) {
-      dd::SeptMatrix matrix = dd::X7;
-      gate = dd->makeGateDD<dd::SeptMatrix>(matrix, numberRegs, controlSet, tq);
-    }
-  } else if (tag == "s") {
-    if (checkDim(dims, 2)) {
-      dd::GateMatrix matrix = dd::Smat;
-      gate = dd->makeGateDD<dd::GateMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 3)) {
-      dd::TritMatrix matrix = dd::S3();
-      gate = dd->makeGateDD<dd::TritMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 4)) {
-      dd::QuartMatrix matrix = dd::S4();
-      gate =
-          dd->makeGateDD<dd::QuartMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 5)) {
-      dd::QuintMatrix matrix = dd::S5();
-      gate =
-          dd->makeGateDD<dd::QuintMatrix>(matrix, numberRegs, controlSet, tq);
-    } else if (checkDim(dims, 6)) {
-      dd::SextMatrix matrix = dd::S6();
-      gate = dd->makeGateDD<dd::SextMatrix>(matrix, numberRegs, controlSet, tq);
-    } else if (checkDim(dims, 7)) {
-      dd::SeptMatrix matrix = dd::S7();
-      gate = dd->makeGateDD<dd::SeptMatrix>(matrix, numberRegs, controlSet, tq);
-    }
-  } else if (tag == "z") {
-    if (checkDim(dims, 2)) {
-      dd::GateMatrix matrix = dd::Zmat;
-      gate = dd->makeGateDD<dd::GateMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 3)) {
-      dd::TritMatrix matrix = dd::Z3();
-      gate = dd->makeGateDD<dd::TritMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 4)) {
-      dd::QuartMatrix matrix = dd::Z4();
-      gate =
-          dd->makeGateDD<dd::QuartMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 5)) {
-      dd::QuintMatrix matrix = dd::Z5();
-      gate =
-          dd->makeGateDD<dd::QuintMatrix>(matrix, numberRegs, controlSet, tq);
-    } else if (checkDim(dims, 6)) {
-      dd::SextMatrix matrix = dd::Z6();
-      gate = dd->makeGateDD<dd::SextMatrix>(matrix, numberRegs, controlSet, tq);
-    } else if (checkDim(dims, 7)) {
-      dd::SeptMatrix matrix = dd::Z7();
-      gate = dd->makeGateDD<dd::SeptMatrix>(matrix, numberRegs, controlSet, tq);
-    }
-
-  } else if (tag == "h") {
-    if (checkDim(dims, 2)) {
-      dd::GateMatrix matrix = dd::H();
-      gate = dd->makeGateDD<dd::GateMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 3)) {
-      dd::TritMatrix matrix = dd::H3();
-      gate = dd->makeGateDD<dd::TritMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 4)) {
-      dd::QuartMatrix matrix = dd::H4();
-      gate =
-          dd->makeGateDD<dd::QuartMatrix>(matrix, numberRegs, controlSet, tq);
-
-    } else if (checkDim(dims, 5)) {
-      dd::QuintMatrix matrix = dd::H5();
-      gate =
-          dd->makeGateDD<dd::QuintMatrix>(matrix, numberRegs, controlSet, tq);
-    } else if (checkDim(dims, 6)) {
-      dd::SextMatrix matrix = dd::H6();
-      gate = dd->makeGateDD<dd::SextMatrix>(matrix, numberRegs, controlSet, tq);
-    } else if (checkDim(dims, 7)) {
-      dd::SeptMatrix matrix = dd::H7();
-      gate = dd->makeGateDD<dd::SeptMatrix>(matrix, numberRegs, controlSet, tq);
-    }
-  } else if (tag == "cx") {
-    auto pl = params.cast<py::list>();
-
-    auto leva = pl[0].cast<size_t>();
-    auto levb = pl[1].cast<size_t>();
-    auto ctrlLev = pl[2].cast<dd::Control::Type>();
-    auto phi = pl[3].cast<dd::fp>();
+  switch (opcode) {
+  case Opcode::Dense: {
+    // the matrix covers the targets, or with controls every line between the
+    // first and the last line of the gate
+    std::vector<dd::QuantumRegister> lines(target_qudits.begin(),
+                                           target_qudits.end());
+    for (const auto& control : controlSet) {
+      lines.push_back(control.quantumRegister);
+    }
+    std::sort(lines.begin(), lines.end());
+    if (!controlSet.empty()) {
+      const auto first = lines.front();
+      lines.resize(static_cast<size_t>(lines.back() - first + 1));
+      std::iota(lines.begin(), lines.end(), first);
+    }
+    CVec entries(params.size() / 2);
+    for (size_t i = 0; i < entries.size(); ++i) {
+      entries[i] = {params[2 * i], params[2 * i + 1]};
+    }
+    return dd->makeDDFromMatrix(entries, numberRegs, lines);
+  }
+  case Opcode::Cx: {
+    auto leva = static_cast<size_t>(params.at(0));
+    auto levb = static_cast<size_t>(params.at(1));
+    auto ctrlLev = static_cast<dd::Control::Type>(params.at(2));
+    auto phi = params.at(3);
 
     auto cReg = static_cast<dd::QuantumRegister>(target_qudits.at(0));
     auto target = static_cast<dd::QuantumRegister>(target_qudits.at(1));
     return dd->cex(numberRegs, ctrlLev, phi, leva, levb, cReg, target, dag);
-  } else if (tag == "csum") {
+  }
+  case Opcode::Csum: {
     auto cReg = static_cast<dd::QuantumRegister>(target_qudits.at(0));
     auto target = static_cast<dd::QuantumRegister>(target_qudits.at(1));
     return dd->csum(numberRegs, cReg, target, dag);
   }
+  default:
+    break;
+  }
+  auto gate = dd->makeGateDD<dd::DynamicGateMatrix>(
+      targetMatrix(instruction), numberRegs, controlSet,
+      static_cast<dd::QuantumRegister>(target_qudits.at(0)));
   if (dag) {
     gate = dd->conjugateTranspose(gate);
   }
   return gate;
 }
 
-CVec ddsimulator(dd::QuantumRegisterCount numLines,
-                 const std::vector<size_t>& dims, const Circuit& circuit) {
-  const ddpkg dd = std::make_unique<dd::MDDPackage>(numLines, dims);
-  auto psi = dd->makeZeroState(numLines);
+// The gate diagram of an instruction, taken from the gate table of the package
+// if the same gate was built before
+dd::MDDPackage::mEdge getGate(const ddpkg& dd, const Instruction& instruction) {
+  const auto& target_qudits = std::get<5>(instruction);
+  const dd::MDDPackage::GateKey key{
+      static_cast<std::uint8_t>(std::get<1>(instruction)),
+      std::get<2>(instruction), std::get<6>(instruction),
+      std::vector<dd::QuantumRegister>(target_qudits.begin(),
+                                       target_qudits.end()),
+      getControls(dd, instruction)};
+  auto gate = dd->lookupGate(key);
+  if (gate.nextNode == nullptr) {
+    gate = buildGate(dd, instruction, std::get<4>(key));
+    dd->insertGate(key, gate);
+  }
+  return gate;
+}
 
-  for (const Instruction& instruction : circuit) {
-    dd::MDDPackage::mEdge gate;
+// Maximum number of qudits of a block of fused gates, fusion is off by default
+// since it only pays off once the state is dense
+constexpr size_t DEFAULT_FUSION_WIDTH = 0;
+
+// Lines an instruction acts on, its targets and controls in ascending order.
+// The matrix of a controlled dense gate covers every line in between as well.
+std::vector<int> gateLines(const Instruction& instruction) {
+  const auto& target_qudits = std::get<5>(instruction);
+  const auto& ctrlQudits = std::get<0>(std::get<7>(instruction));
+  std::vector<int> lines(target_qudits.begin(), target_qudits.end());
+  lines.insert(lines.end(), ctrlQudits.begin(), ctrlQudits.end());
+  std::sort(lines.begin(), lines.end());
+  lines.erase(std::unique(lines.begin(), lines.end()), lines.end());
+  if (std::get<1>(instruction) == Opcode::Dense && !ctrlQudits.empty()) {
+    const auto first = lines.front();
+    lines.resize(static_cast<size_t>(lines.back() - first + 1));
+    std::iota(lines.begin(), lines.end(), first);
+  }
+  return lines;
+}
+
+// Dense matrix of a gate on its lines (see gateLines), in row-major order with
+// the first line most significant. It is built from the same matrices as the
+// gate diagram, a controlled gate applies its target matrix where all controls
+// are in their level and the identity elsewhere.
+CVec localMatrix(const ddpkg& dd, const Instruction& instruction,
+                 const dd::Controls& controlSet) {
+  const auto& [tag, opcode, dag, dims, gate_type, target_qudits, params,
+               control_set] = instruction;
+  const auto lines = gateLines(instruction);
+  // radix and stride of each register in the row and column indices
+  std::map<int, std::pair<size_t, size_t>> layout;
+  size_t size = 1;
+  for (auto line = lines.rbegin(); line != lines.rend(); ++line) {
+    const auto radix = dd->registersSizes.at(static_cast<size_t>(*line));
+    layout[*line] = {radix, size};
+    size *= radix;
+  }
+  const auto level = [&layout](size_t index, int line) {
+    const auto [radix, stride] = layout.at(line);
+    return index / stride % radix;
+  };
+
+  CVec matrix(size * size, {0., 0.});
+  if (opcode == Opcode::Dense) {
+    for (size_t i = 0; i < matrix.size(); ++i) {
+      matrix[i] = {params.at(2 * i), params.at(2 * i + 1)};
+    }
+    return matrix;
+  }
+  if (opcode == Opcode::Csum) {
+    // level i of the control shifts the target by i, or back by i if daggered
+    const auto control = target_qudits.at(0);
+    const auto target = target_qudits.at(1);
+    const auto [radix, stride] = layout.at(target);
+    for (size_t col = 0; col < size; ++col) {
+      const auto shift = level(col, control) % radix;
+      const auto from = level(col, target);
+      const auto to = (dag ? from + radix - shift : from + shift) % radix;
+      matrix[(col - from * stride + to * stride) * size + col] = 1.;
+    }
+    return matrix;
+  }
+
+  dd::DynamicGateMatrix targetEntries;
+  dd::Controls controls = controlSet;
+  auto target = target_qudits.at(0);
+  if (opcode == Opcode::Cx) {
+    target = target_qudits.at(1);
+    targetEntries = dd::embXd(params.at(3), static_cast<size_t>(params.at(0)),
+                              static_cast<size_t>(params.at(1)),
+                              layout.at(target).first);
+    controls = {dd::Control{static_cast<dd::QuantumRegister>(target_qudits.at(0)),
+                            static_cast<dd::Control::Type>(params.at(2))}};
+  } else {
+    targetEntries = targetMatrix(instruction);
+  }
+  const auto [radix, stride] = layout.at(target);
+  for (size_t row = 0; row < size; ++row) {
+    const auto i = level(row, target);
+    const auto active = std::all_of(
+        controls.begin(), controls.end(), [&level, row](const auto& control) {
+          return level(row, control.quantumRegister) == control.type;
+        });
+    // the other lines keep their levels
+    const auto base = row - i * stride;
+    for (size_t j = 0; j < radix; ++j) {
+      std::complex<double> value = i == j ? 1. : 0.;
+      if (active) {
+        const auto& entry = dag ? targetEntries.at(j * radix + i)
+                                : targetEntries.at(i * radix + j);
+        value = {entry.r, dag ? -entry.i : entry.i};
+      }
+      matrix[row * size + base + j * stride] = value;
+    }
+  }
+  return matrix;
+}
+
+// One diagram for the gates `begin` to `end` of the circuit. The block is
+// accumulated as a dense matrix on the lines of all its gates, every gate only
+// mixes the levels of its own lines. Products of gate diagrams lose too much
+// precision on the way.
+dd::MDDPackage::mEdge fuseGates(const ddpkg& dd, const Circuit& circuit,
+                                size_t begin, size_t end) {
+  std::vector<int> lines;
+  std::vector<int> merged;
+  for (auto index = begin; index < end; ++index) {
+    const auto ownLines = gateLines(circuit[index]);
+    merged.clear();
+    std::set_union(lines.begin(), lines.end(), ownLines.begin(),
+                   ownLines.end(), std::back_inserter(merged));
+    lines.swap(merged);
+  }
+
+  // stride of each register in the row and column indices of the block
+  std::vector<size_t> strides(dd->numberOfQuantumRegisters, 0);
+  size_t size = 1;
+  for (auto line = lines.rbegin(); line != lines.rend(); ++line) {
+    strides.at(static_cast<size_t>(*line)) = size;
+    size *= dd->registersSizes.at(static_cast<size_t>(*line));
+  }
+  CVec block(size * size, {0., 0.});
+  for (size_t i = 0; i < size; ++i) {
+    block[i * size + i] = 1.;
+  }
+
+  CVec product(block.size());
+  std::vector<size_t> gateRows(size);
+  std::vector<size_t> baseRows(size);
+  for (auto index = begin; index < end; ++index) {
+    const auto ownLines = gateLines(circuit[index]);
+    const auto gate =
+        localMatrix(dd, circuit[index], getControls(dd, circuit[index]));
+    // row of the gate acting on each row of the block, and the block row with
+    // the levels of the gate lines set to zero
+    size_t gateSize = 1;
+    std::fill(gateRows.begin(), gateRows.end(), 0);
+    std::iota(baseRows.begin(), baseRows.end(), 0);
+    for (const auto line : ownLines) {
+      const auto radix = dd->registersSizes.at(static_cast<size_t>(line));
+      const auto stride = strides.at(static_cast<size_t>(line));
+      for (size_t row = 0; row < size; ++row) {
+        const auto level = row / stride % radix;
+        gateRows[row] = gateRows[row] * radix + level;
+        baseRows[row] -= level * stride;
+      }
+      gateSize *= radix;
+    }
+    // block row of each row of the gate on top of a base row
+    std::vector<size_t> offsets(gateSize, 0);
+    for (size_t row = 0; row < size; ++row) {
+      if (baseRows[row] == 0) {
+        offsets[gateRows[row]] = row;
+      }
+    }
+
+    std::fill(product.begin(), product.end(), std::complex<double>{0., 0.});
+    for (size_t row = 0; row < size; ++row) {
+      const auto* gateRow = &gate[gateRows[row] * gateSize];
+      for (size_t k = 0; k < gateSize; ++k) {
+        const auto factor = gateRow[k];
+        if (factor == 0.) {
+          continue;
+        }
+        const auto* blockRow = &block[(baseRows[row] + offsets[k]) * size];
+        auto* productRow = &product[row * size];
+        for (size_t col = 0; col < size; ++col) {
+          productRow[col] += factor * blockRow[col];
+        }
+      }
+    }
+    block.swap(product);
+  }
+
+  for (auto& value : block) {
+    if (std::abs(value.real()) < dd::ComplexTable<>::tolerance()) {
+      value.real(0.);
+    }
+    if (std::abs(value.imag()) < dd::ComplexTable<>::tolerance()) {
+      value.imag(0.);
+    }
+  }
+  return dd->makeDDFromMatrix(
+      block, static_cast<dd::QuantumRegisterCount>(dd->numberOfQuantumRegisters),
+      std::vector<dd::QuantumRegister>(lines.begin(), lines.end()));
+}
+
+// Split the gates `begin` to `end` of the circuit into runs of consecutive
+// gates acting on at most `fusionWidth` qudits together, as the index one past
+// the last gate of every run. Gates wider than the fusion width form runs of
+// their own, a fusion width of zero puts every gate into a run of its own.
+std::vector<size_t> fusionBlocks(const Circuit& circuit, size_t begin,
+                                 size_t end, size_t fusionWidth) {
+  std::vector<size_t> ends;
+  std::vector<int> merged;
+  while (begin < end) {
+    auto lines = gateLines(circuit[begin]);
+    auto next = begin + 1;
+    for (; lines.size() <= fusionWidth && next < end; ++next) {
+      const auto nextLines = gateLines(circuit[next]);
+      merged.clear();
+      std::set_union(lines.begin(), lines.end(), nextLines.begin(),
+                     nextLines.end(), std::back_inserter(merged));
+      if (merged.size() > fusionWidth) {
+        break;
+      }
+      lines.swap(merged);
+    }
+    ends.push_back(next);
+    begin = next;
+  }
+  return ends;
+}
+
+// The diagram of the gates `begin` to `end` of the circuit, a single gate is
+// taken from the gate table
+dd::MDDPackage::mEdge blockGate(const ddpkg& dd, const Circuit& circuit,
+                                size_t begin, size_t end) {
+  return end - begin == 1 ? getGate(dd, circuit[begin])
+                          : fuseGates(dd, circuit, begin, end);
+}
+
+// Apply the circuit to the zero state. Only the current state is referenced,
+// so the package may collect everything else between two blocks. With a
+// fusion width, runs of consecutive gates on at most that many qudits are
+// fused into one block first (see fusionBlocks), so the state is traversed
+// once per block instead of once per gate.
+CVec simulate(const ddpkg& dd, const Circuit& circuit, size_t fusionWidth) {
+  auto psi = dd->makeZeroState(
+      static_cast<dd::QuantumRegisterCount>(dd->qregisters()));
+  dd->incRef(psi);
+
+  size_t begin = 0;
+  for (const auto end : fusionBlocks(circuit, 0, circuit.size(), fusionWidth)) {
+    dd::MDDPackage::mEdge block;
     try {
-      gate = getGate(dd, instruction);
+      block = blockGate(dd, circuit, begin, end);
     } catch (const std::exception& e) {
       std::cerr << "Caught exception in gate creation: " << e.what()
                 << std::endl;
       throw; // Re-throw the exception to propagate it further
     }
+    dd::MDDPackage::vEdge next;
     try {
-      psi = dd->multiply(gate, psi);
+      next = dd->multiply(block, psi);
     } catch (const std::exception& e) {
       printCircuit(circuit);
       std::cout << "THE MATRIX  " << std::endl;
-      dd->getVectorizedMatrix(gate);
+      dd->getVectorizedMatrix(block);
       std::cout << "THE VECTOR  " << std::endl;
       dd->printVector(psi);
       std::cerr << "Problem is in multiplication " << e.what() << std::endl;
       throw; // Re-throw the exception to propagate it further
     }
+    dd->incRef(next);
+    dd->decRef(psi);
+    psi = next;
+    dd->garbageCollect();
+    begin = end;
   }
-  return dd->getVector(psi);
+
+  auto result = dd->getVector(psi);
+  dd->decRef(psi);
+  dd->garbageCollect();
+  return result;
+}
+
+CVec ddsimulator(dd::QuantumRegisterCount numLines,
+                 const std::vector<size_t>& dims, const Circuit& circuit,
+                 size_t fusionWidth) {
+  const ddpkg dd = std::make_unique<dd::MDDPackage>(numLines, dims);
+  return simulate(dd, circuit, fusionWidth);
 }
 
-py::list stateVectorSimulation(py::object& circ, py::object& noiseModel) {
+// Simulator keeping its decision diagram package alive across runs, so that
+// unique, compute and identity tables are reused by consecutive circuits on
+// the same register dimensions.
+class Simulator {
+public:
+  explicit Simulator(std::vector<size_t> dims, size_t gateCacheSize)
+      : dimensions(std::move(dims)),
+        dd(std::make_unique<dd::MDDPackage>(dimensions.size(), dimensions)) {
+    dd->resizeGateTable(gateCacheSize);
+  }
+
+  py::array_t<std::complex<double>> run(py::object& circ,
+                                        py::object& noiseModel,
+                                        std::optional<std::uint64_t> seed,
+                                        size_t fusionWidth) {
+    auto parsedCircuitInfo = readCircuit(circ);
+    const auto& dims = std::get<1>(parsedCircuitInfo);
+    if (dims != dimensions) {
+      throw std::invalid_argument(
+          "Circuit dimensions do not match the dimensions of the simulator");
+    }
+
+    py::dict noiseModelDict =
+        noiseModel.attr("quantum_errors").cast<py::dict>();
+    NoiseModel newNoiseModel = parse_noise_model(noiseModelDict);
+    auto gen = noiseGenerator(seed);
+    Circuit noisyCircuit =
+        generateCircuit(parsedCircuitInfo, newNoiseModel, gen);
+
+    CVec state;
+    {
+      // the instructions are plain C++ data, so other Python threads may run
+      py::gil_scoped_release release;
+      state = simulate(dd, noisyCircuit, fusionWidth);
+    }
+    return state_vector_to_array(state, dimensions);
+  }
+
+  bool garbageCollect(bool force) { return dd->garbageCollect(force); }
+
+  void reset() { dd->reset(); }
+
+  py::dict gateCacheStats() const {
+    const auto& table = dd->gateTable;
+    return py::dict("hits"_a = table.getHits(),
+                    "lookups"_a = table.getLookups(),
+                    "hit_ratio"_a = table.hitRatio(),
+                    "evictions"_a = table.getEvictions(),
+                    "size"_a = table.size(),
+                    "capacity"_a = table.getCapacity());
+  }
+
+  [[nodiscard]] const std::vector<size_t>& getDimensions() const {
+    return dimensions;
+  }
+
+private:
+  std::vector<size_t> dimensions;
+  ddpkg dd;
+};
+
+py::array_t<std::complex<double>> stateVectorSimulation(py::object& circ, py::object& noiseModel,
+                                                        std::optional<std::uint64_t> seed,
+                                                        size_t fusionWidth) {
   auto parsedCircuitInfo = readCircuit(circ);
   auto [numQudits, dims, original_circuit] = parsedCircuitInfo;
 
-  Circuit noisyCircuit = original_circuit;
   py::dict noiseModelDict = noiseModel.attr("quantum_errors").cast<py::dict>();
   NoiseModel newNoiseModel = parse_noise_model(noiseModelDict);
-  noisyCircuit = generateCircuit(parsedCircuitInfo, newNoiseModel);
+  auto gen = noiseGenerator(seed);
+  Circuit noisyCircuit =
+      generateCircuit(parsedCircuitInfo, newNoiseModel, gen);
+
+  CVec myList;
+  {
+    py::gil_scoped_release release;
+    myList = ddsimulator(static_cast<dd::QuantumRegisterCount>(numQudits),
+                         static_cast<std::vector<size_t>>(dims), noisyCircuit,
+                         fusionWidth);
+  }
+
+  return state_vector_to_array(myList, dims);
+}
 
-  CVec myList =
-      ddsimulator(static_cast<dd::QuantumRegisterCount>(numQudits),
-                  static_cast<std::vector<size_t>>(dims), noisyCircuit);
+// Squared norm of the amplitudes below `edge`, memoized per node
+double squaredNorm(
+    const dd::MDDPackage::vEdge& edge,
+    std::unordered_map<const dd::MDDPackage::vNode*, double>& norms) {
+  const auto weight = dd::ComplexNumbers::mag2(edge.weight);
+  if (weight == 0. || edge.isTerminal()) {
+    return weight;
+  }
+  auto it = norms.find(edge.nextNode);
+  if (it == norms.end()) {
+    double norm = 0.;
+    for (const auto& child : edge.nextNode->edges) {
+      norm += squaredNorm(child, norms);
+    }
+    it = norms.emplace(edge.nextNode, norm).first;
+  }
+  return weight * it->second;
+}
 
-  py::list result = complex_vector_to_list(myList);
+// Draw a basis state of `psi` by descending the diagram, without building the
+// state vector. The index has the first qudit most significant.
+size_t measure(const dd::MDDPackage::vEdge& psi,
+               const std::vector<size_t>& strides, std::mt19937_64& gen) {
+  std::unordered_map<const dd::MDDPackage::vNode*, double> norms;
+  std::uniform_real_distribution<double> uniform(0., 1.);
+  std::vector<double> probabilities;
+
+  size_t outcome = 0;
+  auto edge = psi;
+  while (!edge.isTerminal()) {
+    const auto& children = edge.nextNode->edges;
+    probabilities.clear();
+    double total = 0.;
+    for (const auto& child : children) {
+      probabilities.push_back(squaredNorm(child, norms));
+      total += probabilities.back();
+    }
 
-  return result;
+    auto threshold = uniform(gen) * total;
+    size_t level = 0;
+    for (size_t i = 0; i < probabilities.size(); ++i) {
+      if (probabilities[i] > 0.) {
+        level = i;
+        if (threshold < probabilities[i]) {
+          break;
+        }
+        threshold -= probabilities[i];
+      }
+    }
+
+    outcome += level * strides.at(static_cast<size_t>(edge.nextNode->varIndx));
+    edge = children[level];
+  }
+  return outcome;
+}
+
+// Insert the nodes of `edge` that are not in `seen` yet into `added`
+void collectNodes(const dd::MDDPackage::vEdge& edge,
+                  const std::unordered_set<const dd::MDDPackage::vNode*>& seen,
+                  std::unordered_set<const dd::MDDPackage::vNode*>& added) {
+  if (edge.isTerminal() || seen.count(edge.nextNode) != 0 ||
+      !added.insert(edge.nextNode).second) {
+    return;
+  }
+  for (const auto& child : edge.nextNode->edges) {
+    collectNodes(child, seen, added);
+  }
+}
+
+struct CheckpointOptions {
+  // number of gates between two stored states, 0 disables checkpointing
+  size_t interval = 0;
+  // upper bound on the memory taken by the nodes of the stored states
+  size_t budget = 0;
+};
+
+// Run the shots handed out by `nextShot` on a package owned by this thread.
+// Gate diagrams are kept in the gate table of the package, every shot draws
+// its noise from a generator seeded by (seed, shot), so outcomes do not depend
+// on the number of threads. The gates are applied in the fused blocks of the
+// noiseless circuit (see fusionBlocks); a block containing gates followed by
+// noise is split after them, and the fused runs between the noise are cached
+// for the next shots. With checkpointing, the noiseless states after the
+// blocks ending at every `interval` gates are stored and each shot resumes
+// from the last one before its first noise gate.
+void noisyShotWorker(const Circuit_info& circuitInfo,
+                     const NoiseModel& noiseModel, std::uint64_t seed,
+                     const CheckpointOptions& checkpointOptions,
+                     size_t fusionWidth, std::atomic<size_t>& nextShot,
+                     std::vector<std::int64_t>& outcomes) {
+  const auto& [numQudits, dims, circuit] = circuitInfo;
+  const ddpkg dd = std::make_unique<dd::MDDPackage>(numQudits, dims);
+  const auto strides = circuit_strides(dims);
+
+  // referenced blocks survive garbage collection, noise gates are taken from
+  // the gate table of the package
+  const auto ends = fusionBlocks(circuit, 0, circuit.size(), fusionWidth);
+  std::vector<dd::MDDPackage::mEdge> blocks;
+  blocks.reserve(ends.size());
+  for (size_t k = 0; k < ends.size(); ++k) {
+    blocks.push_back(blockGate(dd, circuit, k == 0 ? 0 : ends[k - 1], ends[k]));
+    dd->incRef(blocks.back());
+  }
+  dd::GateTable<std::pair<size_t, size_t>, dd::MDDPackage::mEdge> runs;
+
+  dd::MDDPackage::vEdge psi;
+  auto apply = [&dd, &psi](const dd::MDDPackage::mEdge& gate) {
+    auto next = dd->multiply(gate, psi);
+    dd->incRef(next);
+    dd->decRef(psi);
+    psi = next;
+    dd->garbageCollect();
+  };
+  // the gates `begin` to `end` of a block, fused and cached if they are
+  // several
+  auto applyRun = [&](size_t begin, size_t end) {
+    if (end - begin == 1) {
+      apply(getGate(dd, circuit[begin]));
+      return;
+    }
+    const auto key = std::make_pair(begin, end);
+    auto run = runs.lookup(key);
+    if (run.nextNode == nullptr) {
+      run = fuseGates(dd, circuit, begin, end);
+      dd->incRef(run);
+      for (const auto& evicted : runs.insert(key, run)) {
+        dd->decRef(evicted);
+      }
+    }
+    apply(run);
+  };
+
+  // (number of gates applied, referenced state), the zero state always first
+  std::vector<std::pair<size_t, dd::MDDPackage::vEdge>> checkpoints;
+  psi = dd->makeZeroState(static_cast<dd::QuantumRegisterCount>(numQudits));
+  dd->incRef(psi);
+  dd->incRef(psi);
+  checkpoints.emplace_back(0, psi);
+  if (checkpointOptions.interval > 0) {
+    std::unordered_set<const dd::MDDPackage::vNode*> stored;
+    std::unordered_set<const dd::MDDPackage::vNode*> added;
+    for (size_t k = 0; k < ends.size(); ++k) {
+      apply(blocks[k]);
+      const auto begin = k == 0 ? 0 : ends[k - 1];
+      if (ends[k] / checkpointOptions.interval ==
+          begin / checkpointOptions.interval) {
+        continue;
+      }
+      added.clear();
+      collectNodes(psi, stored, added);
+      if ((stored.size() + added.size()) * sizeof(dd::MDDPackage::vNode) >
+          checkpointOptions.budget) {
+        break;
+      }
+      stored.insert(added.begin(), added.end());
+      dd->incRef(psi);
+      checkpoints.emplace_back(ends[k], psi);
+    }
+  }
+  dd->decRef(psi);
+  dd->garbageCollect();
+
+  std::vector<Circuit> drawnNoise(circuit.size());
+  for (size_t shot = nextShot++; shot < outcomes.size(); shot = nextShot++) {
+    std::seed_seq seq{static_cast<std::uint32_t>(seed),
+                      static_cast<std::uint32_t>(seed >> 32U),
+                      static_cast<std::uint32_t>(shot),
+                      static_cast<std::uint32_t>(
+                          static_cast<std::uint64_t>(shot) >> 32U)};
+    std::mt19937_64 gen(seq);
+
+    // the noise of all gates is drawn up front, in the same order as the
+    // gates, so the generator ends up in the same state for the measurement.
+    // The gates before the first one followed by noise are noiseless.
+    size_t noiseless = circuit.size();
+    for (size_t i = 0; i < circuit.size(); ++i) {
+      drawnNoise[i].clear();
+      sampleNoise(circuit[i], numQudits, dims, noiseModel, gen, drawnNoise[i]);
+      if (noiseless == circuit.size() && !drawnNoise[i].empty()) {
+        noiseless = i;
+      }
+    }
+
+    const auto checkpoint =
+        std::prev(std::upper_bound(checkpoints.begin(), checkpoints.end(),
+                                   noiseless, [](size_t gate, const auto& c) {
+                                     return gate < c.first;
+                                   }));
+    psi = checkpoint->second;
+    dd->incRef(psi);
+    // checkpoints are stored at the end of blocks
+    auto k = static_cast<size_t>(
+        std::upper_bound(ends.begin(), ends.end(), checkpoint->first) -
+        ends.begin());
+    for (auto begin = checkpoint->first; k < ends.size(); begin = ends[k++]) {
+      auto runBegin = begin;
+      for (auto i = begin; i < ends[k]; ++i) {
+        if (drawnNoise[i].empty()) {
+          continue;
+        }
+        if (runBegin == begin && i + 1 == ends[k]) {
+          apply(blocks[k]);
+        } else {
+          applyRun(runBegin, i + 1);
+        }
+        runBegin = i + 1;
+        for (const auto& noise : drawnNoise[i]) {
+          apply(getGate(dd, noise));
+        }
+      }
+      if (runBegin == begin) {
+        apply(blocks[k]);
+      } else if (runBegin < ends[k]) {
+        applyRun(runBegin, ends[k]);
+      }
+    }
+
+    outcomes[shot] = static_cast<std::int64_t>(measure(psi, strides, gen));
+    dd->decRef(psi);
+    dd->garbageCollect();
+  }
+}
+
+py::array_t<std::int64_t> sampleNoisy(py::object& circ, py::object& noiseModel,
+                                      size_t shots,
+                                      std::optional<std::uint64_t> seed,
+                                      size_t threads,
+                                      size_t checkpointInterval,
+                                      size_t checkpointMemory,
+                                      size_t fusionWidth) {
+  const auto circuitInfo = readCircuit(circ);
+  py::dict noiseModelDict = noiseModel.attr("quantum_errors").cast<py::dict>();
+  const NoiseModel parsedNoiseModel = parse_noise_model(noiseModelDict);
+
+  if (!seed.has_value()) {
+    std::random_device rd;
+    seed = (static_cast<std::uint64_t>(rd()) << 32U) | rd();
+  }
+  if (threads == 0) {
+    threads = std::max(1U, std::thread::hardware_concurrency());
+  }
+  threads = std::max<size_t>(1, std::min(threads, shots));
+
+  const CheckpointOptions checkpointOptions{checkpointInterval,
+                                            checkpointMemory};
+
+  std::vector<std::int64_t> outcomes(shots);
+  {
+    py::gil_scoped_release release;
+    std::atomic<size_t> nextShot{0};
+    std::vector<std::exception_ptr> errors(threads);
+    std::vector<std::thread> workers;
+    workers.reserve(threads);
+    for (size_t t = 0; t < threads; ++t) {
+      workers.emplace_back([&, t]() {
+        try {
+          noisyShotWorker(circuitInfo, parsedNoiseModel, *seed,
+                          checkpointOptions, fusionWidth, nextShot, outcomes);
+        } catch (...) {
+          errors[t] = std::current_exception();
+          // stop handing out shots to the other workers
+          nextShot = shots;
+        }
+      });
+    }
+    for (auto& worker : workers) {
+      worker.join();
+    }
+    for (const auto& error : errors) {
+      if (error) {
+        std::rethrow_exception(error);
+      }
+    }
+  }
+
+  return vector_to_array(std::move(outcomes));
 }
 
 PYBIND11_MODULE(_qudits, m) {
   auto misim = m.def_submodule("misim");
   misim.def("state_vector_simulation", &stateVectorSimulation, "circuit"_a,
-            "noise_model"_a);
+            "noise_model"_a, "seed"_a = py::none(),
+            "fusion_width"_a = DEFAULT_FUSION_WIDTH);
+
+  py::class_<Simulator>(misim, "Simulator")
+      .def(py::init<std::vector<size_t>, size_t>(), "dimensions"_a,
+           "gate_cache_size"_a = dd::GateTable<dd::MDDPackage::GateKey,
+                                               dd::MDDPackage::mEdge>::
+               DEFAULT_CAPACITY)
+      .def("run", &Simulator::run, "circuit"_a, "noise_model"_a,
+           "seed"_a = py::none(), "fusion_width"_a = DEFAULT_FUSION_WIDTH)
+      .def("garbage_collect", &Simulator::garbageCollect, "force"_a = false)
+      .def("reset", &Simulator::reset)
+      .def("gate_cache_stats", &Simulator::gateCacheStats)
+      .def_property_readonly("dimensions", &Simulator::getDimensions);
+
+  misim.def("sample_noisy", &sampleNoisy, "circuit"_a, "noise_model"_a,
+            "shots"_a, "seed"_a = py::none(), "threads"_a = 0,
+            "checkpoint_interval"_a = 0,
+            "checkpoint_memory"_a = 256U * 1024U * 1024U,
+            "fusion_width"_a = DEFAULT_FUSION_WIDTH);
 }
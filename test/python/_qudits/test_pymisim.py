@@ -4,10 +4,14 @@ import typing
 from unittest import TestCase
 
 import numpy as np
+import pytest
 
-from mqt.qudits._qudits.misim import state_vector_simulation  # noqa: PLC2701
+from mqt.qudits._qudits.misim import Simulator, sample_noisy, state_vector_simulation  # noqa: PLC2701
+from mqt.qudits.compiler import QuditCompiler
 from mqt.qudits.quantum_circuit import QuantumCircuit
+from mqt.qudits.quantum_circuit.components.extensions.controls import ControlData
 from mqt.qudits.quantum_circuit.components.quantum_register import QuantumRegister
+from mqt.qudits.simulation import MQTQuditProvider
 from mqt.qudits.simulation.noise_tools import Noise, NoiseModel
 
 if typing.TYPE_CHECKING:
@@ -53,7 +57,7 @@ class Testpymisim(TestCase):
     def test_state_vector_simulation():
         qreg_example = QuantumRegister("reg", 6, 6 * [5])
         circ = QuantumCircuit(qreg_example)
-        for _i in range(300):
+        for _i in range(30):
             circ.rz(rand_0_5(), [0, 2, np.pi / 13])
             circ.x(rand_0_5()).dag()
             circ.s(rand_0_5())
@@ -113,3 +117,220 @@ class Testpymisim(TestCase):
         state_vec = np.array(state_vector_simulation(circ, noise_model))
         assert len(state_vec) == 5**6
         assert is_quantum_state(state_vec)
+
+        # a seeded noise draw is reproducible and the same as the one of a simulator run
+        seeded = state_vector_simulation(circ, noise_model, seed=11)
+        assert np.array_equal(state_vector_simulation(circ, noise_model, seed=11), seeded)
+        assert np.allclose(Simulator(circ.dimensions).run(circ, noise_model, seed=11), seeded)
+
+    @staticmethod
+    def test_simulator_reuses_package():
+        noise_model = NoiseModel()
+        simulator = Simulator([3, 4, 2])
+        assert simulator.dimensions == [3, 4, 2]
+
+        for _ in range(5):
+            circ = QuantumCircuit(QuantumRegister("reg", 3, [3, 4, 2]))
+            for _i in range(20):
+                circ.h(int(np.random.default_rng().integers(0, 3)))
+                circ.rz(1, [0, 2, np.pi / 7])
+                circ.csum([0, 1])
+                circ.cx([2, 0], [0, 1, 1, np.pi / 3])
+            reference = state_vector_simulation(circ, noise_model)
+            assert np.allclose(simulator.run(circ, noise_model), reference)
+            simulator.garbage_collect(force=True)
+            assert np.allclose(simulator.run(circ, noise_model), reference)
+            simulator.reset()
+            assert np.allclose(simulator.run(circ, noise_model), reference)
+
+        other = QuantumCircuit(QuantumRegister("reg", 2, [3, 3]))
+        other.h(0)
+        with pytest.raises(ValueError, match="dimensions"):
+            simulator.run(other, noise_model)
+
+    @staticmethod
+    def test_gate_cache():
+        circ = QuantumCircuit(QuantumRegister("reg", 3, [3, 4, 2]))
+        for _ in range(10):
+            circ.r(1, [0, 3, np.pi, np.pi / 2])
+            circ.virtrz(0, [1, np.pi / 4])
+            circ.rz(2, [0, 1, 0.3]).control([0], [2])
+            circ.csum([0, 1])
+        reference = state_vector_simulation(circ, NoiseModel())
+
+        simulator = Simulator([3, 4, 2])
+        assert np.allclose(simulator.run(circ, NoiseModel()), reference)
+        stats = simulator.gate_cache_stats()
+        assert stats["lookups"] == 40
+        assert stats["hits"] == 36
+        assert stats["size"] == 4
+        assert stats["capacity"] == 4096
+        assert np.isclose(stats["hit_ratio"], 0.9)
+
+        # cached gates survive garbage collection
+        simulator.garbage_collect(force=True)
+        assert np.allclose(simulator.run(circ, NoiseModel()), reference)
+        assert simulator.gate_cache_stats()["hits"] == 76
+
+        # the least recently used gates are evicted beyond the capacity
+        small = Simulator([3, 4, 2], gate_cache_size=2)
+        assert np.allclose(small.run(circ, NoiseModel()), reference)
+        stats = small.gate_cache_stats()
+        assert stats["hits"] == 0
+        assert stats["size"] == 2
+        assert stats["evictions"] == 38
+        small.reset()
+        assert small.gate_cache_stats()["size"] == 0
+
+    @staticmethod
+    def test_any_dimension_and_custom_gates():
+        rng = np.random.default_rng(3)
+        circ = QuantumCircuit(QuantumRegister("reg", 3, [11, 2, 8]))
+        for qudit in range(3):
+            circ.h(qudit)
+        circ.r(0, [2, 9, 0.4, 1.1])
+        circ.rz(2, [1, 6, 0.8])
+        circ.rh(0, [3, 10])
+        circ.virtrz(2, [5, 0.3])
+        circ.x(0).dag()
+        circ.s(0)
+        circ.s(1)
+        circ.z(2)
+        circ.csum([0, 2])
+        circ.cx([2, 0], [1, 7, 5, 0.6])
+        circ.csum([1, 0]).dag()
+        unitary = np.linalg.qr(rng.normal(size=(8, 8)) + 1j * rng.normal(size=(8, 8)))[0]
+        circ.cu_one(2, unitary)
+        circ.cu_one(0, np.linalg.qr(rng.normal(size=(11, 11)) + 1j * rng.normal(size=(11, 11)))[0]).dag()
+
+        expected = MQTQuditProvider().get_backend("dsvsim").execute(circ).ravel()
+        assert np.allclose(state_vector_simulation(circ, NoiseModel()), expected)
+
+        circ.noisex(2, [0, 1])
+        with pytest.raises(ValueError, match="not supported"):
+            state_vector_simulation(circ, NoiseModel())
+
+    @staticmethod
+    def test_control_on_second_target_is_rejected():
+        circ = QuantumCircuit(QuantumRegister("reg", 3, [3, 3, 2]))
+        gate = circ.csum([0, 1])
+        # the circuit API refuses such controls already, the simulator checks them on its own
+        gate._controls_data = ControlData([1], [2])  # noqa: SLF001
+        with pytest.raises(ValueError, match="invalid control"):
+            state_vector_simulation(circ, NoiseModel())
+
+    @staticmethod
+    def test_dense_multi_qudit_gates():
+        rng = np.random.default_rng(5)
+
+        def unitary(size: int) -> NDArray[np.complex128]:
+            return np.linalg.qr(rng.normal(size=(size, size)) + 1j * rng.normal(size=(size, size)))[0]
+
+        circ = QuantumCircuit(QuantumRegister("reg", 4, [3, 2, 5, 3]))
+        for qudit in range(4):
+            circ.h(qudit)
+        circ.ms([0, 3], [0.7])
+        circ.ms([1, 2], [1.3]).dag()
+        circ.ls([3, 0], [0.4])
+        circ.cu_two([2, 0], unitary(15))
+        circ.cu_two([0, 1], unitary(6)).dag()
+        circ.cu_multi([3, 1, 2], unitary(30))
+        circ.pm(2, [3, 0, 4, 1, 2])
+
+        expected = MQTQuditProvider().get_backend("dsvsim").execute(circ).ravel()
+        assert np.allclose(state_vector_simulation(circ, NoiseModel()), expected)
+
+        # random unitaries are drawn anew with every matrix, so only the norm can be compared
+        circ.randu([1, 3])
+        circ.randu([0, 1, 2, 3])
+        assert np.isclose(np.linalg.norm(state_vector_simulation(circ, NoiseModel())), 1)
+
+    @staticmethod
+    def test_gate_fusion():
+        rng = np.random.default_rng(8)
+        circ = QuantumCircuit(QuantumRegister("reg", 4, [3, 4, 2, 3]))
+        for qudit in range(4):
+            circ.h(qudit)
+        for _ in range(3):
+            circ.r(0, [2, 0, *rng.uniform(0, np.pi, 2)])
+            circ.rz(1, [1, 3, rng.uniform(0, np.pi)])
+            circ.csum([0, 1])
+            circ.r(2, [0, 1, *rng.uniform(0, np.pi, 2)]).control([3], [1])
+            circ.cx([3, 0], [0, 2, 1, rng.uniform(0, np.pi)])
+            circ.virtrz(1, [2, rng.uniform(0, np.pi)])
+            circ.rh(3, [1, 2]).dag()
+        circ.cu_two([0, 2], np.linalg.qr(rng.normal(size=(6, 6)) + 1j * rng.normal(size=(6, 6)))[0])
+        circ.ms([1, 3], [0.7])
+
+        expected = MQTQuditProvider().get_backend("dsvsim").execute(circ).ravel()
+        for width in range(5):
+            assert np.allclose(state_vector_simulation(circ, NoiseModel(), fusion_width=width), expected)
+            assert np.allclose(Simulator([3, 4, 2, 3]).run(circ, NoiseModel(), fusion_width=width), expected)
+
+        # compiled circuits are long runs of rotations on single qudits
+        backend = MQTQuditProvider().get_backend("faketraps2trits")
+        compiled = QuantumCircuit(QuantumRegister("reg", 2, [3, 3]))
+        for _ in range(4):
+            for qudit in range(2):
+                compiled.r(qudit, [0, int(rng.integers(1, 3)), *rng.uniform(0, np.pi, 2)])
+            compiled.csum([0, 1])
+        compiled = QuditCompiler().compile(backend, compiled, ["PhyLocQRPass", "PhyEntQRCEXPass"])
+        reference = state_vector_simulation(compiled, NoiseModel(), fusion_width=0)
+        for width in (1, 2):
+            assert np.allclose(state_vector_simulation(compiled, NoiseModel(), fusion_width=width), reference)
+
+    @staticmethod
+    def test_sample_noisy():
+        circ = QuantumCircuit(QuantumRegister("reg", 3, [3, 4, 2]))
+        circ.h(0)
+        circ.h(1)
+        circ.rz(1, [0, 2, 0.3])
+        circ.csum([0, 1])
+        circ.cx([1, 2], [0, 1, 1, np.pi / 2])
+        circ.h(2)
+
+        # without noise the outcomes follow the exact distribution
+        probabilities = np.abs(state_vector_simulation(circ, NoiseModel())) ** 2
+        outcomes = sample_noisy(circ, NoiseModel(), 100000, seed=3)
+        frequencies = np.bincount(outcomes, minlength=probabilities.size) / outcomes.size
+        assert np.allclose(frequencies, probabilities, atol=0.01)
+
+        # seeded runs do not depend on the number of threads
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.1, probability_dephasing=0.1), ["h"])
+        noise_model.add_nonlocal_quantum_error(
+            Noise(probability_depolarizing=0.1, probability_dephasing=0.1), ["csum", "cx"]
+        )
+        single = sample_noisy(circ, noise_model, 500, seed=11, threads=1)
+        multi = sample_noisy(circ, noise_model, 500, seed=11, threads=4)
+        assert single.shape == (500,)
+        assert np.array_equal(single, multi)
+
+    @staticmethod
+    def test_sample_noisy_with_checkpoints():
+        circ = QuantumCircuit(QuantumRegister("reg", 2, [3, 4]))
+        for _ in range(4):
+            circ.h(0)
+            circ.csum([0, 1])
+            circ.x(1)
+
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.05, probability_dephasing=0.05), ["h"])
+        noise_model.add_nonlocal_quantum_error(
+            Noise(probability_depolarizing=0.05, probability_dephasing=0.05), ["csum"]
+        )
+
+        # resuming from stored prefix states does not change the outcomes of a seeded run
+        reference = sample_noisy(circ, noise_model, 300, seed=5, threads=2)
+        for interval in (1, 2, 5, 100):
+            outcomes = sample_noisy(circ, noise_model, 300, seed=5, threads=2, checkpoint_interval=interval)
+            assert np.array_equal(outcomes, reference)
+        outcomes = sample_noisy(circ, noise_model, 300, seed=5, checkpoint_interval=1, checkpoint_memory=0)
+        assert np.array_equal(outcomes, reference)
+
+        # fused blocks are split after the gates followed by noise
+        for width in (1, 2):
+            outcomes = sample_noisy(circ, noise_model, 300, seed=5, threads=2, fusion_width=width)
+            assert np.array_equal(outcomes, reference)
+            outcomes = sample_noisy(circ, noise_model, 300, seed=5, checkpoint_interval=2, fusion_width=width)
+            assert np.array_equal(outcomes, reference)
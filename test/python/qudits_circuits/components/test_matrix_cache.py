@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+import numpy as np
+
+from mqt.qudits.quantum_circuit import QuantumCircuit
+from mqt.qudits.quantum_circuit.components.extensions.controls import ControlData
+from mqt.qudits.quantum_circuit.components.extensions.matrix_cache import gate_matrix_cache
+from mqt.qudits.quantum_circuit.components.extensions.matrix_factory import MatrixFactory
+from mqt.qudits.quantum_circuit.components.quantum_register import QuantumRegister
+
+
+class TestGateMatrixCache(TestCase):
+    def setUp(self):
+        gate_matrix_cache.clear()
+        gate_matrix_cache.configure(maxsize=1024, enabled=True)
+
+    def tearDown(self):
+        gate_matrix_cache.clear()
+        gate_matrix_cache.configure(maxsize=1024, enabled=True)
+
+    @staticmethod
+    def test_identical_gates_hit():
+        circuit = QuantumCircuit(QuantumRegister("reg", 3, [3, 4, 3]))
+        first = circuit.r(0, [0, 2, np.pi, -np.pi / 2]).to_matrix()
+        misses = gate_matrix_cache.info().misses
+        second = circuit.r(2, [0, 2, np.pi, -np.pi / 2]).to_matrix()
+
+        info = gate_matrix_cache.info()
+        assert info.misses == misses
+        assert info.hits >= 1
+        assert np.array_equal(first, second)
+        assert first is not second
+
+    @staticmethod
+    def test_key_distinguishes_gates():
+        circuit = QuantumCircuit(QuantumRegister("reg", 3, [3, 3, 3]))
+        r = circuit.r(0, [0, 1, np.pi / 3, 0.0])
+        checks = [
+            (r, 0),
+            (circuit.r(0, [0, 1, np.pi / 3, 0.1]), 0),
+            (circuit.r(0, [0, 2, np.pi / 3, 0.0]), 0),
+            (circuit.r(1, [0, 1, np.pi / 3, 0.0]).dag(), 0),
+            (circuit.r(1, [0, 1, np.pi / 3, 0.0]), 2),
+            (circuit.r(2, [0, 1, np.pi / 3, 0.0]), 2),
+            (circuit.r(2, [0, 1, np.pi / 3, 0.0], ControlData([0], [1])), 1),
+            (circuit.r(2, [0, 1, np.pi / 3, 0.0], ControlData([0], [2])), 1),
+            (circuit.cx([0, 1]), 0),
+            (circuit.cx([1, 0]), 0),
+        ]
+        for gate, identities in checks:
+            gate_matrix_cache.configure(enabled=False)
+            reference = gate.to_matrix(identities)
+            gate_matrix_cache.configure(enabled=True)
+            assert np.allclose(gate.to_matrix(identities), reference)
+            assert np.allclose(MatrixFactory(gate, identities).generate_matrix(), reference)
+        assert gate_matrix_cache.info().currsize >= len(checks)
+
+    @staticmethod
+    def test_returned_matrices_are_private():
+        circuit = QuantumCircuit(QuantumRegister("reg", 1, [3]))
+        matrix = circuit.h(0).to_matrix()
+        matrix[:] = 0
+        assert not np.allclose(circuit.h(0).to_matrix(), 0)
+
+    @staticmethod
+    def test_bounded_and_disabled():
+        gate_matrix_cache.configure(maxsize=2)
+        circuit = QuantumCircuit(QuantumRegister("reg", 1, [5]))
+        for level in range(1, 5):
+            circuit.virtrz(0, [level, np.pi / 7]).to_matrix()
+        assert gate_matrix_cache.info().currsize == 2
+
+        gate_matrix_cache.clear()
+        gate_matrix_cache.configure(enabled=False)
+        circuit.x(0).to_matrix()
+        circuit.x(0).to_matrix()
+        info = gate_matrix_cache.info()
+        assert (info.hits, info.misses, info.currsize) == (0, 0, 0)
+
+    @staticmethod
+    def test_random_unitaries_are_not_cached():
+        circuit = QuantumCircuit(QuantumRegister("reg", 2, [2, 3]))
+        gate = circuit.randu([0, 1])
+        assert not np.allclose(gate.to_matrix(), gate.to_matrix())
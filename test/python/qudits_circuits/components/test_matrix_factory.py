@@ -1,12 +1,109 @@
 from __future__ import annotations
 
+import itertools
+import operator
+from functools import reduce
+from typing import TYPE_CHECKING
 from unittest import TestCase
 
 import numpy as np
 
 from mqt.qudits.quantum_circuit import QuantumCircuit
+from mqt.qudits.quantum_circuit.components.extensions.matrix_factory import MatrixFactory
 from mqt.qudits.quantum_circuit.components.quantum_register import QuantumRegister
 
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+
+def apply_identities_and_controls_loop(
+    matrix: NDArray[np.complex128],
+    qudits_applied: int | list[int],
+    dimensions: int | list[int],
+    ref_lines: list[int],
+    controls: list[int] | None = None,
+    controls_levels: list[int] | None = None,
+) -> NDArray[np.complex128]:
+    """Entry-by-entry reference implementation of :meth:`MatrixFactory.apply_identities_and_controls`."""
+    qudits_applied = [qudits_applied] if isinstance(qudits_applied, int) else qudits_applied
+    qudits_applied = qudits_applied.copy()
+    qudits_applied.sort()
+    slide_indices_qudits_a = [q - min(ref_lines) for q in qudits_applied]
+
+    dimensions = [dimensions] if isinstance(dimensions, int) else dimensions
+    if len(dimensions) == 0:
+        msg = "Dimensions cannot be an empty list"
+        raise ValueError(msg)
+    if len(qudits_applied) == len(ref_lines) and controls is None:
+        return matrix
+
+    if controls is not None:
+        slide_controls = [q - min(ref_lines) for q in controls]
+        rest_of_indices = set(ref_lines) - set(qudits_applied) - set(controls)
+    else:
+        rest_of_indices = set(ref_lines) - set(qudits_applied)
+    slide_indices_rest = [q - min(ref_lines) for q in rest_of_indices]
+
+    single_site_logics = (
+        [list(range(dimensions[slide_indices_qudits_a[0]]))]
+        if len(qudits_applied) == 1
+        else [list(range(d)) for d in operator.itemgetter(*slide_indices_qudits_a)(dimensions)]
+    )
+
+    og_states_space = [list(element) for element in itertools.product(*single_site_logics)]
+
+    og_state_to_index = {tuple(state): i for i, state in enumerate(og_states_space)}
+
+    global_single_site_logics = [list(range(d)) for d in dimensions]
+    global_states_space = [list(element) for element in itertools.product(*global_single_site_logics)]
+    global_index_to_state = dict(enumerate(global_states_space))
+
+    result = np.identity(reduce(operator.mul, dimensions, 1), dtype="complex")
+
+    for r in range(result.shape[0]):
+        for c in range(result.shape[1]):
+            if controls is not None:
+                extract_r = operator.itemgetter(*slide_controls)(global_index_to_state[r])
+                extract_c = operator.itemgetter(*slide_controls)(global_index_to_state[c])
+                if isinstance(extract_r, int):
+                    extract_r = [extract_r]
+                    extract_c = [extract_c]
+                if (
+                    list(extract_r) == controls_levels
+                    and extract_r == extract_c
+                    and (
+                        not rest_of_indices
+                        or operator.itemgetter(*slide_indices_rest)(global_index_to_state[r])
+                        == operator.itemgetter(*slide_indices_rest)(global_index_to_state[c])
+                    )
+                ):
+                    og_row_key = operator.itemgetter(*slide_indices_qudits_a)(global_index_to_state[r])
+                    og_col_key = operator.itemgetter(*slide_indices_qudits_a)(global_index_to_state[c])
+                    if isinstance(og_row_key, int):
+                        og_row_key = (og_row_key,)
+                    if isinstance(og_col_key, int):
+                        og_col_key = (og_col_key,)
+                    matrix_row = og_state_to_index[tuple(og_row_key)]
+                    matrix_col = og_state_to_index[tuple(og_col_key)]
+                    value = matrix[matrix_row, matrix_col]
+                    result[r, c] = value
+
+            elif not rest_of_indices or operator.itemgetter(*slide_indices_rest)(
+                global_index_to_state[r]
+            ) == operator.itemgetter(*slide_indices_rest)(global_index_to_state[c]):
+                og_row_key = operator.itemgetter(*slide_indices_qudits_a)(global_index_to_state[r])
+                og_col_key = operator.itemgetter(*slide_indices_qudits_a)(global_index_to_state[c])
+                if isinstance(og_row_key, int):
+                    og_row_key = (og_row_key,)
+                if isinstance(og_col_key, int):
+                    og_col_key = (og_col_key,)
+                matrix_row = og_state_to_index[tuple(og_row_key)]
+                matrix_col = og_state_to_index[tuple(og_col_key)]
+                value = matrix[matrix_row, matrix_col]
+                result[r, c] = value
+
+    return result
+
 
 class TestMatrixFactory(TestCase):
     @staticmethod
@@ -1233,3 +1330,32 @@ class TestMatrixFactory(TestCase):
             ],
         ])
         assert np.allclose(mcx_inv, mcx_qiskit_inv)
+
+    @staticmethod
+    def test_apply_identities_and_controls_matches_loop():
+        rng = np.random.default_rng(42)
+        for _ in range(100):
+            span = int(rng.integers(1, 5))
+            offset = int(rng.integers(0, 3))
+            dimensions = [int(d) for d in rng.integers(2, 5, size=span)]
+            lines = list(range(offset, offset + span))
+            shuffled = [int(q) for q in rng.permutation(lines)]
+            num_targets = int(rng.integers(1, span + 1))
+            targets, spectators = shuffled[:num_targets], shuffled[num_targets:]
+            controls = spectators[: int(rng.integers(0, len(spectators) + 1))] or None
+            levels = [int(rng.integers(0, dimensions[c - offset])) for c in controls] if controls else None
+            size = int(np.prod([dimensions[t - offset] for t in targets]))
+            matrix = rng.normal(size=(size, size)) + 1j * rng.normal(size=(size, size))
+
+            fast = MatrixFactory.apply_identities_and_controls(matrix, targets, dimensions, lines, controls, levels)
+            loop = apply_identities_and_controls_loop(matrix, targets, dimensions, lines, controls, levels)
+            assert np.array_equal(fast, loop)
+
+    @staticmethod
+    def test_controlled_gate_away_from_first_line():
+        circuit = QuantumCircuit(QuantumRegister("reg", 4, [2, 3, 4, 2]))
+        matrix = circuit.x(3).control([2], [1]).to_matrix(identities=1)
+
+        expected = np.identity(8, dtype=complex)
+        expected[2:4, 2:4] = circuit.x(3).to_matrix()
+        assert np.allclose(matrix, expected)
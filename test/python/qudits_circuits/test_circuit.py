@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import tempfile
 from unittest import TestCase
 
 import numpy as np
 
-from mqt.qudits.quantum_circuit import QuantumCircuit, QuantumRegister
+from mqt.qudits.exceptions import CircuitError
+from mqt.qudits.quantum_circuit import QuantumCircuit, QuantumRegister, Symbol
 from mqt.qudits.quantum_circuit.components import ClassicRegister
 
 
@@ -41,10 +43,40 @@ class TestQuantumCircuit(TestCase):
         circ.cu_two([qreg_field[0], qreg_matter[1]], np.identity(7 * 2))
         circ.cu_multi([qreg_field[0], qreg_matter[1], qreg_matter[0]], np.identity(7 * 2 * 2))
 
-        file = circ.save_to_file(file_name="test")
-        circ.to_qasm()
-        circ_new = QuantumCircuit()
-        circ_new.load_from_file(file)
+        # the program and the matrices of its custom gates are written next to each other
+        with tempfile.TemporaryDirectory() as directory:
+            file = circ.save_to_file(file_name="test", file_path=directory)
+            circ.to_qasm()
+            circ_new = QuantumCircuit()
+            circ_new.load_from_file(file)
+
+    def test_bind_parameters(self):
+        theta, phi = Symbol("theta"), Symbol("phi")
+        circ = QuantumCircuit(QuantumRegister("reg", 2, [3, 3]))
+        circ.h(0)
+        circ.r(0, [0, 2, theta, phi])
+        circ.ms([0, 1], [theta])
+        circ.virtrz(1, [1, phi])
+        assert circ.parameters == [theta, phi]
+        with self.assertRaises(CircuitError):
+            circ.instructions[1].to_matrix()
+
+        bound = circ.bind_parameters([0.3, 1.2])
+        assert bound.parameters == []
+        assert bound.instructions[0] is circ.instructions[0]
+        assert bound.instructions[1].control_info["params"] == [0, 2, 0.3, 1.2]
+        assert bound.instructions[3].parent_circuit is bound
+        assert circ.parameters == [theta, phi]
+
+        expected = QuantumCircuit(QuantumRegister("reg", 2, [3, 3]))
+        expected.h(0)
+        expected.r(0, [0, 2, 0.3, 1.2])
+        expected.ms([0, 1], [0.3])
+        expected.virtrz(1, [1, 1.2])
+        assert np.allclose(bound.simulate(), expected.simulate())
+        assert np.allclose(circ.bind_parameters({theta: 0.3, phi: 1.2}).simulate(), expected.simulate())
+        with self.assertRaises(ValueError):
+            circ.bind_parameters([0.3])
 
     def test_simulate(self):
         pass
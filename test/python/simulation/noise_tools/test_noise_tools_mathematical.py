@@ -115,6 +115,26 @@ class TestNoisyCircuitFactory(TestCase):
         for tag in [i.qasm_tag for i in new_circ.instructions]:
             assert tag in {"x", "z", "virtrz"}
 
+    def test_draw_and_build_realizations(self):
+        circ = QuantumCircuit(QuantumRegister("reg", 3, [3, 4, 5]))
+        circ.h(0)
+        circ.csum([0, 1])
+        circ.x(2)
+
+        factory = NoisyCircuitFactory(self.noise_model, circ)
+        realization = factory.draw_noise(np.random.default_rng(3))
+        assert realization == factory.draw_noise(np.random.default_rng(3))
+        assert len({realization, factory.draw_noise(np.random.default_rng(3))}) == 1
+
+        built = factory.build_circuit(realization)
+        generated = factory.generate_circuit(np.random.default_rng(3))
+        assert [(i.qasm_tag, i.target_qudits) for i in built.instructions] == [
+            (i.qasm_tag, i.target_qudits) for i in generated.instructions
+        ]
+        for built_gate, generated_gate in zip(built.instructions, generated.instructions):
+            assert np.allclose(built_gate.to_matrix(), generated_gate.to_matrix())
+        assert built.number_gates == generated.number_gates
+
     @staticmethod
     def test_error():
         noise_model = NoiseModel()
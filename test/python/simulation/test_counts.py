@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+import numpy as np
+import pytest
+
+from mqt.qudits.quantum_circuit import QuantumCircuit
+from mqt.qudits.quantum_circuit.components.quantum_register import QuantumRegister
+from mqt.qudits.simulation import MQTQuditProvider
+from mqt.qudits.simulation.jobs import Counts
+from mqt.qudits.simulation.noise_tools import Noise, NoiseModel
+
+
+class TestCounts(TestCase):
+    def test_histogram(self):
+        counts = Counts.from_outcomes([5, 1, 5, 11, 5, 1], [3, 4])
+        assert counts.shots == 6
+        assert len(counts) == 3
+        assert list(counts) == [1, 5, 11]
+        assert counts[5] == 3
+        assert counts.get(2, 0) == 0
+        with self.assertRaises(KeyError):
+            _ = counts[2]
+        assert counts.to_dict() == {1: 2, 5: 3, 11: 1}
+        assert counts.to_dict(labels=True) == {"01": 2, "11": 3, "23": 1}
+        assert np.array_equal(counts.to_array(), np.bincount([5, 1, 5, 11, 5, 1], minlength=12))
+
+        # outcome 5 is levels (1, 1), outcome 11 is levels (2, 3)
+        assert counts.marginal([0]).to_dict() == {0: 2, 1: 3, 2: 1}
+        assert counts.marginal([1, 0]).to_dict() == {3: 2, 4: 3, 11: 1}
+
+        counts.merge(Counts.from_outcomes([0, 5], [3, 4]))
+        assert counts.to_dict() == {0: 1, 1: 2, 5: 4, 11: 1}
+        counts.update([11, 2], [3, 1])
+        assert counts.to_dict() == {0: 1, 1: 2, 2: 1, 5: 4, 11: 4}
+        assert counts == Counts([3, 4], [0, 1, 2, 5, 11], [1, 2, 1, 4, 4])
+
+    @staticmethod
+    def test_large_registers():
+        # 3**50 basis states do not fit into a 64-bit index
+        dimensions = [3] * 50
+        outcome = 3**50 - 1
+        counts = Counts.from_outcomes([outcome, 0, outcome], dimensions)
+        assert counts[outcome] == 2
+        assert counts.labels() == ["0" * 50, "2" * 50]
+        assert counts.marginal([49]).to_dict() == {0: 1, 2: 2}
+        assert Counts.from_outcomes([0, 12], [13, 2]).labels() == ["0,0", "6,0"]
+
+    @staticmethod
+    def test_memory():
+        provider = MQTQuditProvider()
+        circuit = QuantumCircuit(QuantumRegister("reg", 2, [3, 3]))
+        circuit.h(0)
+        circuit.csum([0, 1])
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.1, probability_dephasing=0.1), ["h"])
+
+        backend = provider.get_backend("tnsim")
+        result = backend.run(circuit, noise_model=noise_model, shots=60, seed=5, memory=True).result()
+        memory = result.get_memory()
+        assert len(memory) == 60
+        assert result.get_histogram() == Counts.from_outcomes(memory, [3, 3])
+        assert result.get_counts() == list(memory)
+
+        backend = provider.get_backend("tnsim")
+        result = backend.run(circuit, noise_model=noise_model, shots=60, seed=5).result()
+        assert result.get_histogram() == Counts.from_outcomes(memory, [3, 3])
+        # without memory the per-shot outcomes are expanded from the histogram
+        assert result.get_counts() == sorted(memory)
+        with pytest.raises(ValueError, match="memory"):
+            result.get_memory()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from unittest import TestCase, mock
+
+import numpy as np
+
+from mqt.qudits.quantum_circuit import QuantumCircuit
+from mqt.qudits.quantum_circuit.components.quantum_register import QuantumRegister
+from mqt.qudits.simulation import MQTQuditProvider
+from mqt.qudits.simulation.backends import DMSim
+from mqt.qudits.simulation.noise_tools import Noise, NoiseModel, NoisyCircuitFactory
+from mqt.qudits.simulation.noise_tools.noise import SubspaceNoise
+
+
+class TestDMSim(TestCase):
+    @staticmethod
+    def test_noiseless_matches_dsvsim():
+        rng = np.random.default_rng(0)
+        provider = MQTQuditProvider()
+
+        dimensions = [3, 2, 4]
+        circuit = QuantumCircuit(QuantumRegister("reg", len(dimensions), dimensions))
+        for _ in range(4):
+            for qudit in range(len(dimensions)):
+                circuit.h(qudit)
+            first, second = (int(q) for q in rng.choice(len(dimensions), 2, replace=False))
+            circuit.csum([first, second])
+            circuit.rz(first, [0, 1, rng.uniform(0, 2 * np.pi)])
+        circuit.x(0).control([1, 2], [1, 0])
+
+        state = provider.get_backend("dsvsim").execute(circuit).ravel()
+        result = provider.get_backend("dmsim").run(circuit).result()
+        assert np.allclose(result.get_density_matrix(), np.outer(state, state.conj()))
+        assert np.allclose(result.get_probabilities(), np.abs(state) ** 2)
+        assert result.get_histogram().shots == 0
+
+    @staticmethod
+    def test_depolarizing_channel():
+        circuit = QuantumCircuit(QuantumRegister("reg", 1, [3]))
+        circuit.h(0)
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.3, probability_dephasing=0.0), ["h"])
+
+        state = np.full(3, 1 / np.sqrt(3))
+        expected = 0.7 * np.outer(state, state) + 0.3 * np.identity(3) / 3
+        density_matrix = MQTQuditProvider().get_backend("dmsim").execute(circuit, noise_model)
+        assert np.allclose(density_matrix, expected)
+
+    @staticmethod
+    def test_matches_average_of_trajectories():
+        provider = MQTQuditProvider()
+        dsvsim = provider.get_backend("dsvsim")
+
+        circuit = QuantumCircuit(QuantumRegister("reg", 3, [3, 4, 3]))
+        circuit.h(0)
+        circuit.csum([0, 1])
+        circuit.r(1, [1, 2, 0.4, 0.3])
+        circuit.cx([1, 2], [0, 1, 1, 0.5])
+        circuit.h(2)
+
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(SubspaceNoise(0.2, 0.1, [(0, 1), (1, 2)]), ["h"])
+        noise_model.add_quantum_error_locally(SubspaceNoise(0.2, 0.2, []), ["rxy"])
+        noise_model.add_nonlocal_quantum_error(Noise(probability_depolarizing=0.2, probability_dephasing=0.0), ["csum"])
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.1, probability_dephasing=0.0), ["cx"])
+        noise_model.add_nonlocal_quantum_error_on_control(SubspaceNoise(0.1, 0.1, (0, 2)), ["cx"])
+        noise_model.add_nonlocal_quantum_error_on_target(
+            Noise(probability_depolarizing=0.1, probability_dephasing=0.0), ["csum"]
+        )
+        noise_model.add_all_qudit_quantum_error(Noise(probability_depolarizing=0.05, probability_dephasing=0.0), ["cx"])
+
+        result = provider.get_backend("dmsim").run(circuit, noise_model=noise_model, shots=5000, seed=3)
+        density_matrix = result.result().get_density_matrix()
+        assert np.isclose(np.trace(density_matrix), 1)
+        assert np.allclose(density_matrix, density_matrix.conj().T)
+
+        factory = NoisyCircuitFactory(noise_model, circuit, np.random.default_rng(1))
+        average = np.zeros_like(density_matrix)
+        trajectories = 2000
+        for _ in range(trajectories):
+            state = dsvsim.execute(factory.generate_circuit()).ravel()
+            average += np.outer(state, state.conj()) / trajectories
+        assert np.allclose(density_matrix, average, atol=0.01)
+
+    @staticmethod
+    def test_sample_counts_from_the_diagonal():
+        provider = MQTQuditProvider()
+        circuit = QuantumCircuit(QuantumRegister("reg", 2, [3, 3]))
+        circuit.h(0)
+        circuit.csum([0, 1])
+        noise_model = NoiseModel()
+        noise_model.add_nonlocal_quantum_error(Noise(probability_depolarizing=0.2, probability_dephasing=0.0), ["csum"])
+
+        runs = [
+            provider.get_backend("dmsim")
+            .run(circuit, noise_model=noise_model, shots=4000, seed=seed, sample_counts=True)
+            .result()
+            for seed in (5, 5, 6)
+        ]
+        counts = [run.get_histogram() for run in runs]
+        assert counts[0].shots == 4000
+        assert counts[0] == counts[1]
+        assert counts[0] != counts[2]
+        frequencies = counts[0].to_array() / 4000
+        assert np.allclose(frequencies, runs[0].get_probabilities(), atol=0.03)
+
+    @staticmethod
+    def test_kraus_matrices_are_shared_between_instructions():
+        circuit = QuantumCircuit(QuantumRegister("reg", 2, [3, 3]))
+        for _ in range(4):
+            circuit.h(0)
+            circuit.h(1)
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.3, probability_dephasing=0.2), ["h"])
+
+        backend = MQTQuditProvider().get_backend("dmsim")
+        reference = backend.execute(circuit, noise_model)
+        event_matrix = DMSim._event_matrix
+        with mock.patch.object(DMSim, "_event_matrix", side_effect=event_matrix) as built:
+            assert np.allclose(backend.execute(circuit, noise_model), reference)
+        # every distinct (gate, qudit, argument) is built once, not once per instruction
+        keys = {call.args[1][1:] for call in built.call_args_list}
+        assert built.call_count == len(keys)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from unittest import TestCase, mock
+
+import numpy as np
+
+from mqt.qudits.quantum_circuit import QuantumCircuit, Symbol
+from mqt.qudits.quantum_circuit.components.extensions.controls import ControlData
+from mqt.qudits.quantum_circuit.components.extensions.matrix_cache import gate_matrix_cache
+from mqt.qudits.quantum_circuit.components.quantum_register import QuantumRegister
+from mqt.qudits.simulation import MQTQuditProvider
+from mqt.qudits.simulation.backends import TNSim
+from mqt.qudits.simulation.noise_tools import Noise, NoiseModel
+
+
+class TestDSVSim(TestCase):
+    @staticmethod
+    def test_execute_matches_tnsim():
+        rng = np.random.default_rng(0)
+        provider = MQTQuditProvider()
+        tnsim = provider.get_backend("tnsim")
+        dsvsim = provider.get_backend("dsvsim")
+
+        dimensions = [3, 2, 4, 2, 3]
+        circuit = QuantumCircuit(QuantumRegister("reg", len(dimensions), dimensions))
+        for _ in range(6):
+            for qudit in range(len(dimensions)):
+                circuit.h(qudit)
+            first, second = (int(q) for q in rng.choice(len(dimensions), 2, replace=False))
+            circuit.csum([first, second])
+            circuit.cx([second, first], [0, 1, 0, rng.uniform(0, 2 * np.pi)])
+            circuit.rz(int(first), [0, 1, rng.uniform(0, 2 * np.pi)])
+        circuit.x(0).control([1, 4], [1, 0])
+        circuit.r(2, [0, 3, 0.3, 0.7], ControlData([0], [2]))
+        circuit.cu_two([3, 1], np.linalg.qr(rng.normal(size=(4, 4)) + 1j * rng.normal(size=(4, 4)))[0])
+        circuit.cu_multi([4, 0, 2], np.linalg.qr(rng.normal(size=(36, 36)))[0])
+
+        expected = tnsim.execute(circuit)
+        assert np.allclose(dsvsim.execute(circuit), expected)
+        assert np.allclose(dsvsim.run(circuit).result().get_state_vector(), expected)
+
+        # starting from an intermediate state
+        middle = dsvsim.evolve(circuit, circuit.instructions[:10])
+        assert np.allclose(dsvsim.evolve(circuit, circuit.instructions[10:], middle), expected)
+        assert np.allclose(dsvsim.evolve(circuit, [], middle), middle)
+
+    @staticmethod
+    def test_long_range_gate_on_many_qudits():
+        provider = MQTQuditProvider()
+        backend = provider.get_backend("dsvsim")
+
+        # the operator spanning all ten ququarts would not fit in memory
+        circuit = QuantumCircuit(QuantumRegister("reg", 10, [4] * 10))
+        circuit.h(0)
+        circuit.csum([0, 9])
+
+        state = backend.execute(circuit).reshape([4] * 10)
+        expected = np.zeros([4] * 10, dtype=complex)
+        for level in range(4):
+            expected[(level,) + (0,) * 8 + (level,)] = 0.5
+        assert np.allclose(state, expected)
+
+    @staticmethod
+    def test_stochastic_simulation_matches_tnsim():
+        provider = MQTQuditProvider()
+
+        circuit = QuantumCircuit(QuantumRegister("reg", 2, [3, 4]))
+        circuit.h(0)
+        circuit.csum([0, 1])
+        circuit.h(1)
+
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.1, probability_dephasing=0.1), ["h"])
+        noise_model.add_nonlocal_quantum_error(
+            Noise(probability_depolarizing=0.1, probability_dephasing=0.1), ["csum"]
+        )
+
+        runs = [
+            provider.get_backend(name)
+            .run(circuit, noise_model=noise_model, shots=100, seed=9, workers=2, checkpoint_interval=1, memory=True)
+            .result()
+            .get_memory()
+            for name in ("tnsim", "dsvsim")
+        ]
+        assert runs[0] == runs[1]
+
+    @staticmethod
+    def test_run_batch_matches_bound_circuits():
+        provider = MQTQuditProvider()
+        tnsim = provider.get_backend("tnsim")
+        dsvsim = provider.get_backend("dsvsim")
+
+        theta, phi, gamma = Symbol("theta"), Symbol("phi"), Symbol("gamma")
+        circuit = QuantumCircuit(QuantumRegister("reg", 3, [3, 2, 4]))
+        circuit.h(0)
+        circuit.r(0, [0, 2, theta, phi])
+        circuit.csum([0, 2])
+        circuit.rz(2, [1, 3, gamma])
+        circuit.ms([0, 1], [theta])
+        circuit.ls([1, 2], [phi])
+        circuit.virtrz(1, [1, gamma])
+        circuit.r(2, [0, 1, theta, 0.3], ControlData([0], [1]))
+        circuit.h(1)
+
+        parameter_matrix = np.random.default_rng(1).uniform(0, 2 * np.pi, (6, 3))
+        states = dsvsim.run_batch(circuit, parameter_matrix).result().get_state_vector()
+        assert states.shape == (6, 24)
+        for row, state in zip(parameter_matrix, states):
+            assert np.allclose(state, tnsim.execute(circuit.bind_parameters(row)))
+        # TNSim evolves noiseless batches together as well, without a run per binding
+        with mock.patch.object(TNSim, "run", side_effect=AssertionError("one run per binding")):
+            assert np.allclose(tnsim.run_batch(circuit, parameter_matrix).result().get_state_vector(), states)
+
+    @staticmethod
+    def test_run_batch_samples_shots_without_filling_the_matrix_cache():
+        provider = MQTQuditProvider()
+        dsvsim = provider.get_backend("dsvsim")
+        theta = Symbol("theta")
+        circuit = QuantumCircuit(QuantumRegister("reg", 2, [3, 2]))
+        circuit.h(0)
+        circuit.r(1, [0, 1, theta, 0.0])
+
+        parameter_matrix = np.array([[0.0], [np.pi]])
+        gate_matrix_cache.clear()
+        assert all(counts.shots == 0 for counts in dsvsim.run_batch(circuit, parameter_matrix).result().get_histogram())
+        # the bound rotations are built directly, so new bindings add no entries to the cache
+        entries = gate_matrix_cache.info().currsize
+        dsvsim.run_batch(circuit, np.linspace(0, 1, 20)[:, np.newaxis])
+        assert gate_matrix_cache.info().currsize == entries
+
+        runs = [dsvsim.run_batch(circuit, parameter_matrix, shots=300, seed=4).result() for _ in range(2)]
+        first, second = runs[0].get_histogram(), runs[1].get_histogram()
+        assert first == second
+        assert [counts.shots for counts in first] == [300, 300]
+        assert set(first[0].marginal([1])) == {0}
+        assert set(first[1].marginal([1])) == {1}
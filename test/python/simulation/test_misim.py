@@ -1,13 +1,21 @@
 from __future__ import annotations
 
-from unittest import TestCase
+import tempfile
+import weakref
+from pathlib import Path
+from unittest import TestCase, mock
 
+import h5py
 import numpy as np
+import pytest
 
-from mqt.qudits.quantum_circuit import QuantumCircuit
+from mqt.qudits.compiler.state_compilation.retrieve_state import generate_random_quantum_state
+from mqt.qudits.compiler.state_compilation.state_preparation import StatePrep
+from mqt.qudits.quantum_circuit import QuantumCircuit, Symbol
 from mqt.qudits.quantum_circuit.components.quantum_register import QuantumRegister
 from mqt.qudits.simulation import MQTQuditProvider
 from mqt.qudits.simulation.noise_tools import Noise, NoiseModel
+from mqt.qudits.simulation.save_info import ResultWriter
 
 from .._qudits.test_pymisim import is_quantum_state
 
@@ -344,25 +352,50 @@ class TestMISim(TestCase):
         circuit = QuantumCircuit(qreg_example)
         circuit.h(0)
         circuit.x(1).control([0, 2], [1, 0])
-        np.array([(0.7071067 + 0j), 0j, 0j, 0j, 0j, 0j, 0j, 0j, 0j, (0.7071067 + 0j), 0j, 0j])
+        test_state = np.array([(0.7071067 + 0j), 0j, 0j, 0j, 0j, 0j, 0j, 0j, 0j, (0.7071067 + 0j), 0j, 0j])
 
         job = backend.run(circuit)
         result = job.result()
-        result.get_state_vector()
+        state_vector = result.get_state_vector()
 
-        # assert np.allclose(state_vector, test_state)
+        assert np.allclose(state_vector, test_state)
 
         qreg_example = QuantumRegister("reg", 3, [2, 2, 3])
         circuit = QuantumCircuit(qreg_example)
         circuit.h(1)
         circuit.x(0).control([1, 2], [1, 0])
-        np.array([(0.7071067 + 0j), 0j, 0j, 0j, 0j, 0j, 0j, 0j, 0j, (0.7071067 + 0j), 0j, 0j])
 
         job = backend.run(circuit)
         result = job.result()
-        result.get_state_vector()
+        state_vector = result.get_state_vector()
 
-        # assert np.allclose(state_vector, test_state)
+        assert np.allclose(state_vector, test_state)
+
+    @staticmethod
+    def test_multi_controlled_rotations():
+        provider = MQTQuditProvider()
+        circuit = QuantumCircuit(QuantumRegister("reg", 4, [3, 2, 5, 4]))
+        for qudit in range(4):
+            circuit.h(qudit)
+        circuit.r(2, [1, 4, 0.7, 0.3]).control([0, 3], [2, 1])
+        circuit.rz(0, [0, 2, 1.1]).control([1, 2, 3], [1, 4, 3])
+        circuit.r(3, [0, 3, np.pi, np.pi / 2]).control([1], [0])
+        circuit.rz(1, [0, 1, 0.4]).control([3, 0], [2, 1]).dag()
+        circuit.r(0, [1, 2, 0.9, 1.4]).control([2], [0]).dag()
+        circuit.virtrz(2, [3, 0.6]).control([0, 1], [1, 1])
+        circuit.x(3).control([2], [4])
+
+        expected = provider.get_backend("tnsim").run(circuit).result().get_state_vector()
+        state_vector = provider.get_backend("misim").run(circuit).result().get_state_vector()
+        assert np.allclose(state_vector, expected)
+
+        # the multi-controlled rotations of a compiled state preparation
+        cardinalities = [3, 2, 3, 2]
+        state = generate_random_quantum_state(cardinalities)
+        prepared = StatePrep(QuantumCircuit(4, cardinalities, 0), state).compile_state()
+        assert any(gate.control_info["controls"] is not None for gate in prepared.instructions)
+        state_vector = provider.get_backend("misim").run(prepared).result().get_state_vector()
+        assert np.allclose(state_vector, state)
 
     @staticmethod
     def test_stochastic_simulation():
@@ -409,7 +442,131 @@ class TestMISim(TestCase):
         job = backend.run(circuit, noise_model=noise_model, shots=50)
         result = job.result()
         state_vector = result.get_state_vector()
-        counts = result.get_counts()
-        assert len(counts) == 50
+        counts = result.get_histogram()
+        assert counts.shots == 50
         assert len(state_vector.squeeze()) == 5**3
         assert is_quantum_state(state_vector)
+
+    @staticmethod
+    def test_seeded_stochastic_simulation_is_reproducible():
+        provider = MQTQuditProvider()
+        backend = provider.get_backend("misim")
+
+        circuit = QuantumCircuit(QuantumRegister("reg", 2, [3, 4]))
+        circuit.h(0)
+        circuit.csum([0, 1])
+        circuit.h(1)
+
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.3, probability_dephasing=0.3), ["h"])
+        noise_model.add_nonlocal_quantum_error(
+            Noise(probability_depolarizing=0.3, probability_dephasing=0.3), ["csum"]
+        )
+
+        for full_state_memory in (False, True):
+            runs = [
+                backend.run(
+                    circuit,
+                    noise_model=noise_model,
+                    shots=60,
+                    seed=7,
+                    workers=w,
+                    use_threads=True,
+                    memory=True,
+                    full_state_memory=full_state_memory,
+                )
+                .result()
+                .get_memory()
+                for w in (1, 4)
+            ]
+            assert np.array_equal(np.array(runs[0]), np.array(runs[1]))
+
+    @staticmethod
+    def test_results_are_streamed_to_file():
+        provider = MQTQuditProvider()
+
+        circuit = QuantumCircuit(QuantumRegister("reg", 2, [3, 4]))
+        circuit.h(0)
+        circuit.csum([0, 1])
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.2, probability_dephasing=0.2), ["h"])
+
+        with tempfile.TemporaryDirectory() as directory:
+            for name, options in (("shots", {"memory": True}), ("vectors", {"full_state_memory": True})):
+                run_options = {"noise_model": noise_model, "shots": 60, "seed": 4, "workers": 2, "use_threads": True}
+                expected = provider.get_backend("misim").run(circuit, **run_options, **options).result().get_memory()
+                result = (
+                    provider.get_backend("misim")
+                    .run(circuit, **run_options, file_path=directory, file_name=f"{name}.h5", **options)
+                    .result()
+                )
+                # streamed states are only kept in the file
+                assert (result.memory is None) == (name == "vectors")
+                with h5py.File(Path(directory) / f"{name}.h5", "r") as file:
+                    rows = file[name][:][file["nr"][:].argsort()]
+                    assert np.allclose(rows, np.array(expected).reshape(rows.shape))
+                    assert file.attrs["num_qudits"] == 2
+
+            # a run failing before any results leaves no file behind
+            circuit.noisex(1, [0, 1])
+            with pytest.raises(ValueError, match="not supported"):
+                provider.get_backend("misim").run(
+                    circuit, noise_model=noise_model, shots=60, memory=True, file_path=directory, file_name="failed.h5"
+                )
+            assert not (Path(directory) / "failed.h5").exists()
+
+    @staticmethod
+    def test_streamed_states_are_dropped_after_writing():
+        provider = MQTQuditProvider()
+        circuit = QuantumCircuit(QuantumRegister("reg", 2, [3, 4]))
+        circuit.h(0)
+        circuit.csum([0, 1])
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.2, probability_dephasing=0.2), ["h"])
+
+        written: list[weakref.ref[np.ndarray]] = []
+        live_at_append: list[int] = []
+        append = ResultWriter.append
+
+        def tracking_append(writer: ResultWriter, shots: range, rows: list[np.ndarray]) -> None:
+            # states of earlier chunks must be gone once their chunk has been written
+            live_at_append.append(sum(ref() is not None for ref in written))
+            append(writer, shots, rows)
+            written.extend(weakref.ref(row) for row in rows)
+
+        with tempfile.TemporaryDirectory() as directory, mock.patch.object(ResultWriter, "append", tracking_append):
+            provider.get_backend("misim").run(
+                circuit,
+                noise_model=noise_model,
+                shots=200,
+                seed=2,
+                workers=2,
+                use_threads=True,
+                full_state_memory=True,
+                file_path=directory,
+                file_name="states.h5",
+            )
+        assert len(written) == 200
+        assert len(live_at_append) > 4
+        assert max(live_at_append) == 0
+
+    @staticmethod
+    def test_run_batch():
+        provider = MQTQuditProvider()
+        backend = provider.get_backend("misim")
+
+        theta, phi = Symbol("theta"), Symbol("phi")
+        circuit = QuantumCircuit(QuantumRegister("reg", 2, [3, 4]))
+        circuit.h(0)
+        circuit.r(0, [0, 2, theta, phi])
+        circuit.csum([0, 1])
+        circuit.rz(1, [1, 3, phi])
+
+        parameter_matrix = np.random.default_rng(2).uniform(0, 2 * np.pi, (4, 2))
+        states = backend.run_batch(circuit, parameter_matrix).result().get_state_vector()
+        simulator = backend._simulator  # noqa: SLF001
+        assert states.shape == (4, 12)
+        for row, state in zip(parameter_matrix, states):
+            assert np.allclose(state, provider.get_backend("dsvsim").execute(circuit.bind_parameters(row)))
+        backend.run_batch(circuit, parameter_matrix)
+        assert backend._simulator is simulator  # noqa: SLF001
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+import numpy as np
+
+from mqt.qudits.quantum_circuit import QuantumCircuit
+from mqt.qudits.quantum_circuit.components.quantum_register import QuantumRegister
+from mqt.qudits.simulation import MQTQuditProvider, Observable
+from mqt.qudits.simulation.noise_tools import Noise, NoiseModel
+
+
+class TestMPSSim(TestCase):
+    @staticmethod
+    def test_execute_matches_dsvsim():
+        rng = np.random.default_rng(0)
+        provider = MQTQuditProvider()
+        backend = provider.get_backend("mpssim")
+
+        dimensions = [3, 2, 4, 2, 3, 2]
+        circuit = QuantumCircuit(QuantumRegister("reg", len(dimensions), dimensions))
+        for _ in range(8):
+            qudit = int(rng.integers(len(dimensions)))
+            circuit.h(qudit)
+            circuit.rz(qudit, [0, 1, rng.uniform(0, 2 * np.pi)])
+            first, second = (int(q) for q in rng.choice(len(dimensions), 2, replace=False))
+            circuit.csum([first, second])
+            circuit.cx([second, first], [0, 1, 0, rng.uniform(0, 2 * np.pi)])
+        circuit.x(0).control([1, 5], [1, 0])
+        circuit.cu_multi([4, 0, 2], np.linalg.qr(rng.normal(size=(36, 36)))[0])
+
+        expected = provider.get_backend("dsvsim").execute(circuit)
+        state = backend.execute(circuit)
+        assert np.allclose(state.to_vector(), expected)
+        assert backend.discarded_weight < 1e-10
+
+        job = backend.run(circuit, shots=4000, seed=2)
+        assert np.allclose(job.result().get_state_vector(), expected)
+        assert job.metadata["discarded_weight"] < 1e-10
+        frequencies = job.result().get_histogram().to_array() / 4000
+        assert np.allclose(frequencies, np.abs(expected.ravel()) ** 2, atol=0.03)
+
+    @staticmethod
+    def test_truncation():
+        provider = MQTQuditProvider()
+        backend = provider.get_backend("mpssim")
+
+        circuit = QuantumCircuit(QuantumRegister("reg", 4, [3, 3, 3, 3]))
+        circuit.h(0)
+        circuit.h(1)
+        circuit.rz(1, [0, 1, 0.3])
+        circuit.csum([0, 2])
+        circuit.csum([1, 3])
+        circuit.h(2)
+        circuit.csum([2, 1])
+
+        state = backend.run(circuit, max_bond_dimension=2).result().get_state_vector()
+        assert max(backend.execute(circuit).bond_dimensions) <= 2
+        assert 0 < backend.discarded_weight < 1
+        assert np.isclose(np.linalg.norm(state), 1)
+
+    @staticmethod
+    def test_long_chain():
+        provider = MQTQuditProvider()
+        backend = provider.get_backend("mpssim")
+
+        # GHZ state of 40 qutrits, closed by a gate between the two ends of the chain
+        circuit = QuantumCircuit(QuantumRegister("reg", 40, [3] * 40))
+        circuit.h(0)
+        for qudit in range(39):
+            circuit.csum([qudit, qudit + 1])
+        circuit.csum([39, 0])
+
+        job = backend.run(circuit, shots=20, seed=4)
+        assert job.result().get_state_vector().size == 0
+        assert job.metadata["discarded_weight"] < 1e-10
+        assert max(backend.execute(circuit).bond_dimensions) == 3
+        observable = Observable.projector(0, 0, 3) @ Observable.projector(39, 0, 3)
+        assert np.allclose(backend.expectation_values(circuit, [observable]), [1 / 3])
+        assert job.result().get_histogram().shots == 20
+        for outcome in job.result().get_histogram():
+            digits = np.base_repr(outcome, 3).zfill(40)
+            assert digits[1:] == digits[1] * 39
+            assert int(digits[0]) == 2 * int(digits[1]) % 3
+
+    @staticmethod
+    def test_noisy_trajectories_are_reproducible():
+        provider = MQTQuditProvider()
+
+        circuit = QuantumCircuit(QuantumRegister("reg", 3, [3, 2, 3]))
+        circuit.h(0)
+        circuit.csum([0, 2])
+        circuit.h(1)
+
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.1, probability_dephasing=0.1), ["h"])
+        noise_model.add_nonlocal_quantum_error(
+            Noise(probability_depolarizing=0.1, probability_dephasing=0.1), ["csum"]
+        )
+        runs = [
+            provider.get_backend("mpssim").run(circuit, noise_model=noise_model, shots=60, seed=seed)
+            for seed in (8, 8, 9)
+        ]
+        counts = [run.result().get_histogram() for run in runs]
+        assert counts[0].shots == 60
+        assert counts[0] == counts[1]
+        assert counts[0] != counts[2]
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from unittest import TestCase
+
+import numpy as np
+
+from mqt.qudits.quantum_circuit import QuantumCircuit
+from mqt.qudits.quantum_circuit.components.quantum_register import QuantumRegister
+from mqt.qudits.simulation import ExpectationEstimator, MQTQuditProvider, Observable
+from mqt.qudits.simulation.jobs import Counts
+from mqt.qudits.simulation.noise_tools import Noise, NoiseModel
+
+
+def _full_matrix(observable: Observable, dimensions: list[int]) -> np.ndarray:
+    matrix = np.ones((1, 1))
+    for qudit, dim in enumerate(dimensions):
+        matrix = np.kron(matrix, observable.operators.get(qudit, np.identity(dim)))
+    return observable.coefficient * matrix
+
+
+class TestObservables(TestCase):
+    def setUp(self) -> None:
+        self.dimensions = [3, 2, 4, 3]
+        self.circuit = QuantumCircuit(QuantumRegister("reg", 4, self.dimensions))
+        self.circuit.h(0)
+        self.circuit.csum([0, 2])
+        self.circuit.r(1, [0, 1, 0.7, 0.2])
+        self.circuit.cx([2, 3], [0, 2, 1, 0.4])
+        self.circuit.h(3)
+        self.observables = [
+            Observable.projector(2, 1, 4),
+            Observable.gell_mann(0, 0, 2, "s", 3) @ Observable.gell_mann(3, 1, 2, "d", 3),
+            0.5 * Observable.gell_mann(1, 0, 1, "a", 2) @ Observable.projector(3, 0, 3),
+            Observable({}, 2.0),
+        ]
+
+    def test_expectation_values_match_full_operators(self):
+        provider = MQTQuditProvider()
+        state = provider.get_backend("dsvsim").execute(self.circuit).ravel()
+        expected = [np.vdot(state, _full_matrix(o, self.dimensions) @ state).real for o in self.observables]
+        for name in ("tnsim", "dsvsim", "misim", "mpssim", "dmsim"):
+            values = provider.get_backend(name).expectation_values(self.circuit, self.observables)
+            assert np.allclose(values, expected), name
+
+    def test_noisy_expectation_values(self):
+        provider = MQTQuditProvider()
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.2, probability_dephasing=0.0), ["h"])
+        noise_model.add_nonlocal_quantum_error(Noise(probability_depolarizing=0.1, probability_dephasing=0.0), ["csum"])
+
+        backend = provider.get_backend("dmsim")
+        rho = backend.execute(self.circuit, noise_model)
+        values = backend.expectation_values(self.circuit, self.observables, noise_model=noise_model)
+        expected = [np.trace(_full_matrix(o, self.dimensions) @ rho).real for o in self.observables]
+        assert np.allclose(values, expected)
+
+    def test_streaming_estimator(self):
+        provider = MQTQuditProvider()
+        observable = Observable.projector(2, 1, 4) @ Observable.gell_mann(0, 1, 2, "d", 3)
+        with self.assertRaises(ValueError):
+            ExpectationEstimator(Observable.gell_mann(0, 0, 1, "s", 3), self.dimensions)
+
+        job = provider.get_backend("dmsim").run(self.circuit, shots=20000, seed=1, sample_counts=True, memory=True)
+        outcomes = np.array(job.result().get_memory())
+        estimator = ExpectationEstimator(observable, self.dimensions)
+        for chunk in np.array_split(outcomes, 7):
+            estimator.update(chunk)
+
+        values = observable.outcome_values(outcomes, self.dimensions)
+        assert estimator.count == outcomes.size
+        assert np.isclose(estimator.mean, values.mean())
+        assert np.isclose(estimator.variance, values.var(ddof=1))
+        exact = provider.get_backend("dsvsim").expectation_values(self.circuit, [observable])[0]
+        assert abs(estimator.mean - exact) < 5 * estimator.standard_error + 1e-12
+
+    def test_estimator_from_counts(self):
+        provider = MQTQuditProvider()
+        observable = 3.0 * Observable.projector(2, 1, 4) @ Observable.gell_mann(0, 1, 2, "d", 3)
+        job = provider.get_backend("dmsim").run(self.circuit, shots=5000, seed=3, sample_counts=True, memory=True)
+        outcomes = np.array(job.result().get_memory())
+
+        per_shot = ExpectationEstimator(observable, self.dimensions)
+        per_shot.update(outcomes)
+        weighted = ExpectationEstimator(observable, self.dimensions)
+        for chunk in np.array_split(outcomes, 3):
+            weighted.update_counts(Counts.from_outcomes(chunk, self.dimensions))
+        assert weighted.count == per_shot.count
+        assert np.isclose(weighted.mean, per_shot.mean)
+        assert np.isclose(weighted.variance, per_shot.variance)
+
+    def test_noisy_expectation_values_from_counts(self):
+        provider = MQTQuditProvider()
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.2, probability_dephasing=0.0), ["h"])
+        observables = [Observable.projector(2, 1, 4), Observable.projector(0, 0, 3) @ Observable.projector(3, 2, 3)]
+        exact = provider.get_backend("dmsim").expectation_values(self.circuit, observables, noise_model=noise_model)
+        for name in ("misim", "tnsim", "mpssim"):
+            values = provider.get_backend(name).expectation_values(
+                self.circuit, observables, noise_model=noise_model, shots=2000, seed=5
+            )
+            # projectors average to a frequency, whose standard error is at most 0.5 / sqrt(shots)
+            assert np.all(np.abs(values - exact) < 5 * 0.5 / np.sqrt(2000)), name
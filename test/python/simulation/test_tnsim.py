@@ -1,12 +1,25 @@
 from __future__ import annotations
 
-from unittest import TestCase
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
 
+import h5py
 import numpy as np
+import pytest
 
+from mqt.qudits.compiler.state_compilation.retrieve_state import generate_random_quantum_state
+from mqt.qudits.compiler.state_compilation.state_preparation import StatePrep
 from mqt.qudits.quantum_circuit import QuantumCircuit
 from mqt.qudits.quantum_circuit.components.quantum_register import QuantumRegister
 from mqt.qudits.simulation import MQTQuditProvider
+from mqt.qudits.simulation.backends.contraction_paths import contraction_path_cache
+from mqt.qudits.simulation.backends.stochastic_sim import (
+    get_executor,
+    prefix_checkpoints,
+    sample_outcomes,
+    shot_rng,
+)
 from mqt.qudits.simulation.noise_tools import Noise, NoiseModel
 from mqt.qudits.simulation.noise_tools.noise import SubspaceNoise
 
@@ -410,8 +423,8 @@ class TestTNSim(TestCase):
         job = backend.run(circuit, noise_model=noise_model, shots=100)
         result = job.result()
         state_vector = result.get_state_vector()
-        counts = result.get_counts()
-        assert len(counts) == 100
+        counts = result.get_histogram()
+        assert counts.shots == 100
         assert len(state_vector.squeeze()) == 5**3
         assert is_quantum_state(state_vector)
 
@@ -452,11 +465,140 @@ class TestTNSim(TestCase):
         job = backend.run(circuit, noise_model=noise_model, shots=100)
         result = job.result()
         state_vector = result.get_state_vector()
-        counts = result.get_counts()
-        assert len(counts) == 100
+        counts = result.get_histogram()
+        assert counts.shots == 100
         assert len(state_vector.squeeze()) == 5**3
         assert is_quantum_state(state_vector)
 
+    @staticmethod
+    def test_stochastic_simulation_reuses_executor():
+        provider = MQTQuditProvider()
+        backend = provider.get_backend("tnsim")
+
+        circuit = QuantumCircuit(QuantumRegister("reg", 2, [3, 3]))
+        circuit.h(0)
+        circuit.csum([0, 1])
+
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.2, probability_dephasing=0.2), ["h"])
+
+        for use_threads in (False, True):
+            executor = get_executor(2, use_threads)
+            for _ in range(2):
+                job = backend.run(circuit, noise_model=noise_model, shots=60, workers=2, use_threads=use_threads)
+                counts = job.result().get_histogram()
+                assert counts.shots == 60
+                assert all(0 <= c < 9 for c in counts)
+            assert get_executor(2, use_threads) is executor
+
+    @staticmethod
+    def test_job_payload_is_sent_once_per_worker_process():
+        provider = MQTQuditProvider()
+        circuit = QuantumCircuit(QuantumRegister("reg", 2, [3, 3]))
+        circuit.h(0)
+        circuit.csum([0, 1])
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.2, probability_dephasing=0.2), ["h"])
+
+        executor = get_executor(2, use_threads=False)
+        payloads = []
+        submit = executor.submit
+
+        def counting_submit(function, token, data, *args):  # noqa: ANN001, ANN002, ANN202
+            payloads.append(data is not None)
+            return submit(function, token, data, *args)
+
+        options = {"noise_model": noise_model, "shots": 400, "seed": 3, "workers": 2, "memory": True}
+        expected = provider.get_backend("tnsim").run(circuit, **options, use_threads=True).result().get_memory()
+        with mock.patch.object(executor, "submit", counting_submit):
+            memory = provider.get_backend("tnsim").run(circuit, **options).result().get_memory()
+        assert memory == expected
+        # the payload goes out with the first chunk of each of the 2 workers, and again only with a chunk that
+        # reached a worker before its first one, so most of the chunks carry only the token of the job
+        assert len(payloads) > 8
+        assert 2 <= sum(payloads) < len(payloads) / 2
+
+    @staticmethod
+    def test_seeded_stochastic_simulation_is_reproducible():
+        provider = MQTQuditProvider()
+        backend = provider.get_backend("tnsim")
+
+        circuit = QuantumCircuit(QuantumRegister("reg", 2, [3, 4]))
+        circuit.h(0)
+        circuit.csum([0, 1])
+        circuit.h(1)
+
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.3, probability_dephasing=0.3), ["h"])
+        noise_model.add_nonlocal_quantum_error(
+            Noise(probability_depolarizing=0.3, probability_dephasing=0.3), ["csum"]
+        )
+
+        runs = [
+            backend.run(circuit, noise_model=noise_model, shots=80, seed=42, workers=w, use_threads=t, memory=True)
+            .result()
+            .get_memory()
+            for w, t in ((1, False), (3, False), (2, True))
+        ]
+        assert runs[0] == runs[1] == runs[2]
+        other = (
+            backend.run(circuit, noise_model=noise_model, shots=80, seed=43, workers=1, memory=True)
+            .result()
+            .get_memory()
+        )
+        assert other != runs[0]
+
+        # the batched sampler agrees with drawing every shot on its own
+        vector = backend.execute(circuit)
+        rng = np.random.default_rng(1)
+        probabilities = np.abs(vector.ravel()) ** 2
+        single = [rng.choice(len(probabilities), p=probabilities) for _ in range(50)]
+        assert np.array_equal(sample_outcomes(vector, np.random.default_rng(1).random(50)), single)
+
+        # the stream of a shot is the spawned child of the seed
+        expected = np.random.default_rng(np.random.SeedSequence(42).spawn(5)[4]).random(3)
+        assert np.array_equal(shot_rng(42, 4).random(3), expected)
+
+    @staticmethod
+    def test_results_are_streamed_to_file():
+        provider = MQTQuditProvider()
+
+        circuit = QuantumCircuit(QuantumRegister("reg", 2, [3, 4]))
+        circuit.h(0)
+        circuit.csum([0, 1])
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.2, probability_dephasing=0.2), ["h"])
+
+        with tempfile.TemporaryDirectory() as directory:
+            options = {"noise_model": noise_model, "shots": 60, "seed": 2, "workers": 2, "file_path": directory}
+            memory = (
+                provider.get_backend("tnsim")
+                .run(circuit, memory=True, file_name="shots.h5", **options)
+                .result()
+                .get_memory()
+            )
+            states = provider.get_backend("tnsim").run(circuit, full_state_memory=True, **options).result().get_memory()
+            # streamed states are only kept in the file
+            result = (
+                provider.get_backend("tnsim")
+                .run(circuit, full_state_memory=True, file_name="states.h5", file_compression="gzip", **options)
+                .result()
+            )
+            with pytest.raises(ValueError, match="only kept in the file"):
+                result.get_memory()
+
+            with h5py.File(Path(directory) / "shots.h5", "r") as file:
+                assert file["shots"].maxshape == (None,)
+                assert np.array_equal(file["shots"][file["nr"][:].argsort()], memory)
+                assert list(file.attrs["dimensions"]) == [3, 4]
+                assert file.attrs["shots"] == 60
+            with h5py.File(Path(directory) / "states.h5", "r") as file:
+                vectors = file["vectors"]
+                assert vectors.maxshape == (None, 12)
+                assert vectors.compression == "gzip"
+                assert np.allclose(vectors[:][file["nr"][:].argsort()], np.array(states).reshape(60, 12))
+                assert list(file.attrs["gates"]) == ["h", "csum"]
+
     def test_tn_multi(self):  # noqa: PLR6301
         # TODO: Implement test currently just a stub
         assert True
@@ -464,3 +606,136 @@ class TestTNSim(TestCase):
     def test_ion_ent_gates(self):  # noqa: PLR6301
         # TODO: Implement test for ion entity gates
         assert True
+
+    @staticmethod
+    def test_trajectory_cache_is_reused_across_runs():
+        provider = MQTQuditProvider()
+        backend = provider.get_backend("tnsim")
+
+        circuit = QuantumCircuit(QuantumRegister("reg", 2, [3, 3]))
+        circuit.h(0)
+        circuit.csum([0, 1])
+
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.1, probability_dephasing=0.1), ["h"])
+
+        first = backend.run(circuit, noise_model=noise_model, shots=60, seed=7, workers=1)
+        second = backend.run(circuit, noise_model=noise_model, shots=60, seed=7, workers=1)
+        assert first.metadata["trajectory_cache"]["misses"] > 0
+        assert second.metadata["trajectory_cache"]["misses"] == 0
+        assert second.metadata["trajectory_cache"]["hit_rate"] == 1.0
+        assert first.result().get_histogram() == second.result().get_histogram()
+
+    @staticmethod
+    def test_checkpointed_stochastic_simulation():
+        provider = MQTQuditProvider()
+        backend = provider.get_backend("tnsim")
+
+        circuit = QuantumCircuit(QuantumRegister("reg", 2, [3, 4]))
+        for _ in range(3):
+            circuit.h(0)
+            circuit.csum([0, 1])
+            circuit.x(1)
+
+        # resuming from a stored prefix state gives the state of the full contraction
+        checkpoints = prefix_checkpoints(backend, circuit, 2, 2**20)
+        assert [position for position, _ in checkpoints] == [0, 2, 4, 6, 8]
+        for position, state in checkpoints[1:]:
+            assert np.allclose(state, backend.evolve(circuit, circuit.instructions[:position]))
+            rest = backend.evolve(circuit, circuit.instructions[position:], state)
+            assert np.allclose(rest, backend.execute(circuit))
+        # the budget bounds the number of stored states
+        assert len(prefix_checkpoints(backend, circuit, 2, 2 * 12 * 16)) == 3
+
+        noise_model = NoiseModel()
+        noise_model.add_quantum_error_locally(Noise(probability_depolarizing=0.1, probability_dephasing=0.1), ["h"])
+        noise_model.add_nonlocal_quantum_error(
+            Noise(probability_depolarizing=0.1, probability_dephasing=0.1), ["csum"]
+        )
+        runs = [
+            provider.get_backend("tnsim")
+            .run(
+                circuit,
+                noise_model=noise_model,
+                shots=100,
+                seed=3,
+                workers=2,
+                checkpoint_interval=interval,
+                memory=True,
+            )
+            .result()
+            .get_memory()
+            for interval in (None, 1, 4)
+        ]
+        assert runs[0] == runs[1] == runs[2]
+
+    @staticmethod
+    def test_contraction_paths_are_reused():
+        provider = MQTQuditProvider()
+        backend = provider.get_backend("tnsim")
+
+        def circuit_with(angle: float) -> QuantumCircuit:
+            circuit = QuantumCircuit(QuantumRegister("reg", 3, [3, 4, 2]))
+            circuit.h(0)
+            circuit.rz(1, [0, 2, angle])
+            circuit.csum([0, 1])
+            circuit.cx([2, 0], [0, 1, 1, angle])
+            return circuit
+
+        contraction_path_cache.clear()
+        backend.precompute_paths([circuit_with(0.1)])
+        assert contraction_path_cache.info().misses == 1
+
+        # circuits differing only in their parameters share the precomputed path
+        for angle in (0.3, 0.7):
+            circuit = circuit_with(angle)
+            expected = np.eye(1, 24)[0]
+            for gate in circuit.instructions:
+                expected = gate.to_matrix(identities=2) @ expected
+            assert np.allclose(backend.execute(circuit), expected)
+        info = contraction_path_cache.info()
+        assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+
+    @staticmethod
+    def test_long_range_gates_touch_only_their_lines():
+        provider = MQTQuditProvider()
+        backend = provider.get_backend("tnsim")
+
+        # an operator padded over the ten ququarts would take 16 TiB
+        circuit = QuantumCircuit(QuantumRegister("reg", 10, [4] * 10))
+        circuit.h(0)
+        circuit.cx([0, 9], [0, 1, 3, np.pi / 2])
+        circuit.x(5).control([0, 9], [3, 1])
+
+        expected = provider.get_backend("dsvsim").execute(circuit)
+        state = backend.execute(circuit)
+        assert np.allclose(state, expected)
+        # level 3 of qudit 0 flipped qudit 9, which in turn flipped qudit 5
+        assert np.isclose(np.abs(state.reshape([4] * 10)[3, 0, 0, 0, 0, 1, 0, 0, 0, 1]) ** 2, 0.25)
+
+    @staticmethod
+    def test_controlled_gates_as_tensor_chains():
+        provider = MQTQuditProvider()
+        backend = provider.get_backend("tnsim")
+
+        dimensions = [3, 2, 4, 3]
+        circuit = QuantumCircuit(QuantumRegister("reg", 4, dimensions))
+        for qudit in range(4):
+            circuit.h(qudit)
+        circuit.x(2).control([0, 3], [2, 1])
+        circuit.r(0, [0, 2, 0.4, 1.1]).control([1, 2, 3], [1, 1, 0])
+        circuit.rz(1, [0, 1, 0.9]).dag().control([3], [2])
+        circuit.h(3).control([0, 1], [1, 1])
+
+        # MatrixFactory embeds the controlled gates into the full register
+        expected = np.eye(1, 72)[0]
+        for gate in circuit.instructions:
+            expected = gate.to_matrix(identities=2) @ expected
+        assert np.allclose(backend.execute(circuit), expected)
+
+        # multi-controlled rotations of a compiled state preparation
+        cardinalities = [3, 2, 3, 2, 3]
+        state = generate_random_quantum_state(cardinalities)
+        prepared = StatePrep(QuantumCircuit(5, cardinalities, 0), state).compile_state()
+        assert any(gate.control_info["controls"] is not None for gate in prepared.instructions)
+        assert np.allclose(backend.execute(prepared).ravel(), state)
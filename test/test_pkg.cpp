@@ -1064,3 +1064,72 @@ TEST(DDPackageTest, RandomCircuits) {
     }
   }
 }
+
+TEST(DDPackageTest, GarbageCollectionAndReset) {
+  auto dd =
+      std::make_unique<dd::MDDPackage>(3, std::vector<std::size_t>{3, 3, 3});
+
+  dd::Controls const control01{{0, 1}};
+  dd::Controls const control02{{0, 2}};
+  dd::Controls const control011{{0, 1}, {1, 1}};
+  dd::Controls const control012{{0, 2}, {1, 2}};
+
+  // build the GHZ state, collecting everything but the current state after
+  // every gate
+  auto ghz = [&dd, &control01, &control02, &control011, &control012]() {
+    auto evolution = dd->makeZeroState(3);
+    dd->incRef(evolution);
+    for (std::size_t i = 0; i < 5; ++i) {
+      dd::MDDPackage::mEdge gate{};
+      switch (i) {
+      case 0:
+        gate = dd->makeGateDD<dd::TritMatrix>(dd::H3(), 3, 0);
+        break;
+      case 1:
+        gate = dd->makeGateDD<dd::TritMatrix>(dd::X3, 3, control01, 1);
+        break;
+      case 2:
+        gate = dd->makeGateDD<dd::TritMatrix>(dd::X3dag, 3, control02, 1);
+        break;
+      case 3:
+        gate = dd->makeGateDD<dd::TritMatrix>(dd::X3, 3, control011, 2);
+        break;
+      default:
+        gate = dd->makeGateDD<dd::TritMatrix>(dd::X3dag, 3, control012, 2);
+        break;
+      }
+      auto next = dd->multiply(gate, evolution);
+      dd->incRef(next);
+      dd->decRef(evolution);
+      evolution = next;
+      dd->garbageCollect(true);
+    }
+    return evolution;
+  };
+
+  auto checkGHZ = [&dd](const dd::MDDPackage::vEdge& evolution) {
+    auto vec = dd->getVector(evolution);
+    ASSERT_EQ(vec.size(), 27);
+    for (std::size_t i = 0; i < vec.size(); ++i) {
+      double const expected = (i == 0 || i == 13 || i == 26) ? 1. / 3. : 0.;
+      ASSERT_NEAR(std::norm(vec.at(i)), expected,
+                  dd::ComplexTable<>::tolerance());
+    }
+  };
+
+  auto evolution = ghz();
+  checkGHZ(evolution);
+  EXPECT_GT(dd->vUniqueTable.getActiveNodeCount(), 0);
+
+  dd->decRef(evolution);
+  EXPECT_EQ(dd->vUniqueTable.getActiveNodeCount(), 0);
+  dd->garbageCollect(true);
+  EXPECT_EQ(dd->vUniqueTable.getNodeCount(), 0);
+
+  // the package stays usable after a collection and after a full reset
+  checkGHZ(ghz());
+  dd->reset();
+  EXPECT_EQ(dd->vUniqueTable.getNodeCount(), 0);
+  EXPECT_EQ(dd->mUniqueTable.getNodeCount(), 0);
+  checkGHZ(ghz());
+}